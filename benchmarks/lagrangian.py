@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+
+"""Measure the time taken to generate the n-point terms of the SM matter fields
+and the Granada fields with `lagrangian.npoint_fieldstrings`, and how many of
+the combinations of fields are removed by each check on their quantum numbers.
+The same is reported for the pairs of Granada fields screened by
+`lagrangian.one_loop_scalar_terms`.
+
+Usage: python benchmarks/lagrangian.py [--n N ...] [--exotics LABEL ...] [-j WORKERS] [--cache] [--memory]
+
+"""
+
+import argparse
+import math
+import time
+import tracemalloc
+
+from alive_progress import config_handler
+
+from feynwrite.decompositions import DEFAULT_CACHE
+from feynwrite.lagrangian import (
+    GRANADA_FIELDS,
+    SCREENS,
+    SINGLET_MEMO,
+    SM_FIELDS,
+    neutral_combinations,
+    npoint_fieldstrings,
+    one_loop_scalar_terms,
+)
+
+
+def granada_fields(exotics):
+    fields = sorted(GRANADA_FIELDS, key=lambda f: f.field.label)
+    if exotics:
+        fields = [f for f in fields if f.field.label in exotics]
+    return fields
+
+
+def benchmark_fields(exotics):
+    return SM_FIELDS + tuple(f.field for f in granada_fields(exotics))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, nargs="+", default=[3, 4])
+    parser.add_argument(
+        "--exotics", nargs="*", default=[], help="Only use these Granada fields."
+    )
+    parser.add_argument(
+        "-j", "--workers", type=int, default=None,
+        help="Processes decomposing the products (default: one per CPU).",
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help=(
+            "Read and store decompositions in the on-disk cache, as the library does "
+            "by default (off here so that every product is decomposed)."
+        ),
+    )
+    parser.add_argument(
+        "--memory", action="store_true", help="Also measure the peak memory (slower)."
+    )
+    args = parser.parse_args()
+
+    config_handler.set_global(disable=True)
+    fields = benchmark_fields(args.exotics)
+    cache = DEFAULT_CACHE if args.cache else None
+    with_conjs = fields + tuple(f.conj for f in fields)
+
+    for n in args.n:
+        total = math.comb(len(with_conjs) + n - 1, n)
+        counts = {}
+        candidates = sum(1 for _ in neutral_combinations(with_conjs, n, counts=counts))
+
+        if args.memory:
+            tracemalloc.start()
+        # Time the decompositions, not lookups from the previous n
+        SINGLET_MEMO.clear()
+        start = time.perf_counter()
+        terms = sum(1 for _ in npoint_fieldstrings(n, fields=fields, workers=args.workers, cache=cache))
+        seconds = time.perf_counter() - start
+
+        line = (
+            f"n={n}: {len(fields)} fields, {candidates} of {total} combinations "
+            f"decomposed, {terms} terms in {seconds:.2f} s"
+        )
+        if args.memory:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            line += f", peak {peak / 1024:.1f} KiB"
+        print(line)
+        print("  removed by " + ", ".join(f"{name}: {counts[name]}" for name in SCREENS))
+
+    counts = {}
+    start = time.perf_counter()
+    _, cubic, quartic = one_loop_scalar_terms(set(granada_fields(args.exotics)), cache=cache, counts=counts)
+    seconds = time.perf_counter() - start
+    print(f"one loop: {len(cubic)} cubic and {len(quartic)} quartic pairs in {seconds:.2f} s")
+    # Summed over the screens for the cubic and the quartic couplings
+    print("  removed by " + ", ".join(f"{name}: {count}" for name, count in counts.items()))
+
+
+if __name__ == "__main__":
+    main()
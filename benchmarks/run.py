@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+
+"""Run the benchmark suite: importing the Lagrangian, building the terms,
+assembling models and exporting them in every format. Reports the time and
+peak memory of each benchmark, optionally writes them to a JSON report, and
+compares against a previous report to catch regressions.
+
+Usage:
+    python benchmarks/run.py [--repeat N] [--filter NAME] [--output FILE]
+    python benchmarks/run.py --output new.json --compare old.json [--threshold 0.1]
+
+"""
+
+import argparse
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import timeit
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List
+
+import sympy  # noqa: F401 Imported here so it isn't counted below
+
+from feynwrite import __version__
+from feynwrite.dictionary import VALID_MULTIPLETS, build_model
+from feynwrite.granada import REGISTRY
+from feynwrite.two_field import TWO_FIELD_REGISTRY
+
+# Benchmarks by name, in the order they are run. Each one is a function
+# returning the function to be timed, so that setup isn't counted.
+BENCHMARKS: Dict[str, Callable[[], Callable[[], object]]] = {}
+
+MODELS = {
+    "single": ["GranadaS"],
+    "pair": ["GranadaN", "GranadaE"],
+    "all": sorted(VALID_MULTIPLETS),
+}
+
+IMPORT = """
+import time, tracemalloc
+if {trace}:
+    tracemalloc.start()
+start = time.perf_counter()
+import feynwrite.granada, feynwrite.two_field
+seconds = time.perf_counter() - start
+peak = tracemalloc.get_traced_memory()[1] if {trace} else 0
+print(seconds, peak)
+"""
+
+
+def benchmark(name: str):
+    def decorator(setup):
+        BENCHMARKS[name] = setup
+        return setup
+
+    return decorator
+
+
+@benchmark("build_terms")
+def build_terms():
+    return lambda: [factory() for factory in REGISTRY.factories]
+
+
+@benchmark("build_two_field_terms")
+def build_two_field_terms():
+    return lambda: [factory() for factory in TWO_FIELD_REGISTRY.factories]
+
+
+def _model_benchmark(size: str):
+    @benchmark(f"model_{size}")
+    def setup():
+        return lambda: build_model(MODELS[size])
+
+
+def _export_benchmark(size: str, export: str):
+    @benchmark(f"{export}_{size}")
+    def setup():
+        return getattr(build_model(MODELS[size]), export)
+
+
+for size in MODELS:
+    _model_benchmark(size)
+for size in MODELS:
+    _export_benchmark(size, "export_feynrules")
+for export in ["export_latex", "export_mmp_config"]:
+    _export_benchmark("all", export)
+
+
+def time_import(repeat: int) -> Dict[str, float]:
+    """Time importing the Lagrangian in a new interpreter, since imports are
+    cached in this one.
+
+    """
+
+    def run(trace: bool):
+        result = subprocess.run(
+            [sys.executable, "-c", IMPORT.format(trace=trace)],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        seconds, peak = result.stdout.split()
+        return float(seconds), int(peak)
+
+    times = [run(trace=False)[0] for _ in range(repeat)]
+    return summarise(times, peak=run(trace=True)[1])
+
+
+def time_benchmark(func: Callable[[], object], repeat: int) -> Dict[str, float]:
+    # Warm up, so that memoised terms are built before timing
+    func()
+
+    # Loop enough times that each measurement takes at least 0.2 s
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    times = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+
+    gc.collect()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return summarise(times, peak=peak)
+
+
+def summarise(times: List[float], peak: int) -> Dict[str, float]:
+    return {
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.mean(times),
+        "repeat": len(times),
+        "peak_memory": peak,
+    }
+
+
+def git_commit() -> str:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+    return result.stdout.strip()
+
+
+def run(repeat: int, name_filter: str = "") -> Dict:
+    results = {}
+    names = ["import_lagrangian", *BENCHMARKS]
+    for name in names:
+        if name_filter not in name:
+            continue
+        if name == "import_lagrangian":
+            results[name] = time_import(max(1, repeat // 4))
+        else:
+            results[name] = time_benchmark(BENCHMARKS[name](), repeat)
+        print(format_result(name, results[name]))
+
+    return {
+        "commit": git_commit(),
+        "version": __version__,
+        "python": platform.python_version(),
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "benchmarks": results,
+    }
+
+
+def format_result(name: str, result: Dict[str, float]) -> str:
+    return (
+        f"{name:<32} median {result['median'] * 1000:9.3f} ms  "
+        f"min {result['min'] * 1000:9.3f} ms  "
+        f"peak {result['peak_memory'] / 1024:9.1f} KiB"
+    )
+
+
+def compare(old: Dict, new: Dict, threshold: float) -> List[str]:
+    """Print the change in the minimum time and peak memory of each benchmark present
+    in both reports, and return the names of those slower by more than `threshold`.
+
+    """
+    print(f"\nCompared with {old.get('commit', '')[:10] or 'previous report'}:")
+    regressions = []
+    for name, result in new["benchmarks"].items():
+        if name not in old["benchmarks"]:
+            continue
+        before = old["benchmarks"][name]
+        ratio = result["min"] / before["min"]
+        memory = result["peak_memory"] / max(before["peak_memory"], 1)
+        flag = ""
+        if ratio > 1 + threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<32} time x{ratio:5.2f}  memory x{memory:5.2f}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--filter", default="", help="Only run benchmarks with names containing this."
+    )
+    parser.add_argument("--output", help="File to write the JSON report to.")
+    parser.add_argument("--compare", help="JSON report to compare against.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Fractional slowdown of the minimum time reported as a regression.",
+    )
+    args = parser.parse_args()
+
+    report = run(args.repeat, args.filter)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            old = json.load(f)
+        if compare(old, report, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+
+"""Measure the startup cost of a single-multiplet run of the command-line
+interface, e.g. `feynwrite GranadaS`.
+
+Usage: python benchmarks/startup.py [MULTIPLET] [--repeat N]
+
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+RUN = "from feynwrite.cli import main; main()"
+
+
+def import_times(module: str = "feynwrite.cli"):
+    """Return the cumulative import time in microseconds of each module imported
+    when importing `module`, as reported by `python -X importtime`.
+
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def wall_time(multiplet: str, repeat: int):
+    """Return the wall times of running the CLI for `multiplet` in a new interpreter."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-c", RUN, multiplet, "--no-cache"],
+            stdout=subprocess.DEVNULL,
+            check=True,
+        )
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("multiplet", nargs="?", default="GranadaS")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    times = import_times()
+    print(f"import feynwrite.cli: {times['feynwrite.cli'] / 1000:.1f} ms")
+    for name in ["sympy", "feynwrite.granada", "feynwrite.two_field", "click"]:
+        if name in times:
+            print(f"  {name}: {times[name] / 1000:.1f} ms")
+        else:
+            print(f"  {name}: not imported")
+
+    runs = wall_time(args.multiplet, args.repeat)
+    print(
+        f"feynwrite {args.multiplet}: median {statistics.median(runs) * 1000:.0f} ms, "
+        f"min {min(runs) * 1000:.0f} ms over {args.repeat} runs"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+
+"""Measure the time taken to construct every term in `granada.TERMS` and
+`two_field.TWO_FIELD_TERMS`, and the memory used per term.
+
+Usage: python benchmarks/terms.py [--repeat N]
+
+"""
+
+import argparse
+import gc
+import statistics
+import time
+import tracemalloc
+
+import sympy  # noqa: F401 Imported here so it isn't counted below
+
+from feynwrite.granada import REGISTRY
+from feynwrite.two_field import TWO_FIELD_REGISTRY
+
+FACTORIES = REGISTRY.factories + TWO_FIELD_REGISTRY.factories
+
+
+def build_all():
+    return [factory() for factory in FACTORIES]
+
+
+def construction_times(repeat: int):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        build_all()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def memory_per_term() -> float:
+    """Return the memory in bytes allocated per term and kept alive by it."""
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    terms = build_all()
+    gc.collect()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (after - before) / len(terms)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    # Warm up
+    build_all()
+
+    times = construction_times(args.repeat)
+    print(
+        f"Build {len(FACTORIES)} terms: median {statistics.median(times) * 1000:.2f} ms, "
+        f"min {min(times) * 1000:.2f} ms over {args.repeat} runs"
+    )
+    print(f"Memory per term: {memory_per_term():.0f} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+
+"""Functions for exporting many models at once, one FeynRules file per model,
+across a pool of worker processes.
+
+"""
+
+# Depends on: dictionary.py, cache.py
+
+import hashlib
+import os
+import time
+from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, List, Optional, Sequence
+
+from feynwrite.dictionary import build_model, model_label
+from feynwrite.cache import ModelCache, cached_write
+from feynwrite.model import DATE_PREFIX
+
+
+@dataclass
+class BatchResult:
+    """The outcome of exporting a single model in a batch. `error` is empty if the
+    export succeeded, and `sha256` is the hash of the file written.
+
+    """
+
+    label: str
+    path: str
+    seconds: float
+    error: str = ""
+    sha256: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return not self.error
+
+
+def file_sha256(path: str) -> str:
+    """The hash of the FeynRules file at `path`, without the date it was written,
+    so that identical output written on different days has the same hash.
+
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.startswith(DATE_PREFIX.encode()):
+                digest.update(line)
+    return digest.hexdigest()
+
+
+def export_model(
+    multiplets: Sequence[str], output_dir: str, cache_dir: Optional[str] = None
+) -> BatchResult:
+    """Write the FeynRules file for the model containing `multiplets` to
+    `<output_dir>/<model_label>.fr`. If `cache_dir` is given, the file is copied
+    from the cache there when the model hasn't changed. Exceptions are caught and
+    reported in the result so that a single bad model doesn't abort the batch.
+
+    """
+    start = time.perf_counter()
+    label = model_label(multiplets)
+    try:
+        model = build_model(multiplets)
+        path = os.path.join(output_dir, f"{model.name}.fr")
+        cache = ModelCache(cache_dir) if cache_dir is not None else None
+        with open(path, "w") as fr_file:
+            cached_write(model, "fr", model.write_feynrules, fr_file, cache)
+    except Exception as e:
+        return BatchResult(
+            label, "", time.perf_counter() - start, f"{type(e).__name__}: {e}"
+        )
+
+    return BatchResult(
+        label, path, time.perf_counter() - start, sha256=file_sha256(path)
+    )
+
+
+def run_batch(
+    specs: Sequence[Sequence[str]],
+    output_dir: str,
+    workers: Optional[int] = None,
+    report: Optional[Callable[[BatchResult], None]] = None,
+    cache_dir: Optional[str] = None,
+) -> List[BatchResult]:
+    """Export the model for each list of multiplets in `specs` into `output_dir`
+    using a pool of `workers` processes (by default, one per CPU). `report` is
+    called with each result as it completes. Results are returned in the order
+    of `specs`. See `export_model` for `cache_dir`.
+
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    results: List[Optional[BatchResult]] = [None] * len(specs)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(export_model, list(spec), output_dir, cache_dir): n
+            for n, spec in enumerate(specs)
+        }
+        for future in as_completed(futures):
+            n = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # The worker process itself died
+                result = BatchResult(
+                    model_label(specs[n]), "", 0.0, f"{type(e).__name__}: {e}"
+                )
+            if report is not None:
+                report(result)
+            results[n] = result
+
+    return results
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+
+"""An on-disk cache of exported model files. Entries are keyed by a hash of the
+terms in the model and of the source of the modules writing the exports, so
+that a model is only regenerated when its Lagrangian or the exporters change.
+
+"""
+
+# Depends on: model.py
+
+import hashlib
+import os
+from functools import lru_cache
+from typing import Callable, List, Optional, TextIO
+
+from feynwrite import __version__
+from feynwrite.model import DATE_PREFIX, Model, date_line
+from feynwrite.tensor import Tensor
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "FEYNWRITE_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "feynwrite")
+)
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Modules whose source determines the exported files
+EXPORT_MODULES = ["model.py", "tensor.py", "utils.py", "group.py", "hermiticity.py"]
+
+# Attributes that determine how a tensor is exported
+FINGERPRINT_ATTRS = [
+    "label",
+    "indices",
+    "latex",
+    "is_field",
+    "is_conj",
+    "is_complex",
+    "factor",
+    "hypercharge",
+    "is_sm",
+    "is_self_conj",
+    "chirality",
+    "is_charge_conj",
+    "is_dirac_adjoint",
+]
+
+
+def tensor_fingerprint(tensor: Tensor) -> str:
+    """Return a string uniquely identifying the tensor. Unlike `hash`, this is
+    stable across processes.
+
+    """
+    parts = [type(tensor).__name__]
+    for attr in FINGERPRINT_ATTRS:
+        if hasattr(tensor, attr):
+            parts.append(f"{attr}={getattr(tensor, attr)!r}")
+    return ",".join(parts)
+
+
+@lru_cache(maxsize=None)
+def source_hash() -> str:
+    """A hash of the source of the `EXPORT_MODULES`, so that changes to the code
+    writing the exports invalidate the cache.
+
+    """
+    sha = hashlib.sha256()
+    for name in EXPORT_MODULES:
+        with open(os.path.join(os.path.dirname(__file__), name), "rb") as f:
+            sha.update(f.read())
+    return sha.hexdigest()
+
+
+def model_hash(model: Model, kind: str = "fr") -> str:
+    """Return a stable hash of the model's terms (labels, indices, couplings and
+    factors), the kind of export, the feynwrite version and the source of the
+    exporters.
+
+    """
+    sha = hashlib.sha256()
+    sha.update(f"feynwrite {__version__}\n{source_hash()}\n{kind}\n{model.name}\n".encode())
+    for term in model.terms:
+        for tensor in term.tensors:
+            sha.update(tensor_fingerprint(tensor).encode())
+            sha.update(b";")
+        sha.update(b"\n")
+    return sha.hexdigest()
+
+
+class ModelCache:
+    """Directory of cached exports named by their key. The least recently used
+    entries are evicted once the directory grows beyond `max_bytes`.
+
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the path to the cached entry, or None if there isn't one."""
+        path = self.path(key)
+        try:
+            # Mark entry as recently used
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def put(self, key: str, text: str) -> str:
+        """Store `text` under `key` and return the path to the entry."""
+        return self.put_stream(key, lambda fp: fp.write(text))
+
+    def put_stream(self, key: str, write: Callable[[TextIO], None]) -> str:
+        """Store the output of `write(fp)` under `key` and return the path to the
+        entry.
+
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(key)
+        # Write to a temporary file first so that other processes never see a
+        # partially written entry
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as tmp_file:
+            write(tmp_file)
+        os.replace(tmp_path, path)
+        self.evict(keep=key)
+        return path
+
+    def entries(self) -> List[os.DirEntry]:
+        if not os.path.isdir(self.directory):
+            return []
+        return [
+            e for e in os.scandir(self.directory) if e.is_file() and not e.name.endswith(".tmp")
+        ]
+
+    def evict(self, keep: Optional[str] = None) -> None:
+        """Remove the least recently used entries until the cache fits in
+        `max_bytes`. The entry `keep`, if given, is never removed, even if it
+        doesn't fit on its own.
+
+        """
+        entries = []
+        for entry in self.entries():
+            if entry.name == keep:
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        if keep is not None:
+            try:
+                total += os.path.getsize(self.path(keep))
+            except FileNotFoundError:
+                pass
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                # Another process got there first
+                pass
+            total -= size
+
+
+def cache_key(model: Model, kind: str) -> str:
+    return f"{model_hash(model, kind)}.{kind}"
+
+
+def cached_export(
+    model: Model, kind: str, export: Callable[[], str], cache: Optional[ModelCache]
+) -> str:
+    """Return the output of `export()` for the model, reading it from the cache if
+    the model hasn't changed. Pass `cache=None` to always regenerate.
+
+    """
+    if cache is None:
+        return export()
+
+    key = cache_key(model, kind)
+    path = cache.get(key)
+    if path is not None:
+        try:
+            with open(path) as cached_file:
+                return cached_file.read()
+        except FileNotFoundError:
+            # Evicted by another process since it was looked up
+            pass
+
+    text = export()
+    cache.put(key, text)
+    return text
+
+
+def cached_write(
+    model: Model,
+    kind: str,
+    write: Callable[[TextIO], None],
+    fp: TextIO,
+    cache: Optional[ModelCache],
+) -> None:
+    """Stream the output of `write(fp)` for the model to `fp`, copying it from the
+    cache if the model hasn't changed. Pass `cache=None` to always regenerate.
+    The date in a cached FeynRules file is replaced by today's.
+
+    """
+    if cache is None:
+        write(fp)
+        return
+
+    key = cache_key(model, kind)
+    path = cache.get(key)
+    if path is None:
+        path = cache.put_stream(key, write)
+
+    try:
+        cached_file = open(path)
+    except FileNotFoundError:
+        # Evicted by another process since it was looked up or written
+        write(fp)
+        return
+    with cached_file:
+        for line in cached_file:
+            fp.write(date_line() if line.startswith(DATE_PREFIX) else line)
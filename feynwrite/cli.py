@@ -2,165 +2,511 @@
 
 """Function called for the command-line interface."""
 
+import json
+import os
+import time
+
 import click
 
-from feynwrite.model import Model
-from feynwrite.granada import TERMS
-from feynwrite.two_field import TWO_FIELD_TERMS
+from feynwrite.batch import run_batch
+from feynwrite.cache import DEFAULT_CACHE_DIR, ModelCache, cached_export, cached_write
+from feynwrite.dictionary import (
+    SCALARS,
+    FERMIONS,
+    VALID_MULTIPLETS,
+    build_model,
+    parse_model_spec,
+)
+from feynwrite.scan import (
+    enumerate_models,
+    find_gaps,
+    is_conflicting,
+    manifest_path,
+    merge_manifests,
+    parse_shard,
+    pending_models,
+    shard_models,
+)
+from feynwrite.scan import scan as run_scan
 
 help_message = [
     "Print FeynRules file for the multiplets in the Granada dictionary.",
     "Names for the multiplets are as in https://arxiv.org/abs/1711.10391 but without backslashes.",
     "E.g. `feynwrite omega_1 zeta > FeynRulesFile.wl`.",
+    "Use `feynwrite scan --help` for sweeping over combinations of multiplets.",
 ]
 
 
-@click.command(help=" ".join(help_message))
+def report_batch_result(result) -> None:
+    if result.ok:
+        click.echo(f"{result.label}: {result.seconds:.2f}s -> {result.path}", err=True)
+    else:
+        click.echo(f"{result.label}: FAILED after {result.seconds:.2f}s ({result.error})", err=True)
+
+
+class DefaultGroup(click.Group):
+    """Group of commands that falls back to `default_command` when the first argument
+    isn't the name of a command, so that e.g. `feynwrite GranadaS` still works.
+
+    """
+
+    def __init__(self, *args, default_command: str, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.default_command = default_command
+
+    def parse_args(self, ctx, args):
+        if not args or args[0] not in self.commands:
+            args = [self.default_command, *args]
+        return super().parse_args(ctx, args)
+
+
+@click.group(cls=DefaultGroup, default_command="export")
+def main() -> None:
+    """Automate the production of FeynRules files."""
+
+
+@main.command(help=" ".join(help_message))
 @click.argument("multiplets", required=False, nargs=-1)
 @click.option(
     "--mmp-config", is_flag=True, help="Return MatchMakerParser configuration."
 )
 @click.option("--latex", is_flag=True, help="Output model in LaTeX format.")
+@click.option(
+    "--symm",
+    is_flag=True,
+    help="Output the .symm file of coupling symmetries for MatchMakerEFT.",
+)
+@click.option(
+    "--gauge",
+    is_flag=True,
+    help="Output the .gauge file of gauge structures for MatchMakerEFT.",
+)
+@click.option(
+    "--check-hermiticity",
+    is_flag=True,
+    help="Check that the hermitian conjugate of each term is included exactly "
+    "once before exporting, and exit with status 1 if not.",
+)
+@click.option(
+    "--ufo",
+    type=click.Path(file_okay=False),
+    help="Write the model in the UFO format to this directory instead.",
+)
 @click.option("-a", is_flag=True, help="Produce output for all valid multiplets.")
 @click.option("--scalars", is_flag=True, help="Produce output for all valid scalars.")
 @click.option("--fermions", is_flag=True, help="Produce output for all valid fermions.")
-def main(multiplets, mmp_config, latex, a, scalars, fermions) -> None:
+@click.option(
+    "-o",
+    "--output",
+    type=click.File("w"),
+    default="-",
+    help="File to write the output to instead of stdout.",
+)
+@click.option(
+    "--batch",
+    is_flag=True,
+    help="Write one FeynRules file per model. Each argument is then a model, e.g. `GranadaN_GranadaE`.",
+)
+@click.option(
+    "--specs",
+    type=click.File("r"),
+    help="File of models for --batch, one per line.",
+)
+@click.option(
+    "--output-dir",
+    default=".",
+    show_default=True,
+    help="Directory the --batch FeynRules files are written to.",
+)
+@click.option(
+    "-j", "--workers", type=int, help="Number of worker processes for --batch."
+)
+@click.option(
+    "--no-cache", is_flag=True, help="Always regenerate output instead of using the cache."
+)
+@click.option(
+    "--cache-dir",
+    default=DEFAULT_CACHE_DIR,
+    show_default=True,
+    help="Directory for cached output. Also set by FEYNWRITE_CACHE_DIR.",
+)
+def export(
+    multiplets,
+    mmp_config,
+    latex,
+    symm,
+    gauge,
+    check_hermiticity,
+    ufo,
+    a,
+    scalars,
+    fermions,
+    output,
+    batch,
+    specs,
+    output_dir,
+    workers,
+    no_cache,
+    cache_dir,
+) -> None:
     """Automate the production of FeynRules files."""
 
-    if not a and not fermions and not scalars and not multiplets:
+    if not a and not fermions and not scalars and not multiplets and not specs:
         ctx = click.get_current_context()
         click.echo(ctx.get_help())
         return
 
-    # Check that multiplets are valid
-    valid_multiplets = {
-        # Colour-singlet scalars
-        "S",
-        "S1",
-        "S2",
-        "varphi",
-        "Xi",
-        "Xi1",
-        "Theta1",
-        "Theta3",
-        # Colour-triplet scalars
-        "omega1",
-        "omega2",
-        "omega4",
-        "Pi1",
-        "Pi7",
-        "zeta",
-        "Omega1",
-        "Omega2",
-        "Omega4",
-        "Upsilon",
-        "Phi",
-        "N",
-        "ND",
-        "E",
-        "Delta1",
-        "Delta3",
-        "Sigma",
-        "SigmaD",
-        "Sigma1",
-        "U",
-        "D",
-        "Q1",
-        "Q5",
-        "Q7",
-        "T1",
-        "T2",
-    }
-    valid_multiplets = {"Granada" + f for f in valid_multiplets}
-    model_labels = []
-
     if scalars:
-        multiplets = [
-            "S",
-            "S1",
-            "S2",
-            "varphi",
-            "Xi",
-            "Xi1",
-            "Theta1",
-            "Theta3",
-            "omega1",
-            "omega2",
-            "omega4",
-            "Pi1",
-            "Pi7",
-            "zeta",
-            "Omega1",
-            "Omega2",
-            "Omega4",
-            "Upsilon",
-            "Phi",
-        ]
+        multiplets = SCALARS
     if fermions:
-        multiplets = [
-            "N",
-            "E",
-            "Delta1",
-            "Delta3",
-            "Sigma",
-            "Sigma1",
-            "U",
-            "D",
-            "Q1",
-            "Q5",
-            "Q7",
-            "T1",
-            "T2",
-        ]
-    if fermions or scalars:
-        multiplets = ["Granada" + f for f in multiplets]
+        multiplets = FERMIONS
 
     if a:
-        multiplets = valid_multiplets
+        multiplets = sorted(VALID_MULTIPLETS)
+
+    if batch:
+        # With `-a`, `--scalars` or `--fermions` every multiplet is its own model
+        model_specs = [parse_model_spec(spec) for spec in multiplets]
+        if specs is not None:
+            for line in specs:
+                line = line.split("#")[0].strip()
+                if line:
+                    model_specs.append(parse_model_spec(line))
+
+        results = run_batch(
+            model_specs,
+            output_dir,
+            workers=workers,
+            report=report_batch_result,
+            cache_dir=None if no_cache else cache_dir,
+        )
+        failures = [r for r in results if not r.ok]
+        click.echo(
+            f"Exported {len(results) - len(failures)} of {len(results)} models to {output_dir}",
+            err=True,
+        )
+        if failures:
+            click.get_current_context().exit(1)
+        return
 
     if len(multiplets) > 1:
-        print(
+        click.echo(
             """(*** Warning:
         The Lagrangian produced is only valid for:
             - One-loop matching of multiple fermions
             - One-loop matching of models with only one scalar field
  ***)
-            """
+            """,
+            file=output,
         )
 
-    for multiplet in multiplets:
-        if multiplet not in valid_multiplets:
-            raise Exception(
-                f"{multiplet} is not a valid multiplet present in the UV dictionary."
-            )
-        model_labels.append(multiplet)
-
-    # Connect exotic field labels by "_" for name of model
-    model_label = "_".join(model_labels)
+    model = build_model(multiplets)
+    cache = None if no_cache else ModelCache(cache_dir)
 
-    # Collect the Lagrangian
-    lagrangian = []
-    terms_ = TERMS
-    if len(multiplets) > 1:
-        terms_ += TWO_FIELD_TERMS
+    if check_hermiticity:
+        problems = model.check_hermiticity()
+        for problem in problems:
+            click.echo(f"Hermiticity: {problem}", err=True)
+        if problems:
+            click.get_current_context().exit(1)
 
-    for term in terms_:
-        exotic_labels = [exotic.label for exotic in term.exotics]
-        # We only want to include those terms that don't contain other exotics
-        for exotic_label in exotic_labels:
-            if exotic_label not in multiplets:
-                break
-        else:
-            lagrangian.append(term)
-
-    model = Model(model_label, terms=lagrangian)
+    if ufo:
+        model.export_ufo(ufo)
+        click.echo(f"Wrote the UFO model to {ufo}", err=True)
+        return
 
     if mmp_config:
-        click.echo(model.export_mmp_config())
+        click.echo(cached_export(model, "mmp", model.export_mmp_config, cache), file=output)
         return
 
     if latex:
-        click.echo(model.export_latex())
+        click.echo(cached_export(model, "tex", model.export_latex, cache), file=output)
+        return
+
+    if symm:
+        click.echo(cached_export(model, "symm", model.export_symm, cache), file=output, nl=False)
         return
 
-    click.echo(model.export_feynrules())
+    if gauge:
+        click.echo(cached_export(model, "gauge", model.export_gauge, cache), file=output, nl=False)
+        return
+
+    # Stream the FeynRules file straight to the output
+    cached_write(model, "fr", model.write_feynrules, output, cache)
+
+
+def validate_shard(ctx, param, value):
+    if value is None:
+        return None
+    try:
+        return parse_shard(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+
+
+@main.command()
+@click.option(
+    "--max-fields",
+    type=int,
+    default=2,
+    show_default=True,
+    help="Largest number of multiplets in a model.",
+)
+@click.option(
+    "--min-fields",
+    type=int,
+    default=1,
+    show_default=True,
+    help="Smallest number of multiplets in a model.",
+)
+@click.option(
+    "--output-dir",
+    default=".",
+    show_default=True,
+    help="Directory the FeynRules files are written to.",
+)
+@click.option(
+    "--manifest",
+    help="Manifest of completed models. Defaults to manifest.jsonl in the output directory.",
+)
+@click.option(
+    "--shard",
+    callback=validate_shard,
+    help="Only export the Kth of N shards of the models, given as K/N. Each shard has its own manifest.",
+)
+@click.option("-j", "--workers", type=int, help="Number of worker processes.")
+@click.option(
+    "--no-cache", is_flag=True, help="Always regenerate output instead of using the cache."
+)
+@click.option(
+    "--cache-dir",
+    default=DEFAULT_CACHE_DIR,
+    show_default=True,
+    help="Directory for cached output. Also set by FEYNWRITE_CACHE_DIR.",
+)
+def scan(
+    max_fields, min_fields, output_dir, manifest, shard, workers, no_cache, cache_dir
+):
+    """Export every combination of Granada scalars and fermions connected by the
+    two-field terms. Models already completed in the manifest are skipped, so an
+    interrupted scan can be resumed by running it again.
+
+    """
+    models = list(enumerate_models(max_fields, min_fields=min_fields))
+    if shard is not None:
+        models = shard_models(models, *shard)
+    manifest = manifest_path(output_dir, manifest, shard=shard)
+    total = len(pending_models(models, manifest))
+    click.echo(
+        f"Scanning {total} of {len(models)} models, the rest are done in {manifest}",
+        err=True,
+    )
+
+    start = time.perf_counter()
+    count = 0
+
+    def report(result) -> None:
+        nonlocal count
+        count += 1
+        rate = count / (time.perf_counter() - start)
+        click.echo(f"[{count}/{total}, {rate:.1f} models/s] ", nl=False, err=True)
+        report_batch_result(result)
+
+    results = run_scan(
+        models,
+        output_dir,
+        manifest=manifest,
+        workers=workers,
+        report=report,
+        cache_dir=None if no_cache else cache_dir,
+    )
+
+    failures = [r for r in results if not r.ok]
+    seconds = time.perf_counter() - start
+    click.echo(
+        f"Exported {len(results) - len(failures)} of {len(results)} models to {output_dir} "
+        f"in {seconds:.1f}s",
+        err=True,
+    )
+    if failures:
+        click.get_current_context().exit(1)
+
+
+@main.command()
+@click.argument("manifests", nargs=-1, required=True, type=click.Path(exists=True))
+@click.option(
+    "--max-fields",
+    type=int,
+    default=2,
+    show_default=True,
+    help="Largest number of multiplets in a model of the scan.",
+)
+@click.option(
+    "--min-fields",
+    type=int,
+    default=1,
+    show_default=True,
+    help="Smallest number of multiplets in a model of the scan.",
+)
+@click.option(
+    "-o",
+    "--output",
+    type=click.File("w"),
+    default="-",
+    help="File to write the merged manifest to instead of stdout.",
+)
+def merge(manifests, max_fields, min_fields, output):
+    """Merge the manifests of the shards of a scan. Reports the models of the scan
+    missing from every manifest, and the models present in more than one. Exits
+    with status 1 if any models are missing, or if duplicated models have
+    different output.
+
+    """
+    entries, duplicates = merge_manifests(manifests)
+    models = list(enumerate_models(max_fields, min_fields=min_fields))
+    gaps = find_gaps(models, entries)
+
+    for entry in entries.values():
+        output.write(json.dumps(entry) + "\n")
+
+    conflicts = [label for label, copies in duplicates.items() if is_conflicting(copies)]
+    for label, copies in duplicates.items():
+        click.echo(
+            f"{label}: in {len(copies)} manifests ({', '.join(copies)})"
+            + (" with different output" if label in conflicts else ""),
+            err=True,
+        )
+    for label in gaps:
+        click.echo(f"{label}: missing", err=True)
+
+    click.echo(
+        f"Merged {len(manifests)} manifests: {len(models) - len(gaps)} of {len(models)} "
+        f"models done, {len(gaps)} missing, {len(duplicates)} duplicated",
+        err=True,
+    )
+    if gaps or conflicts:
+        click.get_current_context().exit(1)
+
+
+def report_match_result(result) -> None:
+    message = f"{result.label}: {result.status} after {result.seconds:.1f}s"
+    if result.reused:
+        message += " (unchanged since last matched)"
+    if result.attempts > 1:
+        message += f" ({result.attempts} attempts)"
+    if result.error:
+        message += f" ({result.error})"
+    click.echo(message, err=True)
+
+
+@main.command()
+@click.argument("models", nargs=-1)
+@click.option(
+    "--specs",
+    type=click.File("r"),
+    help="File of models to match, one per line.",
+)
+@click.option(
+    "--work-dir",
+    default=".",
+    show_default=True,
+    help="Directory in which each model is matched in its own subdirectory.",
+)
+@click.option(
+    "--support-dir",
+    help="Directory containing granada.red and the matchmakereft "
+    "SM and SMEFT models. Defaults to the mm directory of the repository.",
+)
+@click.option("-j", "--workers", type=int, help="Number of models matched at once.")
+@click.option("--timeout", type=float, help="Seconds after which a matching is killed.")
+@click.option(
+    "--retries",
+    type=int,
+    default=0,
+    show_default=True,
+    help="Times a matching that timed out or failed is retried.",
+)
+@click.option("--summary", help="File to write a JSON summary of the matchings to.")
+@click.option(
+    "--db",
+    help="Database of matching outcomes. Defaults to matching.sqlite in the work directory.",
+)
+@click.option(
+    "--rerun",
+    is_flag=True,
+    help="Match models again even if their inputs are unchanged since they were last matched.",
+)
+def match(
+    models, specs, work_dir, support_dir, workers, timeout, retries, summary, db, rerun
+):
+    """Match each model onto the SMEFT with matchmakereft. Models are named as for
+    `--batch`, e.g. `GranadaN_GranadaE`. Outcomes are recorded in a database, and
+    models whose inputs haven't changed since they were last matched are skipped.
+
+    """
+    # Imported here since matching is rarely needed
+    from feynwrite.matching import DEFAULT_SUPPORT_DIR, match_models, write_summary
+    from feynwrite.results import DB_NAME, ResultStore
+
+    model_specs = [parse_model_spec(spec) for spec in models]
+    if specs is not None:
+        for line in specs:
+            line = line.split("#")[0].strip()
+            if line:
+                model_specs.append(parse_model_spec(line))
+
+    os.makedirs(work_dir, exist_ok=True)
+    with ResultStore(db or os.path.join(work_dir, DB_NAME)) as store:
+        results = match_models(
+            model_specs,
+            work_dir,
+            support_dir=support_dir or DEFAULT_SUPPORT_DIR,
+            workers=workers,
+            timeout=timeout,
+            retries=retries,
+            report=report_match_result,
+            store=store,
+            reuse=not rerun,
+        )
+    if summary is not None:
+        write_summary(results, summary)
+
+    failures = [r for r in results if not r.ok]
+    click.echo(
+        f"Matched {len(results) - len(failures)} of {len(results)} models without problems",
+        err=True,
+    )
+    if failures:
+        click.get_current_context().exit(1)
+
+
+@main.command()
+@click.option(
+    "--work-dir",
+    default=".",
+    show_default=True,
+    help="Directory the models were matched in.",
+)
+@click.option(
+    "--db",
+    help="Database of matching outcomes. Defaults to matching.sqlite in the work directory.",
+)
+@click.option("--failing", is_flag=True, help="Only list models not matched without problems.")
+@click.option("--slow", type=float, help="Only list models that took at least this many seconds.")
+@click.option("-n", "--limit", type=int, help="Largest number of models to list.")
+def results(work_dir, db, failing, slow, limit):
+    """List the recorded outcomes of matching models, slowest first."""
+    from feynwrite.matching import GAMMA5, PROBLEMS, TIMEOUT, ERROR
+    from feynwrite.results import DB_NAME, ResultStore
+
+    path = db or os.path.join(work_dir, DB_NAME)
+    if not os.path.exists(path):
+        raise click.ClickException(f"No matching outcomes recorded in {path}")
+
+    statuses = [GAMMA5, PROBLEMS, TIMEOUT, ERROR] if failing else []
+    with ResultStore(path) as store:
+        for result in store.query(statuses=statuses, min_seconds=slow, limit=limit):
+            click.echo(
+                f"{result.label:<40} {result.status:<10} {result.seconds:10.1f}s "
+                f"{result.attempts} attempts  {result.workdir}"
+            )
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+
+"""An on-disk cache of the decompositions of products of `neutrinomass` fields
+into irreducible representations, as used by `lagrangian.py`. Entries are kept
+in a SQLite database keyed by the kind of decomposition and the sorted
+representations of the fields in the product, so that every process and every
+run shares them. They are dropped when the version of `neutrinomass` changes.
+
+"""
+
+# Depends on: cache.py
+
+import importlib.metadata
+import os
+import pickle
+import sqlite3
+from typing import Any, Dict, Iterable, Sequence, Tuple
+
+from feynwrite.cache import DEFAULT_CACHE_DIR
+
+DB_NAME = "decompositions.sqlite"
+
+# Kinds of decomposition
+FIRST_SINGLET = "first_singlet"  # The first singlet of `decompose_product`, or None
+SINGLETS = "singlets"  # Every singlet of `decompose_product`
+IRREPS = "irreps"  # The irreps in the product of two fields
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS decompositions (
+    kind TEXT NOT NULL,
+    product TEXT NOT NULL,
+    value BLOB NOT NULL,
+    PRIMARY KEY (kind, product)
+);
+"""
+
+# Keep well below SQLite's limit on the number of parameters of a statement
+BATCH_SIZE = 500
+
+Key = Tuple[str, ...]
+
+
+def product_key(fields) -> Key:
+    """The fields of a product with their representations, in sorted order, so
+    that the key doesn't depend on the order of the fields."""
+    return tuple(sorted(repr(f) for f in fields))
+
+
+def neutrinomass_version() -> str:
+    try:
+        return importlib.metadata.version("neutrinomass")
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
+
+
+class DecompositionCache:
+    """Decompositions in the SQLite database at `path`. The database is opened
+    on first use in each process, since connections can't be shared with forked
+    worker processes. If it can't be opened or written to, lookups miss and new
+    entries are dropped, so the decompositions are just computed again.
+
+    """
+
+    def __init__(self, path: str = os.path.join(DEFAULT_CACHE_DIR, DB_NAME)):
+        self.path = path
+        self._connection = None
+        self._pid = None
+
+    def __enter__(self) -> "DecompositionCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._connection is not None and self._pid == os.getpid():
+            self._connection.close()
+        self._connection = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None or self._pid != os.getpid():
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            # Wait for other processes writing to the cache
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.executescript(SCHEMA)
+            _check_version(connection)
+            self._connection, self._pid = connection, os.getpid()
+        return self._connection
+
+    def get_many(self, kind: str, keys: Iterable[Key]) -> Dict[Key, Any]:
+        """Return the cached decompositions of `kind` of the products with `keys`
+        that are in the cache.
+
+        """
+        keys = list(keys)
+        found = {}
+        try:
+            for start in range(0, len(keys), BATCH_SIZE):
+                batch = {_encode(key): key for key in keys[start : start + BATCH_SIZE]}
+                rows = self.connection.execute(
+                    "SELECT product, value FROM decompositions "
+                    f"WHERE kind = ? AND product IN ({', '.join('?' for _ in batch)})",
+                    [kind, *batch],
+                )
+                for product, value in rows:
+                    found[batch[product]] = pickle.loads(value)
+        except (OSError, sqlite3.Error):
+            pass
+        return found
+
+    def put_many(self, kind: str, items: Iterable[Tuple[Key, Any]]) -> None:
+        """Store the decomposition of `kind` of each product in `items`, a sequence
+        of keys and values.
+
+        """
+        rows = [(kind, _encode(key), pickle.dumps(value)) for key, value in items]
+        if not rows:
+            return
+        try:
+            with self.connection:
+                self.connection.executemany(
+                    "INSERT OR REPLACE INTO decompositions (kind, product, value) "
+                    "VALUES (?, ?, ?)",
+                    rows,
+                )
+        except (OSError, sqlite3.Error):
+            pass
+
+    def get_or_compute(self, kind: str, fields: Sequence, compute):
+        """Return the decomposition of `kind` of the product of `fields`, storing
+        `compute()` if it isn't cached yet.
+
+        """
+        key = product_key(fields)
+        found = self.get_many(kind, [key])
+        if key in found:
+            return found[key]
+        value = compute()
+        self.put_many(kind, [(key, value)])
+        return value
+
+    def __len__(self) -> int:
+        try:
+            return self.connection.execute("SELECT COUNT(*) FROM decompositions").fetchone()[0]
+        except (OSError, sqlite3.Error):
+            return 0
+
+
+def _encode(key: Key) -> str:
+    return " * ".join(key)
+
+
+def _check_version(connection: sqlite3.Connection) -> None:
+    """Drop the entries computed by another version of `neutrinomass`."""
+    version = neutrinomass_version()
+    with connection:
+        row = connection.execute("SELECT value FROM meta WHERE name = 'neutrinomass'").fetchone()
+        if row is None or row[0] != version:
+            connection.execute("DELETE FROM decompositions")
+            connection.execute(
+                "INSERT OR REPLACE INTO meta (name, value) VALUES ('neutrinomass', ?)",
+                (version,),
+            )
+
+
+# Shared by the functions in `lagrangian.py` unless they are given another
+DEFAULT_CACHE = DecompositionCache()
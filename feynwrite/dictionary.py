@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+
+"""The multiplets of the Granada dictionary and functions for assembling a
+`Model` from a selection of them.
+
+"""
+
+# Depends on: model.py, granada.py, two_field.py
+
+from typing import List, Sequence
+
+from feynwrite.model import Model
+from feynwrite.tensor import TensorProduct
+from feynwrite.granada import REGISTRY
+from feynwrite.two_field import TWO_FIELD_REGISTRY
+
+SCALARS = [
+    "Granada" + f
+    for f in [
+        # Colour-singlet scalars
+        "S",
+        "S1",
+        "S2",
+        "varphi",
+        "Xi",
+        "Xi1",
+        "Theta1",
+        "Theta3",
+        # Colour-triplet scalars
+        "omega1",
+        "omega2",
+        "omega4",
+        "Pi1",
+        "Pi7",
+        "zeta",
+        "Omega1",
+        "Omega2",
+        "Omega4",
+        "Upsilon",
+        "Phi",
+    ]
+]
+
+FERMIONS = [
+    "Granada" + f
+    for f in [
+        "N",
+        "E",
+        "Delta1",
+        "Delta3",
+        "Sigma",
+        "Sigma1",
+        "U",
+        "D",
+        "Q1",
+        "Q5",
+        "Q7",
+        "T1",
+        "T2",
+    ]
+]
+
+# The Dirac versions of N and Sigma are valid, but not included in `FERMIONS`
+VALID_MULTIPLETS = {*SCALARS, *FERMIONS, "GranadaND", "GranadaSigmaD"}
+
+
+def validate_multiplets(multiplets: Sequence[str]) -> None:
+    """Raise an exception if any of the multiplets are not in the UV dictionary."""
+    for multiplet in multiplets:
+        if multiplet not in VALID_MULTIPLETS:
+            raise Exception(
+                f"{multiplet} is not a valid multiplet present in the UV dictionary."
+            )
+
+
+def model_label(multiplets: Sequence[str]) -> str:
+    """Connect exotic field labels by "_" for name of model."""
+    return "_".join(multiplets)
+
+
+def parse_model_spec(spec: str) -> List[str]:
+    """Return the multiplets in a model specification. Specifications follow the
+    naming convention for models, e.g. `GranadaN_GranadaE`, but multiplets may
+    also be separated by whitespace.
+
+    """
+    return spec.replace("_", " ").split()
+
+
+def select_terms(multiplets: Sequence[str]) -> List[TensorProduct]:
+    """Return the terms of the Lagrangian relevant to the multiplets. Only terms
+    that don't contain other exotics are included, and the two-field terms are
+    only included for models with more than one multiplet.
+
+    """
+    # Only the terms needed are built
+    lagrangian = REGISTRY.terms(multiplets)
+    if len(multiplets) > 1:
+        lagrangian += TWO_FIELD_REGISTRY.terms(multiplets)
+    return lagrangian
+
+
+def build_model(multiplets: Sequence[str]) -> Model:
+    """Return the `Model` containing the terms of the Lagrangian relevant to the
+    multiplets.
+
+    """
+    validate_multiplets(multiplets)
+    return Model(model_label(multiplets), terms=select_terms(multiplets))
@@ -2,10 +2,9 @@
 
 """Defines the multiplets in the Granada dictionary and the terms in the Lagrangian necessary for single-field one-loop graphs."""
 
-# Depends on: tensor.py, sm.py
+# Depends on: tensor.py, sm.py, registry.py
 
 from fractions import Fraction
-from sympy import sqrt, I, Rational
 from feynwrite.tensor import (
     Coupling,
     Scalar,
@@ -20,16 +19,25 @@ from feynwrite.tensor import (
     lambda_,
 )
 from feynwrite.sm import L, Q, H, eR, dR, uR
+from feynwrite.registry import TermRegistry
 
-TERMS = []
+# Terms are only constructed when a model needs them. sympy is imported inside
+# the factories that need it to keep startup fast.
+REGISTRY = TermRegistry()
+
+
+def __getattr__(name):
+    # Build the full list of terms lazily on access to `TERMS`
+    if name == "TERMS":
+        return REGISTRY.terms()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def S() -> Scalar:
     """(1,1,0)"""
     label = "Granada" + "S"
     latex = r"\mathcal{S}"
-    tensor = Scalar(label, [], latex=latex, hypercharge=0)
-    tensor.is_self_conj = True
+    tensor = Scalar(label, [], latex=latex, hypercharge=0, is_self_conj=True)
     return tensor
 
 
@@ -61,8 +69,7 @@ def Xi(I) -> Scalar:
     """(1,3,0)"""
     label = "Granada" + "Xi"
     latex = r"\Xi"
-    tensor = Scalar(label, [I], latex=latex, hypercharge=0)
-    tensor.is_self_conj = True
+    tensor = Scalar(label, [I], latex=latex, hypercharge=0, is_self_conj=True)
     return tensor
 
 
@@ -274,897 +281,991 @@ def T2(s, a, I) -> Fermion:
 ### SCALARS
 
 # kappaS
-kappaS_term = (
-    Coupling("kappaS", [], is_complex=False, latex="\\kappa_{\\mathcal{S}}")
-    * S()
-    * H("i0").C
-    * H("i0")
-)
-TERMS.append(kappaS_term)
+@REGISTRY.register("GranadaS")
+def kappaS_term():
+    return (
+        Coupling("kappaS", [], is_complex=False, latex="\\kappa_{\\mathcal{S}}")
+        * S()
+        * H("i0").C
+        * H("i0")
+    )
 
 # lambdaS
-lambdaS_term = (
-    Coupling("lambdaS", [], is_complex=False, latex="\\lambda_{\\mathcal{S}}")
-    * S()
-    * S()
-    * H("i0").C
-    * H("i0")
-)
-TERMS.append(lambdaS_term)
+@REGISTRY.register("GranadaS")
+def lambdaS_term():
+    return (
+        Coupling("lambdaS", [], is_complex=False, latex="\\lambda_{\\mathcal{S}}")
+        * S()
+        * S()
+        * H("i0").C
+        * H("i0")
+    )
 
 # kappaS3
-kappaS3_term = (
-    Coupling("kappaS3", [], is_complex=False, latex="\\kappa_{\\mathcal{S}3}")
-    * S()
-    * S()
-    * S()
-)
-TERMS.append(kappaS3_term)
+@REGISTRY.register("GranadaS")
+def kappaS3_term():
+    return (
+        Coupling("kappaS3", [], is_complex=False, latex="\\kappa_{\\mathcal{S}3}")
+        * S()
+        * S()
+        * S()
+    )
 
 # yS1
-yS1_term = (
-    Coupling("yS1", "-g0 -g1", is_complex=True, latex="[y_{\\mathcal{S}_1}]")
-    * S1().C
-    * L("s0", "i0", "g0").bar
-    * L("s0", "i1", "g1").CC
-    * eps("i0", "i1")
-)
-TERMS.append(yS1_term)
+@REGISTRY.register("GranadaS1")
+def yS1_term():
+    return (
+        Coupling("yS1", "-g0 -g1", is_complex=True, latex="[y_{\\mathcal{S}_1}]")
+        * S1().C
+        * L("s0", "i0", "g0").bar
+        * L("s0", "i1", "g1").CC
+        * eps("i0", "i1")
+    )
 
 # yS2
-yS2_term = (
-    Coupling("yS2", "-g0 -g1", is_complex=True, latex="[y_{\\mathcal{S}_2}]")
-    * S2().C
-    * eR("s0", "g0").bar
-    * eR("s0", "g1").CC
-)
-TERMS.append(yS2_term)
+@REGISTRY.register("GranadaS2")
+def yS2_term():
+    return (
+        Coupling("yS2", "-g0 -g1", is_complex=True, latex="[y_{\\mathcal{S}_2}]")
+        * S2().C
+        * eR("s0", "g0").bar
+        * eR("s0", "g1").CC
+    )
 
 # yvarphie
-yvarphie_term = (
-    Coupling("yvarphie", "-g0 -g1", is_complex=True, latex="[y_{\\varphi e}]")
-    * varphi("i0").C
-    * eR("s0", "g0").bar
-    * L("s0", "i0", "g1")
-)
-TERMS.append(yvarphie_term)
+@REGISTRY.register("Granadavarphi")
+def yvarphie_term():
+    return (
+        Coupling("yvarphie", "-g0 -g1", is_complex=True, latex="[y_{\\varphi e}]")
+        * varphi("i0").C
+        * eR("s0", "g0").bar
+        * L("s0", "i0", "g1")
+    )
 
 # yvarphid
-yvarphid_term = (
-    Coupling("yvarphid", "-g0 -g1", is_complex=True, latex="[y_{\\varphi d}]")
-    * varphi("i0").C
-    * dR("s0", "c0", "g0").bar
-    * Q("s0", "c0", "i0", "g1")
-)
-TERMS.append(yvarphid_term)
+@REGISTRY.register("Granadavarphi")
+def yvarphid_term():
+    return (
+        Coupling("yvarphid", "-g0 -g1", is_complex=True, latex="[y_{\\varphi d}]")
+        * varphi("i0").C
+        * dR("s0", "c0", "g0").bar
+        * Q("s0", "c0", "i0", "g1")
+    )
 
 # yvarphiu
-yvarphiu_term = (
-    Coupling("yvarphiu", "-g0 -g1", is_complex=True, latex="[y_{\\varphi u}]")
-    * varphi("i0").C
-    * Q("s0", "c0", "i1", "g0").bar
-    * uR("s0", "c0", "g1")
-    * eps("i0", "i1")
-)
-TERMS.append(yvarphiu_term)
+@REGISTRY.register("Granadavarphi")
+def yvarphiu_term():
+    return (
+        Coupling("yvarphiu", "-g0 -g1", is_complex=True, latex="[y_{\\varphi u}]")
+        * varphi("i0").C
+        * Q("s0", "c0", "i1", "g0").bar
+        * uR("s0", "c0", "g1")
+        * eps("i0", "i1")
+    )
 
 # lambdavarphi
-lambdavarphi_term = (
-    Coupling("lambdavarphi", [], is_complex=True, latex="\\lambda_{\\varphi}")
-    * varphi("i0").C
-    * H("i0")
-    * H("i1").C
-    * H("i1")
-)
-TERMS.append(lambdavarphi_term)
+@REGISTRY.register("Granadavarphi")
+def lambdavarphi_term():
+    return (
+        Coupling("lambdavarphi", [], is_complex=True, latex="\\lambda_{\\varphi}")
+        * varphi("i0").C
+        * H("i0")
+        * H("i1").C
+        * H("i1")
+    )
 
 # kappaXi
-kappaXi_term = (
-    Coupling("kappaXi", [], is_complex=False, latex="\\kappa_{\\Xi}")
-    * H("i0").C
-    * Xi("-I0")
-    * sigma("I0", "i0", "-i1")
-    * H("i1")
-)
-TERMS.append(kappaXi_term)
+@REGISTRY.register("GranadaXi")
+def kappaXi_term():
+    return (
+        Coupling("kappaXi", [], is_complex=False, latex="\\kappa_{\\Xi}")
+        * H("i0").C
+        * Xi("-I0")
+        * sigma("I0", "i0", "-i1")
+        * H("i1")
+    )
 
 # lambdaXi
-lambdaXi_term = (
-    Coupling("lambdaXi", [], is_complex=False, latex="\\lambda_{\\Xi}")
-    * Xi("-I0")
-    * Xi("I0")
-    * H("i0").C
-    * H("i0")
-)
-TERMS.append(lambdaXi_term)
+@REGISTRY.register("GranadaXi")
+def lambdaXi_term():
+    return (
+        Coupling("lambdaXi", [], is_complex=False, latex="\\lambda_{\\Xi}")
+        * Xi("-I0")
+        * Xi("I0")
+        * H("i0").C
+        * H("i0")
+    )
 
 # lambdaXi1
-lambdaXi1_term = (
-    Coupling(
-        "lambdaXi1",
-        [],
-        is_complex=False,
-        factor=Rational("1/4"),
-        latex="\\lambda_{\\Xi_1}",
-    )
-    * Xi1("-I0").C
-    * sigma("I0", "i0", "-i1")
-    * Xi1("-I1")
-    * sigma("I1", "i1", "-i0")
-    * H("i2").C
-    * H("i2")
-)
-TERMS.append(lambdaXi1_term)
+@REGISTRY.register("GranadaXi1")
+def lambdaXi1_term():
+    from sympy import Rational
+
+    return (
+        Coupling(
+            "lambdaXi1",
+            [],
+            is_complex=False,
+            factor=Rational("1/4"),
+            latex="\\lambda_{\\Xi_1}",
+        )
+        * Xi1("-I0").C
+        * sigma("I0", "i0", "-i1")
+        * Xi1("-I1")
+        * sigma("I1", "i1", "-i0")
+        * H("i2").C
+        * H("i2")
+    )
 
 # lambdaXi1P
-lambdaXi1P_term = (
-    Coupling(
-        "lambdaXi1P",
-        [],
-        is_complex=False,
-        factor=I / (2 * sqrt(2)),
-        latex="{\\lambda_{\\Xi_1}^\\prime}",
-    )
-    * Xi1("I0").C
-    * Xi1("I1")
-    * H("i0").C
-    * sigma("I2", "i0", "-i1")
-    * H("i1")
-    * eps("-I0", "-I1", "-I2")
-)
-TERMS.append(lambdaXi1P_term)
+@REGISTRY.register("GranadaXi1")
+def lambdaXi1P_term():
+    from sympy import sqrt, I
+
+    return (
+        Coupling(
+            "lambdaXi1P",
+            [],
+            is_complex=False,
+            factor=I / (2 * sqrt(2)),
+            latex="{\\lambda_{\\Xi_1}^\\prime}",
+        )
+        * Xi1("I0").C
+        * Xi1("I1")
+        * H("i0").C
+        * sigma("I2", "i0", "-i1")
+        * H("i1")
+        * eps("-I0", "-I1", "-I2")
+    )
 
 # yXi1
-yXi1_term = (
-    Coupling("yXi1", "-g0 -g1", is_complex=True, latex="[y_{\\Xi_1}]")
-    * Xi1("-I0").C
-    * L("s0", "i0", "g0").bar
-    * L("s0", "i2", "g1").CC
-    * sigma("I0", "i0", "-i1")
-    * eps("i1", "i2")
-)
-TERMS.append(yXi1_term)
+@REGISTRY.register("GranadaXi1")
+def yXi1_term():
+    return (
+        Coupling("yXi1", "-g0 -g1", is_complex=True, latex="[y_{\\Xi_1}]")
+        * Xi1("-I0").C
+        * L("s0", "i0", "g0").bar
+        * L("s0", "i2", "g1").CC
+        * sigma("I0", "i0", "-i1")
+        * eps("i1", "i2")
+    )
 
 # kappaXi1
-kappaXi1_term = (
-    Coupling("kappaXi1", [], is_complex=True, latex="\\kappa_{\\Xi_1}")
-    * Xi1("-I0").C
-    * H("i0")
-    * eps("-i0", "-i1")
-    * sigma("I0", "i1", "-i2")
-    * H("i2")
-)
-TERMS.append(kappaXi1_term)
+@REGISTRY.register("GranadaXi1")
+def kappaXi1_term():
+    return (
+        Coupling("kappaXi1", [], is_complex=True, latex="\\kappa_{\\Xi_1}")
+        * Xi1("-I0").C
+        * H("i0")
+        * eps("-i0", "-i1")
+        * sigma("I0", "i1", "-i2")
+        * H("i2")
+    )
 
 # lambdaTheta1
-lambdaTheta1_term = (
-    Coupling("lambdaTheta1", [], is_complex=True, latex="\\lambda_{\\Theta_1}")
-    * H("i0").C
-    * H("i1")
-    * H("i2").C
-    * eps("i2", "i3")
-    * c2224("-Q0", "i0", "-i1", "-i3")
-    * Theta1("Q0")
-)
-TERMS.append(lambdaTheta1_term)
+@REGISTRY.register("GranadaTheta1")
+def lambdaTheta1_term():
+    return (
+        Coupling("lambdaTheta1", [], is_complex=True, latex="\\lambda_{\\Theta_1}")
+        * H("i0").C
+        * H("i1")
+        * H("i2").C
+        * eps("i2", "i3")
+        * c2224("-Q0", "i0", "-i1", "-i3")
+        * Theta1("Q0")
+    )
 
 # lambdaTheta3
-lambdaTheta3_term = (
-    Coupling("lambdaTheta3", [], is_complex=True, latex="\\lambda_{\\Theta_3}")
-    * H("i0").C
-    * H("i1").C
-    * eps("i1", "i4")
-    * H("i2").C
-    * eps("i2", "i3")
-    * c2224("-Q0", "i0", "-i4", "-i3")
-    * Theta3("Q0")
-)
-TERMS.append(lambdaTheta3_term)
+@REGISTRY.register("GranadaTheta3")
+def lambdaTheta3_term():
+    return (
+        Coupling("lambdaTheta3", [], is_complex=True, latex="\\lambda_{\\Theta_3}")
+        * H("i0").C
+        * H("i1").C
+        * eps("i1", "i4")
+        * H("i2").C
+        * eps("i2", "i3")
+        * c2224("-Q0", "i0", "-i4", "-i3")
+        * Theta3("Q0")
+    )
 
 # yqlomega1
-yqlomega1_term = (
-    Coupling(
-        "yqlomega1", ["-g0", "-g1"], is_complex=True, latex="[y_{q\\ell \\Omega_1}]"
-    )
-    * omega1("c0").C
-    * Q("s0", "c0", "i0", "g0").CC.bar
-    * L("s0", "i1", "g1")
-    * eps("-i0", "-i1")
-)
-TERMS.append(yqlomega1_term)
+@REGISTRY.register("Granadaomega1")
+def yqlomega1_term():
+    return (
+        Coupling(
+            "yqlomega1", ["-g0", "-g1"], is_complex=True, latex="[y_{q\\ell \\Omega_1}]"
+        )
+        * omega1("c0").C
+        * Q("s0", "c0", "i0", "g0").CC.bar
+        * L("s0", "i1", "g1")
+        * eps("-i0", "-i1")
+    )
 
 # yqqomega1
-yqqomega1_term = (
-    Coupling("yqqomega1", ["-g0", "-g1"], is_complex=True, latex="[y_{qq \\Omega_1}]")
-    * omega1("c0").C
-    * Q("s0", "c1", "i0", "g0").bar
-    * Q("s0", "c2", "i1", "g1").CC
-    * eps("i0", "i1")
-    * eps("c0", "c1", "c2")
-)
-TERMS.append(yqqomega1_term)
+@REGISTRY.register("Granadaomega1")
+def yqqomega1_term():
+    return (
+        Coupling("yqqomega1", ["-g0", "-g1"], is_complex=True, latex="[y_{qq \\Omega_1}]")
+        * omega1("c0").C
+        * Q("s0", "c1", "i0", "g0").bar
+        * Q("s0", "c2", "i1", "g1").CC
+        * eps("i0", "i1")
+        * eps("c0", "c1", "c2")
+    )
 
 # yeuomega1
-yeuomega1_term = (
-    Coupling("yeuomega1", ["-g0", "-g1"], is_complex=True, latex="[y_{e u \\Omega_1}]")
-    * omega1("c0").C
-    * eR("s0", "g0").CC.bar
-    * uR("s0", "c0", "g1")
-)
-TERMS.append(yeuomega1_term)
+@REGISTRY.register("Granadaomega1")
+def yeuomega1_term():
+    return (
+        Coupling("yeuomega1", ["-g0", "-g1"], is_complex=True, latex="[y_{e u \\Omega_1}]")
+        * omega1("c0").C
+        * eR("s0", "g0").CC.bar
+        * uR("s0", "c0", "g1")
+    )
 
 # yduomega1
-yduomega1_term = (
-    Coupling("yduomega1", ["-g0", "-g1"], is_complex=True, latex="[y_{d u \\Omega_1}]")
-    * omega1("c0").C
-    * dR("s0", "c1", "g0").bar
-    * uR("s0", "c2", "g1").CC
-    * eps("c0", "c1", "c2")
-)
-TERMS.append(yduomega1_term)
+@REGISTRY.register("Granadaomega1")
+def yduomega1_term():
+    return (
+        Coupling("yduomega1", ["-g0", "-g1"], is_complex=True, latex="[y_{d u \\Omega_1}]")
+        * omega1("c0").C
+        * dR("s0", "c1", "g0").bar
+        * uR("s0", "c2", "g1").CC
+        * eps("c0", "c1", "c2")
+    )
 
 # yomega2
-yomega2_term = (
-    Coupling("yomega2", ["-g0", "-g1"], is_complex=True, latex="[y_{\\Omega_2}]")
-    * omega2("c0").C
-    * dR("s0", "c1", "g0").bar
-    * dR("s0", "c2", "g1").CC
-    * eps("c0", "c1", "c2")
-)
-TERMS.append(yomega2_term)
+@REGISTRY.register("Granadaomega2")
+def yomega2_term():
+    return (
+        Coupling("yomega2", ["-g0", "-g1"], is_complex=True, latex="[y_{\\Omega_2}]")
+        * omega2("c0").C
+        * dR("s0", "c1", "g0").bar
+        * dR("s0", "c2", "g1").CC
+        * eps("c0", "c1", "c2")
+    )
 
 # yedomega4
-yedomega4_term = (
-    Coupling("yedomega4", ["-g0", "-g1"], is_complex=True, latex="[y_{e d \\Omega_4}]")
-    * omega4("c0").C
-    * eR("s0", "g0").CC.bar
-    * dR("s0", "c0", "g1")
-)
-TERMS.append(yedomega4_term)
+@REGISTRY.register("Granadaomega4")
+def yedomega4_term():
+    return (
+        Coupling("yedomega4", ["-g0", "-g1"], is_complex=True, latex="[y_{e d \\Omega_4}]")
+        * omega4("c0").C
+        * eR("s0", "g0").CC.bar
+        * dR("s0", "c0", "g1")
+    )
 
 # yuuomega4
-yuuomega4_term = (
-    Coupling("yuuomega4", ["-g0", "-g1"], is_complex=True, latex="[y_{u u \\Omega_4}]")
-    * omega4("c0").C
-    * uR("s0", "c1", "g0").bar
-    * uR("s0", "c2", "g1").CC
-    * eps("c0", "c1", "c2")
-)
-TERMS.append(yuuomega4_term)
+@REGISTRY.register("Granadaomega4")
+def yuuomega4_term():
+    return (
+        Coupling("yuuomega4", ["-g0", "-g1"], is_complex=True, latex="[y_{u u \\Omega_4}]")
+        * omega4("c0").C
+        * uR("s0", "c1", "g0").bar
+        * uR("s0", "c2", "g1").CC
+        * eps("c0", "c1", "c2")
+    )
 
 # yPi1
-yPi1_term = (
-    Coupling("yPi1", ["-g0", "-g1"], is_complex=True, latex="[y_{\\Pi_1}]")
-    * Pi1("c0", "i0").C
-    * eps("i0", "i1")
-    * L("s0", "i1", "g0").bar
-    * dR("s0", "c0", "g1")
-)
-TERMS.append(yPi1_term)
+@REGISTRY.register("GranadaPi1")
+def yPi1_term():
+    return (
+        Coupling("yPi1", ["-g0", "-g1"], is_complex=True, latex="[y_{\\Pi_1}]")
+        * Pi1("c0", "i0").C
+        * eps("i0", "i1")
+        * L("s0", "i1", "g0").bar
+        * dR("s0", "c0", "g1")
+    )
 
 # yluPi7
-yluPi7_term = (
-    Coupling("yluPi7", ["-g0", "-g1"], is_complex=True, latex="[y_{\\ell u \\Pi_7}]")
-    * Pi7("c0", "i0").C
-    * eps("i0", "i1")
-    * L("s0", "i1", "g0").bar
-    * uR("s0", "c0", "g1")
-)
-TERMS.append(yluPi7_term)
+@REGISTRY.register("GranadaPi7")
+def yluPi7_term():
+    return (
+        Coupling("yluPi7", ["-g0", "-g1"], is_complex=True, latex="[y_{\\ell u \\Pi_7}]")
+        * Pi7("c0", "i0").C
+        * eps("i0", "i1")
+        * L("s0", "i1", "g0").bar
+        * uR("s0", "c0", "g1")
+    )
 
 # yeqPi7
-yeqPi7_term = (
-    Coupling("yeqPi7", ["-g0", "-g1"], is_complex=True, latex="[y_{e q \\Pi_7}]")
-    * Pi7("c0", "i0").C
-    * eR("s0", "g0").bar
-    * Q("s0", "c0", "i0", "g1")
-)
-TERMS.append(yeqPi7_term)
+@REGISTRY.register("GranadaPi7")
+def yeqPi7_term():
+    return (
+        Coupling("yeqPi7", ["-g0", "-g1"], is_complex=True, latex="[y_{e q \\Pi_7}]")
+        * Pi7("c0", "i0").C
+        * eR("s0", "g0").bar
+        * Q("s0", "c0", "i0", "g1")
+    )
 
 # yqlzeta
-yqlzeta_term = (
-    Coupling("yqlzeta", ["-g0", "-g1"], is_complex=True, latex="[y_{q\\ell \\zeta}]")
-    * zeta("c0", "-I0").C
-    * Q("s0", "c0", "i0", "g0").CC.bar
-    * L("s0", "i1", "g1")
-    * eps("-i0", "-i2")
-    * sigma("I0", "i2", "-i1")
-)
-TERMS.append(yqlzeta_term)
+@REGISTRY.register("Granadazeta")
+def yqlzeta_term():
+    return (
+        Coupling("yqlzeta", ["-g0", "-g1"], is_complex=True, latex="[y_{q\\ell \\zeta}]")
+        * zeta("c0", "-I0").C
+        * Q("s0", "c0", "i0", "g0").CC.bar
+        * L("s0", "i1", "g1")
+        * eps("-i0", "-i2")
+        * sigma("I0", "i2", "-i1")
+    )
 
 # yqqzeta
-yqqzeta_term = (
-    Coupling("yqqzeta", ["-g0", "-g1"], is_complex=True, latex="[y_{qq \\zeta}]")
-    * zeta("c0", "-I0").C
-    * Q("s0", "c1", "i0", "g0").bar
-    * Q("s0", "c2", "i1", "g1").CC
-    * sigma("I0", "i0", "-i2")
-    * eps("i2", "i1")
-    * eps("c0", "c1", "c2")
-)
-TERMS.append(yqqzeta_term)
+@REGISTRY.register("Granadazeta")
+def yqqzeta_term():
+    return (
+        Coupling("yqqzeta", ["-g0", "-g1"], is_complex=True, latex="[y_{qq \\zeta}]")
+        * zeta("c0", "-I0").C
+        * Q("s0", "c1", "i0", "g0").bar
+        * Q("s0", "c2", "i1", "g1").CC
+        * sigma("I0", "i0", "-i2")
+        * eps("i2", "i1")
+        * eps("c0", "c1", "c2")
+    )
 
 # yudOmega1
-yudOmega1_term = (
-    Coupling("yudOmega1", ["-g0", "-g1"], is_complex=True, latex="[y_{u d \\Omega_1}]")
-    * Omega1("-X0").C
-    * K("X0", "-c0", "-c1")
-    * uR("s0", "c0", "g0").CC.bar
-    * dR("s0", "c1", "g1")
-)
-TERMS.append(yudOmega1_term)
+@REGISTRY.register("GranadaOmega1")
+def yudOmega1_term():
+    return (
+        Coupling("yudOmega1", ["-g0", "-g1"], is_complex=True, latex="[y_{u d \\Omega_1}]")
+        * Omega1("-X0").C
+        * K("X0", "-c0", "-c1")
+        * uR("s0", "c0", "g0").CC.bar
+        * dR("s0", "c1", "g1")
+    )
 
 
 # yqqOmega1
-yqqOmega1_term = (
-    Coupling("yqqOmega1", ["-g0", "-g1"], is_complex=True, latex="[y_{q q \\Omega_1}]")
-    * Omega1("-X0").C
-    * K("X0", "-c0", "-c1")
-    * Q("s0", "c0", "i0", "g0").CC.bar
-    * Q("s0", "c1", "i1", "g1")
-    * eps("-i0", "-i1")
-)
-TERMS.append(yqqOmega1_term)
+@REGISTRY.register("GranadaOmega1")
+def yqqOmega1_term():
+    return (
+        Coupling("yqqOmega1", ["-g0", "-g1"], is_complex=True, latex="[y_{q q \\Omega_1}]")
+        * Omega1("-X0").C
+        * K("X0", "-c0", "-c1")
+        * Q("s0", "c0", "i0", "g0").CC.bar
+        * Q("s0", "c1", "i1", "g1")
+        * eps("-i0", "-i1")
+    )
 
 # yOmega2
-yOmega2_term = (
-    Coupling("yOmega2", ["-g0", "-g1"], is_complex=True, latex="[y_{\\Omega_2}]")
-    * Omega2("-X0").C
-    * K("X0", "-c0", "-c1")
-    * dR("s0", "c0", "g0").CC.bar
-    * dR("s0", "c1", "g1")
-)
-TERMS.append(yOmega2_term)
+@REGISTRY.register("GranadaOmega2")
+def yOmega2_term():
+    return (
+        Coupling("yOmega2", ["-g0", "-g1"], is_complex=True, latex="[y_{\\Omega_2}]")
+        * Omega2("-X0").C
+        * K("X0", "-c0", "-c1")
+        * dR("s0", "c0", "g0").CC.bar
+        * dR("s0", "c1", "g1")
+    )
 
 # yOmega4
-yOmega4_term = (
-    Coupling("yOmega4", ["-g0", "-g1"], is_complex=True, latex="[y_{\\Omega_4}]")
-    * Omega4("-X0").C
-    * K("X0", "-c0", "-c1")
-    * uR("s0", "c0", "g0").CC.bar
-    * uR("s0", "c1", "g1")
-)
-TERMS.append(yOmega4_term)
+@REGISTRY.register("GranadaOmega4")
+def yOmega4_term():
+    return (
+        Coupling("yOmega4", ["-g0", "-g1"], is_complex=True, latex="[y_{\\Omega_4}]")
+        * Omega4("-X0").C
+        * K("X0", "-c0", "-c1")
+        * uR("s0", "c0", "g0").CC.bar
+        * uR("s0", "c1", "g1")
+    )
 
 # yUpsilon
-yUpsilon_term = (
-    Coupling("yUpsilon", ["-g0", "-g1"], is_complex=True, latex="[y_{\\Upsilon}]")
-    * Upsilon("-X0", "-I0").C
-    * Q("s0", "c0", "i0", "g0").CC.bar
-    * Q("s0", "c1", "i1", "g1")
-    * eps("-i0", "-i2")
-    * sigma("I0", "i2", "-i1")
-    * K("X0", "-c0", "-c1")
-)
-TERMS.append(yUpsilon_term)
+@REGISTRY.register("GranadaUpsilon")
+def yUpsilon_term():
+    return (
+        Coupling("yUpsilon", ["-g0", "-g1"], is_complex=True, latex="[y_{\\Upsilon}]")
+        * Upsilon("-X0", "-I0").C
+        * Q("s0", "c0", "i0", "g0").CC.bar
+        * Q("s0", "c1", "i1", "g1")
+        * eps("-i0", "-i2")
+        * sigma("I0", "i2", "-i1")
+        * K("X0", "-c0", "-c1")
+    )
 
 # yquPhi
-yquPhi_term = (
-    # Introduce factor of 1/2 since in paper T_A is used instead of Gell-mann
-    # matrices
-    Coupling(
-        "yquPhi",
-        ["-g0", "-g1"],
-        is_complex=True,
-        factor=Rational("1/2"),
-        latex="[y_{q u \\Phi}]",
-    )
-    * Phi("-C0", "i0").C
-    * Q("s0", "c0", "i1", "g0").bar
-    * uR("s0", "c1", "g1")
-    * eps("i0", "i1")
-    * lambda_("C0", "c0", "-c1")
-)
-TERMS.append(yquPhi_term)
+@REGISTRY.register("GranadaPhi")
+def yquPhi_term():
+    from sympy import Rational
+
+    return (
+        # Introduce factor of 1/2 since in paper T_A is used instead of Gell-mann
+        # matrices
+        Coupling(
+            "yquPhi",
+            ["-g0", "-g1"],
+            is_complex=True,
+            factor=Rational("1/2"),
+            latex="[y_{q u \\Phi}]",
+        )
+        * Phi("-C0", "i0").C
+        * Q("s0", "c0", "i1", "g0").bar
+        * uR("s0", "c1", "g1")
+        * eps("i0", "i1")
+        * lambda_("C0", "c0", "-c1")
+    )
 
 # yqdPhi
-ydqPhi_term = (
-    # Introduce factor of 1/2 since in paper T_A is used instead of Gell-mann
-    # matrices
-    Coupling(
-        "ydqPhi",
-        ["-g0", "-g1"],
-        is_complex=True,
-        factor=Rational("1/2"),
-        latex="[y_{q d \\Phi}]",
-    )
-    * Phi("-C0", "i0").C
-    * dR("s0", "c0", "g0").bar
-    * Q("s0", "c1", "i0", "g1")
-    * lambda_("C0", "c0", "-c1")
-)
-TERMS.append(ydqPhi_term)
+@REGISTRY.register("GranadaPhi")
+def ydqPhi_term():
+    from sympy import Rational
+
+    return (
+        # Introduce factor of 1/2 since in paper T_A is used instead of Gell-mann
+        # matrices
+        Coupling(
+            "ydqPhi",
+            ["-g0", "-g1"],
+            is_complex=True,
+            factor=Rational("1/2"),
+            latex="[y_{q d \\Phi}]",
+        )
+        * Phi("-C0", "i0").C
+        * dR("s0", "c0", "g0").bar
+        * Q("s0", "c1", "i0", "g1")
+        * lambda_("C0", "c0", "-c1")
+    )
 
 ### FERMIONS
 
 ## LEPTONS
 
 # lambdaN
-lambdaN_term = (
-    Coupling("lambdaN", ["-g0"], is_complex=True, latex="\\lambda_N")
-    * N("s0").right.bar
-    * L("s0", "i0", "g0")
-    * eps("-i0", "-i1")
-    * H("i1")
-)
-TERMS.append(lambdaN_term)
+@REGISTRY.register("GranadaN")
+def lambdaN_term():
+    return (
+        Coupling("lambdaN", ["-g0"], is_complex=True, latex="\\lambda_N")
+        * N("s0").right.bar
+        * L("s0", "i0", "g0")
+        * eps("-i0", "-i1")
+        * H("i1")
+    )
 
 # lambdaE
-lambdaE_term = (
-    Coupling("lambdaE", ["-g0"], is_complex=True, latex="\\lambda_E")
-    * E("s0").right.bar
-    * L("s0", "i0", "g0")
-    * H("i0").C
-)
-TERMS.append(lambdaE_term)
+@REGISTRY.register("GranadaE")
+def lambdaE_term():
+    return (
+        Coupling("lambdaE", ["-g0"], is_complex=True, latex="\\lambda_E")
+        * E("s0").right.bar
+        * L("s0", "i0", "g0")
+        * H("i0").C
+    )
 
 # lambdaDelta1
-lambdaDelta1_term = (
-    Coupling("lambdaDelta1", ["-g0"], is_complex=True, latex="\\lambda_{\\Delta_1}")
-    * Delta1("s0", "i0").left.bar
-    * eR("s0", "g0")
-    * H("i0")
-)
-TERMS.append(lambdaDelta1_term)
+@REGISTRY.register("GranadaDelta1")
+def lambdaDelta1_term():
+    return (
+        Coupling("lambdaDelta1", ["-g0"], is_complex=True, latex="\\lambda_{\\Delta_1}")
+        * Delta1("s0", "i0").left.bar
+        * eR("s0", "g0")
+        * H("i0")
+    )
 
 # lambdaDelta3
-lambdaDelta3_term = (
-    Coupling("lambdaDelta3", ["-g0"], is_complex=True, latex="\\lambda_{\\Delta_3}")
-    * Delta3("s0", "i0").left.bar
-    * eR("s0", "g0")
-    * H("i1").C
-    * eps("i0", "i1")
-)
-TERMS.append(lambdaDelta3_term)
+@REGISTRY.register("GranadaDelta3")
+def lambdaDelta3_term():
+    return (
+        Coupling("lambdaDelta3", ["-g0"], is_complex=True, latex="\\lambda_{\\Delta_3}")
+        * Delta3("s0", "i0").left.bar
+        * eR("s0", "g0")
+        * H("i1").C
+        * eps("i0", "i1")
+    )
 
 # lambdaSigma
-lambdaSigma_term = (
-    Coupling(
-        "lambdaSigma",
-        ["-g0"],
-        is_complex=True,
-        factor=Rational("1/2"),
-        latex="\\lambda_{\\Sigma}",
-    )
-    * Sigma("s0", "-I0").right.bar
-    * L("s0", "i4", "g0")
-    * sigma("I0", "i2", "-i4")
-    * H("i3")
-    * eps("-i3", "-i2")
-)
-TERMS.append(lambdaSigma_term)
+@REGISTRY.register("GranadaSigma")
+def lambdaSigma_term():
+    from sympy import Rational
+
+    return (
+        Coupling(
+            "lambdaSigma",
+            ["-g0"],
+            is_complex=True,
+            factor=Rational("1/2"),
+            latex="\\lambda_{\\Sigma}",
+        )
+        * Sigma("s0", "-I0").right.bar
+        * L("s0", "i4", "g0")
+        * sigma("I0", "i2", "-i4")
+        * H("i3")
+        * eps("-i3", "-i2")
+    )
 
 # lambdaSigma
-lambdaSigma1_term = (
-    Coupling(
-        "lambdaSigma1",
-        ["-g0"],
-        is_complex=True,
-        factor=Rational("1/2"),
-        latex="\\lambda_{\\Sigma_1}",
-    )
-    * Sigma1("s0", "-I0").right.bar
-    * L("s0", "i4", "g0")
-    * sigma("I0", "i3", "-i4")
-    * H("i3").C
-)
-TERMS.append(lambdaSigma1_term)
+@REGISTRY.register("GranadaSigma1")
+def lambdaSigma1_term():
+    from sympy import Rational
+
+    return (
+        Coupling(
+            "lambdaSigma1",
+            ["-g0"],
+            is_complex=True,
+            factor=Rational("1/2"),
+            latex="\\lambda_{\\Sigma_1}",
+        )
+        * Sigma1("s0", "-I0").right.bar
+        * L("s0", "i4", "g0")
+        * sigma("I0", "i3", "-i4")
+        * H("i3").C
+    )
 
 ## QUARKS
 
 # lambdaU
-lambdaU_term = (
-    Coupling("lambdaU", ["-g0"], is_complex=True, latex="\\lambda_U")
-    * U("s0", "c0").right.bar
-    * Q("s0", "c0", "i0", "g0")
-    * H("i1")
-    * eps("-i1", "-i0")
-)
-TERMS.append(lambdaU_term)
+@REGISTRY.register("GranadaU")
+def lambdaU_term():
+    return (
+        Coupling("lambdaU", ["-g0"], is_complex=True, latex="\\lambda_U")
+        * U("s0", "c0").right.bar
+        * Q("s0", "c0", "i0", "g0")
+        * H("i1")
+        * eps("-i1", "-i0")
+    )
 
 # lambdaD
-lambdaD_term = (
-    Coupling("lambdaD", ["-g0"], is_complex=True, latex="\\lambda_D")
-    * D("s0", "c0").right.bar
-    * Q("s0", "c0", "i0", "g0")
-    * H("i0").C
-)
-TERMS.append(lambdaD_term)
+@REGISTRY.register("GranadaD")
+def lambdaD_term():
+    return (
+        Coupling("lambdaD", ["-g0"], is_complex=True, latex="\\lambda_D")
+        * D("s0", "c0").right.bar
+        * Q("s0", "c0", "i0", "g0")
+        * H("i0").C
+    )
 
 # lambdauQ1
-lambdauQ1_term = (
-    Coupling("lambdauQ1", ["-g0"], is_complex=True, latex="\\lambda_{u Q_1}")
-    * Q1("s0", "c0", "i0").left.bar
-    * uR("s0", "c0", "g0")
-    * H("i1").C
-    * eps("i0", "i1")
-)
-TERMS.append(lambdauQ1_term)
+@REGISTRY.register("GranadaQ1")
+def lambdauQ1_term():
+    return (
+        Coupling("lambdauQ1", ["-g0"], is_complex=True, latex="\\lambda_{u Q_1}")
+        * Q1("s0", "c0", "i0").left.bar
+        * uR("s0", "c0", "g0")
+        * H("i1").C
+        * eps("i0", "i1")
+    )
 
 # lambdadQ1
-lambdadQ1_term = (
-    Coupling("lambdadQ1", ["-g0"], is_complex=True, latex="\\lambda_{d Q_1}")
-    * Q1("s0", "c0", "i0").left.bar
-    * dR("s0", "c0", "g0")
-    * H("i0")
-)
-TERMS.append(lambdadQ1_term)
+@REGISTRY.register("GranadaQ1")
+def lambdadQ1_term():
+    return (
+        Coupling("lambdadQ1", ["-g0"], is_complex=True, latex="\\lambda_{d Q_1}")
+        * Q1("s0", "c0", "i0").left.bar
+        * dR("s0", "c0", "g0")
+        * H("i0")
+    )
 
 # lambdaQ5
-lambdaQ5_term = (
-    Coupling("lambdaQ5", ["-g0"], is_complex=True, latex="\\lambda_{Q_5}")
-    * Q5("s0", "c0", "i0").left.bar
-    * dR("s0", "c0", "g0")
-    * H("i1").C
-    * eps("i0", "i1")
-)
-TERMS.append(lambdaQ5_term)
+@REGISTRY.register("GranadaQ5")
+def lambdaQ5_term():
+    return (
+        Coupling("lambdaQ5", ["-g0"], is_complex=True, latex="\\lambda_{Q_5}")
+        * Q5("s0", "c0", "i0").left.bar
+        * dR("s0", "c0", "g0")
+        * H("i1").C
+        * eps("i0", "i1")
+    )
 
 # lambdaQ7
-lambdaQ7_term = (
-    Coupling("lambdaQ7", ["-g0"], is_complex=True, latex="\\lambda_{Q_7}")
-    * Q7("s0", "c0", "i0").left.bar
-    * uR("s0", "c0", "g0")
-    * H("i0")
-)
-TERMS.append(lambdaQ7_term)
+@REGISTRY.register("GranadaQ7")
+def lambdaQ7_term():
+    return (
+        Coupling("lambdaQ7", ["-g0"], is_complex=True, latex="\\lambda_{Q_7}")
+        * Q7("s0", "c0", "i0").left.bar
+        * uR("s0", "c0", "g0")
+        * H("i0")
+    )
 
 # lambdaT1
-lambdaT1_term = (
-    Coupling(
-        "lambdaT1",
-        ["-g0"],
-        is_complex=True,
-        factor=Rational("1/2"),
-        latex="\\lambda_{T_1}",
-    )
-    * T1("s0", "c0", "-I0").right.bar
-    * Q("s0", "c0", "i0", "g0")
-    * H("i1").C
-    * sigma("I0", "i1", "-i0")
-)
-TERMS.append(lambdaT1_term)
+@REGISTRY.register("GranadaT1")
+def lambdaT1_term():
+    from sympy import Rational
+
+    return (
+        Coupling(
+            "lambdaT1",
+            ["-g0"],
+            is_complex=True,
+            factor=Rational("1/2"),
+            latex="\\lambda_{T_1}",
+        )
+        * T1("s0", "c0", "-I0").right.bar
+        * Q("s0", "c0", "i0", "g0")
+        * H("i1").C
+        * sigma("I0", "i1", "-i0")
+    )
 
 # lambdaT2
-lambdaT2_term = (
-    Coupling(
-        "lambdaT2",
-        ["-g0"],
-        is_complex=True,
-        factor=Rational("1/2"),
-        latex="\\lambda_{T_2}",
-    )
-    * T2("s0", "c0", "-I0").right.bar
-    * Q("s0", "c0", "i0", "g0")
-    * H("i1")
-    * eps("-i1", "-i2")
-    * sigma("I0", "i2", "-i0")
-)
-TERMS.append(lambdaT2_term)
+@REGISTRY.register("GranadaT2")
+def lambdaT2_term():
+    from sympy import Rational
+
+    return (
+        Coupling(
+            "lambdaT2",
+            ["-g0"],
+            is_complex=True,
+            factor=Rational("1/2"),
+            latex="\\lambda_{T_2}",
+        )
+        * T2("s0", "c0", "-I0").right.bar
+        * Q("s0", "c0", "i0", "g0")
+        * H("i1")
+        * eps("-i1", "-i2")
+        * sigma("I0", "i2", "-i0")
+    )
 
 
 ## Additional terms in the scalar potential (hatted in the paper)
 
 # lambda_hat_S1
-lambda_hat_S1_term = (
-    Coupling(
-        "lambdaHatS1", [], is_complex=False, latex="\\hat{\\lambda}_{\\mathcal{S}_1}"
-    )
-    * H("i0").C
-    * H("i0")
-    * S1().C
-    * S1()
-)
-TERMS.append(lambda_hat_S1_term)
+@REGISTRY.register("GranadaS1")
+def lambda_hat_S1_term():
+    return (
+        Coupling(
+            "lambdaHatS1", [], is_complex=False, latex="\\hat{\\lambda}_{\\mathcal{S}_1}"
+        )
+        * H("i0").C
+        * H("i0")
+        * S1().C
+        * S1()
+    )
 
 # lambda_hat_S2
-lambda_hat_S2_term = (
-    Coupling(
-        "lambdaHatS2", [], is_complex=False, latex="\\hat{\\lambda}_{\\mathcal{S}_2}"
-    )
-    * H("i0").C
-    * H("i0")
-    * S2().C
-    * S2()
-)
-TERMS.append(lambda_hat_S2_term)
+@REGISTRY.register("GranadaS2")
+def lambda_hat_S2_term():
+    return (
+        Coupling(
+            "lambdaHatS2", [], is_complex=False, latex="\\hat{\\lambda}_{\\mathcal{S}_2}"
+        )
+        * H("i0").C
+        * H("i0")
+        * S2().C
+        * S2()
+    )
 
 # lambda_hat_varphi
-lambda_hat_varphi_term = (
-    Coupling(
-        "lambdaHatvarphi", [], is_complex=False, latex="\\hat{\\lambda}_{\\varphi}"
-    )
-    * H("i0").C
-    * H("i0")
-    * varphi("i1").C
-    * varphi("i1")
-)
-TERMS.append(lambda_hat_varphi_term)
+@REGISTRY.register("Granadavarphi")
+def lambda_hat_varphi_term():
+    return (
+        Coupling(
+            "lambdaHatvarphi", [], is_complex=False, latex="\\hat{\\lambda}_{\\varphi}"
+        )
+        * H("i0").C
+        * H("i0")
+        * varphi("i1").C
+        * varphi("i1")
+    )
 
 # lambda_hat_Theta1
-lambda_hat_Theta1_term = (
-    Coupling(
-        "lambdaHatTheta1", [], is_complex=False, latex="\\hat{\\lambda}_{\\Theta_1}"
-    )
-    * H("i0").C
-    * H("i0")
-    * Theta1("Q0").C
-    * Theta1("Q0")
-)
-TERMS.append(lambda_hat_Theta1_term)
+@REGISTRY.register("GranadaTheta1")
+def lambda_hat_Theta1_term():
+    return (
+        Coupling(
+            "lambdaHatTheta1", [], is_complex=False, latex="\\hat{\\lambda}_{\\Theta_1}"
+        )
+        * H("i0").C
+        * H("i0")
+        * Theta1("Q0").C
+        * Theta1("Q0")
+    )
 
 # lambda_hat_Theta3
-lambda_hat_Theta3_term = (
-    Coupling(
-        "lambdaHatTheta3", [], is_complex=False, latex="\\hat{\\lambda}_{\\Theta_3}"
-    )
-    * H("i0").C
-    * H("i0")
-    * Theta3("Q0").C
-    * Theta3("Q0")
-)
-TERMS.append(lambda_hat_Theta3_term)
+@REGISTRY.register("GranadaTheta3")
+def lambda_hat_Theta3_term():
+    return (
+        Coupling(
+            "lambdaHatTheta3", [], is_complex=False, latex="\\hat{\\lambda}_{\\Theta_3}"
+        )
+        * H("i0").C
+        * H("i0")
+        * Theta3("Q0").C
+        * Theta3("Q0")
+    )
 
 # lambda_hat_omega1
-lambda_hat_omega1_term = (
-    Coupling(
-        "lambdaHatomega1", [], is_complex=False, latex="\\hat{\\lambda}_{\\omega_1}"
-    )
-    * H("i0").C
-    * H("i0")
-    * omega1("c0").C
-    * omega1("c0")
-)
-TERMS.append(lambda_hat_omega1_term)
+@REGISTRY.register("Granadaomega1")
+def lambda_hat_omega1_term():
+    return (
+        Coupling(
+            "lambdaHatomega1", [], is_complex=False, latex="\\hat{\\lambda}_{\\omega_1}"
+        )
+        * H("i0").C
+        * H("i0")
+        * omega1("c0").C
+        * omega1("c0")
+    )
 
 # lambda_hat_omega2
-lambda_hat_omega2_term = (
-    Coupling(
-        "lambdaHatomega2", [], is_complex=False, latex="\\hat{\\lambda}_{\\omega_2}"
-    )
-    * H("i0").C
-    * H("i0")
-    * omega2("c0").C
-    * omega2("c0")
-)
-TERMS.append(lambda_hat_omega2_term)
+@REGISTRY.register("Granadaomega2")
+def lambda_hat_omega2_term():
+    return (
+        Coupling(
+            "lambdaHatomega2", [], is_complex=False, latex="\\hat{\\lambda}_{\\omega_2}"
+        )
+        * H("i0").C
+        * H("i0")
+        * omega2("c0").C
+        * omega2("c0")
+    )
 
 # lambda_hat_omega4
-lambda_hat_omega4_term = (
-    Coupling(
-        "lambdaHatomega4", [], is_complex=False, latex="\\hat{\\lambda}_{\\omega_4}"
-    )
-    * H("i0").C
-    * H("i0")
-    * omega4("c0").C
-    * omega4("c0")
-)
-TERMS.append(lambda_hat_omega4_term)
+@REGISTRY.register("Granadaomega4")
+def lambda_hat_omega4_term():
+    return (
+        Coupling(
+            "lambdaHatomega4", [], is_complex=False, latex="\\hat{\\lambda}_{\\omega_4}"
+        )
+        * H("i0").C
+        * H("i0")
+        * omega4("c0").C
+        * omega4("c0")
+    )
 
 
 # lambda_hat_Pi1
-lambda_hat_Pi1_term = (
-    Coupling("lambdaHatPi1", [], is_complex=False, latex="\\hat{\\lambda}_{\\Pi_1}")
-    * H("i0").C
-    * H("i0")
-    * Pi1("c0", "i1").C
-    * Pi1("c0", "i1")
-)
-TERMS.append(lambda_hat_Pi1_term)
+@REGISTRY.register("GranadaPi1")
+def lambda_hat_Pi1_term():
+    return (
+        Coupling("lambdaHatPi1", [], is_complex=False, latex="\\hat{\\lambda}_{\\Pi_1}")
+        * H("i0").C
+        * H("i0")
+        * Pi1("c0", "i1").C
+        * Pi1("c0", "i1")
+    )
 
 # lambda_hat_Pi7
-lambda_hat_Pi7_term = (
-    Coupling("lambdaHatPi7", [], is_complex=False, latex="\\hat{\\lambda}_{\\Pi_7}")
-    * H("i0").C
-    * H("i0")
-    * Pi7("c0", "i1").C
-    * Pi7("c0", "i1")
-)
-TERMS.append(lambda_hat_Pi7_term)
+@REGISTRY.register("GranadaPi7")
+def lambda_hat_Pi7_term():
+    return (
+        Coupling("lambdaHatPi7", [], is_complex=False, latex="\\hat{\\lambda}_{\\Pi_7}")
+        * H("i0").C
+        * H("i0")
+        * Pi7("c0", "i1").C
+        * Pi7("c0", "i1")
+    )
 
 # lambda_hat_zeta
-lambda_hat_zeta_term = (
-    Coupling("lambdaHatzeta", [], is_complex=False, latex="\\hat{\\lambda}_{\\zeta}")
-    * H("i0").C
-    * H("i0")
-    * zeta("c0", "-I0").C
-    * zeta("c0", "I0")
-)
-TERMS.append(lambda_hat_zeta_term)
+@REGISTRY.register("Granadazeta")
+def lambda_hat_zeta_term():
+    return (
+        Coupling("lambdaHatzeta", [], is_complex=False, latex="\\hat{\\lambda}_{\\zeta}")
+        * H("i0").C
+        * H("i0")
+        * zeta("c0", "-I0").C
+        * zeta("c0", "I0")
+    )
 
 # lambda_hat_Omega1
-lambda_hat_Omega1_term = (
-    Coupling(
-        "lambdaHatOmega1", [], is_complex=False, latex="\\hat{\\lambda}_{\\Omega_1}"
-    )
-    * H("i0").C
-    * H("i0")
-    * Omega1("-X0").C
-    * Omega1("X0")
-)
-TERMS.append(lambda_hat_Omega1_term)
+@REGISTRY.register("GranadaOmega1")
+def lambda_hat_Omega1_term():
+    return (
+        Coupling(
+            "lambdaHatOmega1", [], is_complex=False, latex="\\hat{\\lambda}_{\\Omega_1}"
+        )
+        * H("i0").C
+        * H("i0")
+        * Omega1("-X0").C
+        * Omega1("X0")
+    )
 
 # lambda_hat_Omega2
-lambda_hat_Omega2_term = (
-    Coupling(
-        "lambdaHatOmega2", [], is_complex=False, latex="\\hat{\\lambda}_{\\Omega_2}"
-    )
-    * H("i0").C
-    * H("i0")
-    * Omega2("-X0").C
-    * Omega2("X0")
-)
-TERMS.append(lambda_hat_Omega2_term)
+@REGISTRY.register("GranadaOmega2")
+def lambda_hat_Omega2_term():
+    return (
+        Coupling(
+            "lambdaHatOmega2", [], is_complex=False, latex="\\hat{\\lambda}_{\\Omega_2}"
+        )
+        * H("i0").C
+        * H("i0")
+        * Omega2("-X0").C
+        * Omega2("X0")
+    )
 
 # lambda_hat_Omega4
-lambda_hat_Omega4_term = (
-    Coupling(
-        "lambdaHatOmega4", [], is_complex=False, latex="\\hat{\\lambda}_{\\Omega_4}"
-    )
-    * H("i0").C
-    * H("i0")
-    * Omega4("-X0").C
-    * Omega4("X0")
-)
-TERMS.append(lambda_hat_Omega4_term)
+@REGISTRY.register("GranadaOmega4")
+def lambda_hat_Omega4_term():
+    return (
+        Coupling(
+            "lambdaHatOmega4", [], is_complex=False, latex="\\hat{\\lambda}_{\\Omega_4}"
+        )
+        * H("i0").C
+        * H("i0")
+        * Omega4("-X0").C
+        * Omega4("X0")
+    )
 
 # lambda_hat_Upsilon
-lambda_hat_Upsilon_term = (
-    Coupling(
-        "lambdaHatUpsilon", [], is_complex=False, latex="\\hat{\\lambda}_{\\Upsilon}"
-    )
-    * H("i0").C
-    * H("i0")
-    * Upsilon("-X0", "-I0").C
-    * Upsilon("X0", "I0")
-)
-TERMS.append(lambda_hat_Upsilon_term)
+@REGISTRY.register("GranadaUpsilon")
+def lambda_hat_Upsilon_term():
+    return (
+        Coupling(
+            "lambdaHatUpsilon", [], is_complex=False, latex="\\hat{\\lambda}_{\\Upsilon}"
+        )
+        * H("i0").C
+        * H("i0")
+        * Upsilon("-X0", "-I0").C
+        * Upsilon("X0", "I0")
+    )
 
 # lambda_hat_Phi
-lambda_hat_Phi_term = (
-    Coupling("lambdaHatPhi", [], is_complex=False, latex="\\hat{\\lambda}_{\\Phi}")
-    * H("i0").C
-    * H("i0")
-    * Phi("-C0", "i1").C
-    * Phi("C0", "i1")
-)
-TERMS.append(lambda_hat_Phi_term)
+@REGISTRY.register("GranadaPhi")
+def lambda_hat_Phi_term():
+    return (
+        Coupling("lambdaHatPhi", [], is_complex=False, latex="\\hat{\\lambda}_{\\Phi}")
+        * H("i0").C
+        * H("i0")
+        * Phi("-C0", "i1").C
+        * Phi("C0", "i1")
+    )
 
 
 # lambda_hat_prime_varphi
-lambda_hat_prime_varphi_term = (
-    Coupling(
-        "lambdaHatPrimevarphi",
-        [],
-        is_complex=False,
-        latex="\\hat{\\lambda}^{\\prime}_{\\varphi}",
-    )
-    * H("i0").C
-    * varphi("i0")
-    * varphi("i1").C
-    * H("i1")
-)
-TERMS.append(lambda_hat_prime_varphi_term)
+@REGISTRY.register("Granadavarphi")
+def lambda_hat_prime_varphi_term():
+    return (
+        Coupling(
+            "lambdaHatPrimevarphi",
+            [],
+            is_complex=False,
+            latex="\\hat{\\lambda}^{\\prime}_{\\varphi}",
+        )
+        * H("i0").C
+        * varphi("i0")
+        * varphi("i1").C
+        * H("i1")
+    )
 
 
 # lambda_hat_prime_Theta1
-lambda_hat_prime_Theta1_term = (
-    Coupling(
-        "lambdaHatPrimeTheta1",
-        [],
-        is_complex=False,
-        latex="\\hat{\\lambda}^{\\prime}_{\\Theta_1}",
-    )
-    * Theta1("-Q0").C
-    * c344("-I0", "Q0", "-Q1")
-    * Theta1("Q1")
-    * H("i1").C
-    * sigma("I0", "i1", "-i2")
-    * H("i2")
-)
-TERMS.append(lambda_hat_prime_Theta1_term)
+@REGISTRY.register("GranadaTheta1")
+def lambda_hat_prime_Theta1_term():
+    return (
+        Coupling(
+            "lambdaHatPrimeTheta1",
+            [],
+            is_complex=False,
+            latex="\\hat{\\lambda}^{\\prime}_{\\Theta_1}",
+        )
+        * Theta1("-Q0").C
+        * c344("-I0", "Q0", "-Q1")
+        * Theta1("Q1")
+        * H("i1").C
+        * sigma("I0", "i1", "-i2")
+        * H("i2")
+    )
 
 
 # lambda_hat_prime_Theta3
-lambda_hat_prime_Theta3_term = (
-    Coupling(
-        "lambdaHatPrimeTheta3",
-        [],
-        is_complex=False,
-        latex="\\hat{\\lambda}^{\\prime}_{\\Theta_3}",
-    )
-    * Theta3("-Q0").C
-    * c344("-I0", "Q0", "-Q1")
-    * Theta3("Q1")
-    * H("i1").C
-    * sigma("I0", "i1", "-i2")
-    * H("i2")
-)
-TERMS.append(lambda_hat_prime_Theta3_term)
+@REGISTRY.register("GranadaTheta3")
+def lambda_hat_prime_Theta3_term():
+    return (
+        Coupling(
+            "lambdaHatPrimeTheta3",
+            [],
+            is_complex=False,
+            latex="\\hat{\\lambda}^{\\prime}_{\\Theta_3}",
+        )
+        * Theta3("-Q0").C
+        * c344("-I0", "Q0", "-Q1")
+        * Theta3("Q1")
+        * H("i1").C
+        * sigma("I0", "i1", "-i2")
+        * H("i2")
+    )
 
 # lambda_hat_prime_Pi1
-lambda_hat_prime_Pi1_term = (
-    Coupling(
-        "lambdaHatPrimePi1",
-        [],
-        is_complex=False,
-        latex="\\hat{\\lambda}^{\\prime}_{\\Pi_1}",
-    )
-    * Pi1("c0", "i0").C
-    * H("i0")
-    * H("i1").C
-    * Pi1("c0", "i1")
-)
-TERMS.append(lambda_hat_prime_Pi1_term)
+@REGISTRY.register("GranadaPi1")
+def lambda_hat_prime_Pi1_term():
+    return (
+        Coupling(
+            "lambdaHatPrimePi1",
+            [],
+            is_complex=False,
+            latex="\\hat{\\lambda}^{\\prime}_{\\Pi_1}",
+        )
+        * Pi1("c0", "i0").C
+        * H("i0")
+        * H("i1").C
+        * Pi1("c0", "i1")
+    )
 
 # lambda_hat_prime_Pi7
-lambda_hat_prime_Pi7_term = (
-    Coupling(
-        "lambdaHatPrimePi7",
-        [],
-        is_complex=False,
-        latex="\\hat{\\lambda}^{\\prime}_{\\Pi_7}",
-    )
-    * Pi7("c0", "i0").C
-    * H("i0")
-    * H("i1").C
-    * Pi7("c0", "i1")
-)
-TERMS.append(lambda_hat_prime_Pi7_term)
+@REGISTRY.register("GranadaPi7")
+def lambda_hat_prime_Pi7_term():
+    return (
+        Coupling(
+            "lambdaHatPrimePi7",
+            [],
+            is_complex=False,
+            latex="\\hat{\\lambda}^{\\prime}_{\\Pi_7}",
+        )
+        * Pi7("c0", "i0").C
+        * H("i0")
+        * H("i1").C
+        * Pi7("c0", "i1")
+    )
 
 # lambda_hat_prime_Phi
-lambda_hat_prime_Phi_term = (
-    Coupling(
-        "lambdaHatPrimePhi",
-        [],
-        is_complex=False,
-        latex="\\hat{\\lambda}^{\\prime}_{\\Phi}",
-    )
-    * Phi("-C0", "i0").C
-    * H("i0")
-    * H("i1").C
-    * Phi("-C1", "i1")
-    * lambda_("C0", "c0", "-c1")
-    * lambda_("C1", "c1", "-c0")
-)
-TERMS.append(lambda_hat_prime_Phi_term)
+@REGISTRY.register("GranadaPhi")
+def lambda_hat_prime_Phi_term():
+    return (
+        Coupling(
+            "lambdaHatPrimePhi",
+            [],
+            is_complex=False,
+            latex="\\hat{\\lambda}^{\\prime}_{\\Phi}",
+        )
+        * Phi("-C0", "i0").C
+        * H("i0")
+        * H("i1").C
+        * Phi("-C1", "i1")
+        * lambda_("C0", "c0", "-c1")
+        * lambda_("C1", "c1", "-c0")
+    )
 
 
 # lambda_hat_prime_zeta
-lambda_hat_prime_zeta_term = (
-    Coupling(
-        "lambdaHatPrimezeta",
-        [],
-        is_complex=False,
-        factor=I / (sqrt(2)),
-        latex="\\hat{\\lambda}^{\\prime}_{\\zeta}",
-    )
-    * zeta("c0", "I0").C
-    * zeta("c0", "I1")
-    * H("i0").C
-    * H("i1")
-    * sigma("I2", "i0", "-i1")
-    * eps("-I0", "-I1", "-I2")
-)
-TERMS.append(lambda_hat_prime_zeta_term)
+@REGISTRY.register("Granadazeta")
+def lambda_hat_prime_zeta_term():
+    from sympy import sqrt, I
+
+    return (
+        Coupling(
+            "lambdaHatPrimezeta",
+            [],
+            is_complex=False,
+            factor=I / (sqrt(2)),
+            latex="\\hat{\\lambda}^{\\prime}_{\\zeta}",
+        )
+        * zeta("c0", "I0").C
+        * zeta("c0", "I1")
+        * H("i0").C
+        * H("i1")
+        * sigma("I2", "i0", "-i1")
+        * eps("-I0", "-I1", "-I2")
+    )
 
 # lambda_hat_prime_Upsilon
-lambda_hat_prime_Upsilon_term = (
-    Coupling(
-        "lambdaHatPrimeUpsilon",
-        [],
-        is_complex=False,
-        factor=I / (sqrt(2)),
-        latex="\\hat{\\lambda}^{\\prime}_{\\Upsilon}",
-    )
-    * Upsilon("-X0", "I0").C
-    * Upsilon("X0", "I1")
-    * H("i0").C
-    * H("i1")
-    * sigma("I2", "i0", "-i1")
-    * eps("-I0", "-I1", "-I2")
-)
-TERMS.append(lambda_hat_prime_Upsilon_term)
+@REGISTRY.register("GranadaUpsilon")
+def lambda_hat_prime_Upsilon_term():
+    from sympy import sqrt, I
+
+    return (
+        Coupling(
+            "lambdaHatPrimeUpsilon",
+            [],
+            is_complex=False,
+            factor=I / (sqrt(2)),
+            latex="\\hat{\\lambda}^{\\prime}_{\\Upsilon}",
+        )
+        * Upsilon("-X0", "I0").C
+        * Upsilon("X0", "I1")
+        * H("i0").C
+        * H("i1")
+        * sigma("I2", "i0", "-i1")
+        * eps("-I0", "-I1", "-I2")
+    )
 
 
 # lambda_hat_prime_prime_Theta1
@@ -1181,34 +1282,36 @@ TERMS.append(lambda_hat_prime_Upsilon_term)
 # )
 # TERMS.append(lambda_hat_prime_prime_Theta1_term)
 
-lambda_hat_prime_prime_Theta1_term = (
-    Coupling(
-        "lambdaHatPrimePrimeTheta1",
-        [],
-        is_complex=True,
-        latex="\\hat{\\lambda}^{\\prime\\prime}_{\\Theta_1}",
-    )
-    * t2244("i0", "i1", "-Q0", "-Q1")
-    * Theta1("Q0")
-    * Theta1("Q1")
-    * H("i0").C
-    * H("i1").C
-)
-TERMS.append(lambda_hat_prime_prime_Theta1_term)
+@REGISTRY.register("GranadaTheta1")
+def lambda_hat_prime_prime_Theta1_term():
+    return (
+        Coupling(
+            "lambdaHatPrimePrimeTheta1",
+            [],
+            is_complex=True,
+            latex="\\hat{\\lambda}^{\\prime\\prime}_{\\Theta_1}",
+        )
+        * t2244("i0", "i1", "-Q0", "-Q1")
+        * Theta1("Q0")
+        * Theta1("Q1")
+        * H("i0").C
+        * H("i1").C
+    )
 
 # lambda_hat_prime_prime_Phi
-lambda_hat_prime_prime_Phi_term = (
-    Coupling(
-        "lambdaHatPrimePrimePhi",
-        [],
-        is_complex=True,
-        latex="\\hat{\\lambda}^{\\prime\\prime}_{\\Phi}",
-    )
-    * H("i0").C
-    * Phi("-C0", "i0")
-    * H("i1").C
-    * Phi("-C1", "i1")
-    * lambda_("C0", "c0", "-c1")
-    * lambda_("C1", "c1", "-c0")
-)
-TERMS.append(lambda_hat_prime_prime_Phi_term)
+@REGISTRY.register("GranadaPhi")
+def lambda_hat_prime_prime_Phi_term():
+    return (
+        Coupling(
+            "lambdaHatPrimePrimePhi",
+            [],
+            is_complex=True,
+            latex="\\hat{\\lambda}^{\\prime\\prime}_{\\Phi}",
+        )
+        * H("i0").C
+        * Phi("-C0", "i0")
+        * H("i1").C
+        * Phi("-C1", "i1")
+        * lambda_("C0", "c0", "-c1")
+        * lambda_("C1", "c1", "-c0")
+    )
@@ -0,0 +1,596 @@
+#!/usr/bin/env python3
+
+"""Numerical representations of the gauge structures (epsilon tensors, generators
+and Clebsch-Gordan coefficients) that appear in the terms of the Lagrangian,
+and functions that use them to work out properties of the terms.
+
+The structures are constructed exactly with sympy, from which both the
+numerical arrays and the `.gauge` file of a model are produced. Since this is
+slow, the results are cached on disk.
+
+Arrays are indexed in the order the indices appear in the FeynRules output,
+i.e. the order of `Tensor.index_labels`. The conventions are those of the
+structures in `mm/granada.gauge` and the SM model file.
+
+"""
+
+# Depends on: cache.py, tensor.py, utils.py
+
+import hashlib
+import json
+import os
+import string
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import permutations
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from feynwrite.cache import DEFAULT_CACHE_DIR
+from feynwrite.tensor import Coupling, Fermion, Tensor, TensorProduct
+from feynwrite.utils import Index, IndexKind, sort_indices
+
+# Dimension of the representation carried by each kind of gauge index
+DIMENSIONS = {
+    IndexKind.ISOSPIN_FUNDAMENTAL: 2,
+    IndexKind.ISOSPIN_ADJOINT: 3,
+    IndexKind.ISOSPIN_4: 4,
+    IndexKind.COLOUR_FUNDAMENTAL: 3,
+    IndexKind.COLOUR_ADJOINT: 8,
+    IndexKind.COLOUR_6: 6,
+}
+
+# Kinds of gauge index transforming under each group
+GROUPS = {
+    "SU2": [IndexKind.ISOSPIN_FUNDAMENTAL, IndexKind.ISOSPIN_ADJOINT, IndexKind.ISOSPIN_4],
+    "SU3": [IndexKind.COLOUR_FUNDAMENTAL, IndexKind.COLOUR_ADJOINT, IndexKind.COLOUR_6],
+}
+
+# Structures of the `.gauge` file by their label in the FeynRules output
+GAUGE_NAMES = {
+    "EpsSU3": "EpsSU3",
+    "fsu2": "fsu2",
+    "Eps4": "Eps4",
+    "2*Ta": "Ta",
+    "2*T": "T",
+    "C2224": "C2224",
+    "C344": "C344",
+    "T2244": "T2244",
+    "K6": "K6",
+}
+# Structures of the `.gauge` file without a conjugate
+UNBARRED = {"fsu2", "OmegaS3", "fsu3", "antiT"}
+# Structures of the SM needed by every model
+SM_STRUCTURES = ["fsu2", "Ta", "Tabar", "fsu3", "T", "Tbar", "antiT"]
+# Generators of the representations of the exotics not in the SM
+GENERATORS = {IndexKind.ISOSPIN_4: "Ta4", IndexKind.COLOUR_6: "T6"}
+
+
+def _zeros(shape: Tuple[int, ...]) -> np.ndarray:
+    """An array of exact zeros, to be filled with sympy numbers."""
+    from sympy import Integer
+
+    return np.full(shape, Integer(0), dtype=object)
+
+
+def _simplify(array: np.ndarray) -> np.ndarray:
+    """Bring each entry of an exact array into a canonical form."""
+    from sympy import expand, radsimp
+
+    return np.vectorize(lambda x: radsimp(expand(x)), otypes=[object])(array)
+
+
+def levi_civita(n: int) -> np.ndarray:
+    """The totally antisymmetric tensor with `n` indices, with eps[0, 1, ...] = 1."""
+    from sympy import Integer
+
+    eps = _zeros((n,) * n)
+    for perm in permutations(range(n)):
+        # Sign of the permutation from the parity of its inversions
+        inversions = sum(a > b for i, a in enumerate(perm) for b in perm[i + 1 :])
+        eps[perm] = Integer((-1) ** inversions)
+    return eps
+
+
+def spin_generators(j) -> np.ndarray:
+    """The generators (J1, J2, J3) of the spin-`j` representation of SU(2) in the
+    basis m = j, j - 1, ..., -j.
+
+    """
+    from sympy import I, Rational, sqrt
+
+    j = Rational(j)
+    m = [j - k for k in range(int(2 * j) + 1)]
+    # <m + 1| J+ |m>
+    raising = _zeros((len(m), len(m)))
+    for k in range(1, len(m)):
+        raising[k - 1, k] = sqrt(j * (j + 1) - m[k] * (m[k] + 1))
+    return _simplify(
+        np.array(
+            [(raising + raising.T) / 2, -I * (raising - raising.T) / 2, np.diag(m)]
+        )
+    )
+
+
+def gell_mann_generators() -> np.ndarray:
+    """The generators T^A = lambda^A / 2 of the fundamental of SU(3)."""
+    from sympy import I, sqrt
+
+    lam = _zeros((8, 3, 3))
+    lam[0, 0, 1] = lam[0, 1, 0] = 1
+    lam[1, 0, 1], lam[1, 1, 0] = -I, I
+    lam[2, 0, 0], lam[2, 1, 1] = 1, -1
+    lam[3, 0, 2] = lam[3, 2, 0] = 1
+    lam[4, 0, 2], lam[4, 2, 0] = -I, I
+    lam[5, 1, 2] = lam[5, 2, 1] = 1
+    lam[6, 1, 2], lam[6, 2, 1] = -I, I
+    lam[7, 0, 0] = lam[7, 1, 1] = 1 / sqrt(3)
+    lam[7, 2, 2] = -2 / sqrt(3)
+    return _simplify(lam / 2)
+
+
+def su3_structure_constants() -> np.ndarray:
+    """f^{ABC} defined by [T^A, T^B] = i f^{ABC} T^C, i.e. -2i Tr([T^A, T^B] T^C)."""
+    from sympy import I
+
+    t = gell_mann_generators()
+    commutators = np.einsum("Aij,Bjk->ABik", t, t) - np.einsum("Bij,Ajk->ABik", t, t)
+    return _simplify(-2 * I * np.einsum("ABij,Cji->ABC", commutators, t))
+
+
+def sextet_clebsch() -> np.ndarray:
+    """K6[X, a, b] coupling two colour triplets into the symmetric sextet, with the
+    sextet basis ordered as 11, 12, 22, 23, 33, 13.
+
+    """
+    from sympy import sqrt
+
+    k6 = _zeros((6, 3, 3))
+    for x, (a, b) in enumerate([(0, 0), (0, 1), (1, 1), (1, 2), (2, 2), (0, 2)]):
+        if a == b:
+            k6[x, a, a] = 1
+        else:
+            k6[x, a, b] = k6[x, b, a] = 1 / sqrt(2)
+    return _simplify(k6)
+
+
+def sextet_generators() -> np.ndarray:
+    """T6[A, X, Y], the generators of the sextet of SU(3), from the generators of
+    the two triplets making it up.
+
+    """
+    k6, t = sextet_clebsch(), gell_mann_generators()
+    return _simplify(
+        np.einsum("Xab,Aac,Ycb->AXY", k6, t, k6) + np.einsum("Xab,Abd,Yad->AXY", k6, t, k6)
+    )
+
+
+def triplet_omega() -> np.ndarray:
+    """OmegaS3[I, J], the symmetric invariant of two SU(2) triplets in the spin
+    basis.
+
+    """
+    omega = _zeros((3, 3))
+    for m in range(3):
+        omega[m, 2 - m] = (-1) ** m
+    return omega
+
+
+def quadruplet_epsilon() -> np.ndarray:
+    """Eps4[Q, R], the antisymmetric invariant of two SU(2) quadruplets."""
+    from sympy import Rational
+
+    eps4 = _zeros((4, 4))
+    for q in range(4):
+        eps4[q, 3 - q] = Rational((-1) ** q, 2)
+    return eps4
+
+
+def quadruplet_clebsch() -> np.ndarray:
+    """C2224[i, j, k, Q] coupling three doublets into a quadruplet. The quadruplet
+    is the totally symmetric combination of the doublet with the two doublets
+    with lowered indices.
+
+    """
+    from sympy import sqrt
+
+    # Symmetric combination of three doublets into spin 3/2, by the number of
+    # lowered spins: |3/2, m> = sum of states with n spins down / sqrt(3 choose n)
+    symmetric = _zeros((4, 2, 2, 2))
+    for spins in np.ndindex(2, 2, 2):
+        n_down = sum(spins)
+        symmetric[(n_down, *spins)] = 1 / sqrt([1, 3, 3, 1][n_down])
+
+    eps = levi_civita(2)
+    return _simplify(np.einsum("Qiab,ja,kb->ijkQ", symmetric, eps, eps) / sqrt(2))
+
+
+def doublet_quadruplet_clebsch() -> np.ndarray:
+    """T2244[i, j, Q, R] coupling two doublets and two quadruplets through the
+    triplet.
+
+    """
+    from sympy import Rational, sqrt
+
+    doublets = np.einsum("Iik,kj->Iij", spin_generators(Rational(1, 2)), levi_civita(2))
+    quadruplets = np.einsum(
+        "QP,IPR->IQR", quadruplet_epsilon(), spin_generators(Rational(3, 2))
+    )
+    return _simplify(8 / sqrt(15) * np.einsum("Iij,IQR->ijQR", doublets, quadruplets))
+
+
+def exact_structures() -> Dict[str, np.ndarray]:
+    """The exact arrays of the structures in the `.gauge` file by name, in the
+    order of `mm/granada.gauge`. The array of `<name>bar` is the complex
+    conjugate of that of `<name>`.
+
+    """
+    from sympy import Rational
+
+    ta = spin_generators(Rational(1, 2))
+    ta4 = spin_generators(Rational(3, 2))
+    t = gell_mann_generators()
+    structures = {
+        "fsu2": levi_civita(3),
+        "Ta": ta,
+        "Ta4": ta4,
+        "C2224": quadruplet_clebsch(),
+        "C223": ta.transpose(1, 2, 0),
+        "C344": ta4,
+        "OmegaS3": triplet_omega(),
+        "EpsSU3": levi_civita(3),
+        "Eps4": quadruplet_epsilon(),
+        "fsu3": su3_structure_constants(),
+        "T": t,
+        "antiT": -t.conjugate(),
+        "K6": sextet_clebsch(),
+        "T6": sextet_generators(),
+        "T2244": doublet_quadruplet_clebsch(),
+    }
+
+    with_bars = {}
+    for name, array in structures.items():
+        with_bars[name] = array
+        if name not in UNBARRED:
+            with_bars[name + "bar"] = _simplify(array.conjugate())
+    return with_bars
+
+
+@dataclass
+class GaugeStructure:
+    """A structure of the `.gauge` file as its nonzero entries: the position
+    (counting from zero), the exact value in Mathematica syntax and the numerical
+    value of each.
+
+    """
+
+    shape: Tuple[int, ...]
+    entries: List[Tuple[Tuple[int, ...], str, complex]]
+
+    @classmethod
+    def from_exact(cls, array: np.ndarray) -> "GaugeStructure":
+        from sympy.printing.mathematica import mathematica_code
+
+        entries = [
+            (position, mathematica_code(value), complex(value))
+            for position, value in np.ndenumerate(array)
+            if value != 0
+        ]
+        return cls(array.shape, entries)
+
+    def array(self) -> np.ndarray:
+        """The numerical array, real if none of the entries are complex."""
+        is_real = all(value.imag == 0 for _, _, value in self.entries)
+        array = np.zeros(self.shape, dtype=float if is_real else complex)
+        for position, _, value in self.entries:
+            array[position] = value.real if is_real else value
+        return array
+
+    def sparse_array(self) -> str:
+        """The exact array as a Mathematica `SparseArray` in the compressed row
+        format used by `mm/granada.gauge`.
+
+        """
+        # Entries are in lexicographic order of their positions, so grouped by row
+        row_pointers = [0] * (self.shape[0] + 1)
+        for position, _, _ in self.entries:
+            row_pointers[position[0] + 1] += 1
+        for row in range(self.shape[0]):
+            row_pointers[row + 1] += row_pointers[row]
+
+        columns = ", ".join(
+            "{" + ", ".join(str(i + 1) for i in position[1:]) + "}"
+            for position, _, _ in self.entries
+        )
+        values = ", ".join(value for _, value, _ in self.entries)
+        shape = ", ".join(str(n) for n in self.shape)
+        pointers = ", ".join(str(n) for n in row_pointers)
+        return (
+            f"SparseArray[Automatic, {{{shape}}}, 0, "
+            f"{{1, {{{{{pointers}}}, {{{columns}}}}}, {{{values}}}}}]"
+        )
+
+    def to_json(self) -> Dict:
+        return {
+            "shape": list(self.shape),
+            "entries": [
+                [list(position), exact, value.real, value.imag]
+                for position, exact, value in self.entries
+            ],
+        }
+
+    @classmethod
+    def from_json(cls, data: Dict) -> "GaugeStructure":
+        entries = [
+            (tuple(position), exact, complex(real, imag))
+            for position, exact, real, imag in data["entries"]
+        ]
+        return cls(tuple(data["shape"]), entries)
+
+
+def _cache_path(cache_dir: str) -> str:
+    """The cache file of the gauge structures, named after a hash of this module
+    so that changes to the constructions above invalidate it.
+
+    """
+    with open(__file__, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()[:16]
+    return os.path.join(cache_dir, f"gauge-{digest}.json")
+
+
+@lru_cache(maxsize=None)
+def gauge_structures(cache_dir: Optional[str] = DEFAULT_CACHE_DIR) -> Dict[str, GaugeStructure]:
+    """The structures of the `.gauge` file by name. Working them out exactly with
+    sympy is slow, so they are stored in `cache_dir` the first time (unless it is
+    None) and read from there afterwards.
+
+    """
+    path = None if cache_dir is None else _cache_path(cache_dir)
+    if path is not None and os.path.exists(path):
+        with open(path) as f:
+            return {name: GaugeStructure.from_json(data) for name, data in json.load(f).items()}
+
+    structures = {
+        name: GaugeStructure.from_exact(array) for name, array in exact_structures().items()
+    }
+    if path is not None:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            # Written to a temporary file first so that a concurrent reader never
+            # sees a partial file
+            with open(path + f".{os.getpid()}", "w") as f:
+                json.dump({name: s.to_json() for name, s in structures.items()}, f)
+            os.replace(path + f".{os.getpid()}", path)
+        except OSError:
+            pass
+    return structures
+
+
+def gauge_structure_names(terms: Sequence[TensorProduct]) -> List[str]:
+    """Return the names of the structures of the `.gauge` file needed by `terms`:
+    those of the SM, those the terms use with their conjugates, and the
+    generators of the representations of the exotics.
+
+    """
+    structures = gauge_structures()
+    needed = set(SM_STRUCTURES)
+    for term in terms:
+        for structure in term.structures:
+            name = GAUGE_NAMES.get(structure.label, structure.label)
+            needed |= {name, name + "bar"} & structures.keys()
+        for field in term.exotics:
+            for index in field._indices:
+                if index.kind in GENERATORS:
+                    needed |= {GENERATORS[index.kind], GENERATORS[index.kind] + "bar"}
+
+    return [name for name in structures if name in needed]
+
+
+@lru_cache(maxsize=None)
+def structure_arrays() -> Dict[str, np.ndarray]:
+    """The arrays representing the structures by their label in the FeynRules
+    output. `Eps` and `Delta` depend on the kind of index, see `structure_array`.
+
+    """
+    structures = gauge_structures()
+    arrays = {label: structures[name].array() for label, name in GAUGE_NAMES.items()}
+    arrays["2*Ta"] *= 2
+    arrays["2*T"] *= 2
+    return arrays
+
+
+@lru_cache(maxsize=None)
+def _epsilon(n: int) -> np.ndarray:
+    return levi_civita(n).astype(float)
+
+
+def structure_array(tensor: Tensor) -> np.ndarray:
+    """Return the array representing the structure `tensor`, indexed in the order
+    of its `index_labels`.
+
+    """
+    if tensor.label == "Eps":
+        return _epsilon(len(tensor._indices))
+    if tensor.label == "Delta":
+        return np.eye(DIMENSIONS[tensor._indices[0].kind])
+    return structure_arrays()[tensor.label]
+
+
+def gauge_indices(tensor: Tensor, kinds=DIMENSIONS) -> List[Index]:
+    """Return the gauge indices of `tensor` of the `kinds` (by default all) in the
+    order of its `index_labels`.
+
+    """
+    return [i for i in sort_indices(tensor._indices) if i.kind in kinds]
+
+
+def gauge_tensor(
+    term: TensorProduct, kinds=DIMENSIONS
+) -> Tuple[np.ndarray, List[Tuple[int, int]]]:
+    """Return the product of the structures of `term` with the indices shared by
+    structures summed over. The remaining axes are the gauge indices of the
+    fields: each axis is labelled by the position of the field in `term.fields`
+    and the position of the index in `gauge_indices(field, kinds)`. Fields
+    contracted directly with each other are joined by a Kronecker delta.
+
+    Only the indices of the `kinds` are included, so that for instance the
+    SU(2) structure can be worked out on its own, since no structure has indices
+    of both groups.
+
+    """
+    letters = iter(string.ascii_letters)
+
+    # The letters of the indices of the structures
+    operands, subscripts = [], []
+    structure_letters: Dict[str, str] = {}
+    for structure in term.structures:
+        indices = gauge_indices(structure, kinds)
+        if not indices:
+            continue
+        assert len(indices) == len(gauge_indices(structure))
+        operands.append(structure_array(structure))
+        subscript = ""
+        for index in indices:
+            if index.label not in structure_letters:
+                structure_letters[index.label] = next(letters)
+            subscript += structure_letters[index.label]
+        subscripts.append(subscript)
+
+    # Each gauge index of a field is a slot of the result
+    slots, output = [], ""
+    unpaired: Dict[str, str] = {}
+    for n, field in enumerate(term.fields):
+        for k, index in enumerate(gauge_indices(field, kinds)):
+            slots.append((n, k))
+            if index.label in structure_letters:
+                output += structure_letters[index.label]
+                continue
+
+            # Contracted with another field, or free
+            output += next(letters)
+            if index.label in unpaired:
+                operands.append(np.eye(DIMENSIONS[index.kind]))
+                subscripts.append(unpaired.pop(index.label) + output[-1])
+            else:
+                unpaired[index.label] = output[-1]
+
+    # Free indices of the fields are kept as axes of the result
+    for label, letter in unpaired.items():
+        kind = Index.get(label).kind
+        operands.append(np.ones(DIMENSIONS[kind]))
+        subscripts.append(letter)
+
+    if not operands:
+        return np.array(1.0), slots
+
+    tensor = np.einsum(",".join(subscripts) + "->" + output, *operands, optimize=True)
+    return tensor, slots
+
+
+def coupling_symmetry(term: TensorProduct) -> Optional[int]:
+    """Return 1 or -1 if the coupling of `term` is symmetric or antisymmetric under
+    the exchange of its two generation indices, and None if it has neither
+    symmetry.
+
+    The coupling has a symmetry when its generation indices belong to two copies
+    of the same fermion in a bilinear ψ̄ ψ^c (or \\bar{ψ^c} ψ). The Lorentz part
+    of the bilinear is symmetric under the exchange of the fermions, so the
+    coupling inherits the symmetry of the gauge structure under the exchange of
+    the gauge indices of the two fermions.
+
+    """
+    (coupling,) = term.couplings
+    generations = [i.label for i in coupling._indices]
+    if len(generations) != 2:
+        return None
+
+    # The positions of the fermions carrying the generation indices of the coupling
+    positions = [
+        n
+        for label in generations
+        for n, field in enumerate(term.fields)
+        if isinstance(field, Fermion) and label in field.get_index_labels()
+    ]
+    if len(positions) != 2:
+        return None
+    first, second = (term.fields[n] for n in positions)
+    if first.label != second.label or first.is_charge_conj == second.is_charge_conj:
+        return None
+
+    # Exchange the gauge indices of the two fermions
+    tensor, slots = gauge_tensor(term)
+    exchange = {positions[0]: positions[1], positions[1]: positions[0]}
+    swapped = np.transpose(tensor, [slots.index((exchange.get(n, n), k)) for n, k in slots])
+
+    if np.allclose(swapped, tensor):
+        return 1
+    if np.allclose(swapped, -tensor):
+        return -1
+    return None
+
+
+def symmetry_rules(coupling: Coupling, sign: int) -> List[str]:
+    """Return the replacement rules of the `.symm` file for `coupling` and its
+    conjugate.
+
+    """
+    minus = "-" if sign < 0 else ""
+    return [
+        f"{label}[g0_,g1_] -> {minus}{label}[g1,g0]"
+        for label in [coupling.label, coupling.label + "bar"]
+    ]
+
+
+@lru_cache(maxsize=None)
+def generators() -> Dict[IndexKind, np.ndarray]:
+    """The generators of the representation carried by a raised index of each
+    kind. A lowered index carries the conjugate representation, with generators
+    -t*.
+
+    """
+    structures = gauge_structures()
+    return {
+        IndexKind.ISOSPIN_FUNDAMENTAL: structures["Ta"].array(),
+        # (t^I)_{JK} = -i eps_{IJK}
+        IndexKind.ISOSPIN_ADJOINT: -1j * structures["fsu2"].array(),
+        IndexKind.ISOSPIN_4: structures["Ta4"].array(),
+        IndexKind.COLOUR_FUNDAMENTAL: structures["T"].array(),
+        IndexKind.COLOUR_ADJOINT: -1j * structures["fsu3"].array(),
+        IndexKind.COLOUR_6: structures["T6"].array(),
+    }
+
+
+def gauge_variation(term: TensorProduct, rng: np.random.Generator) -> np.ndarray:
+    """Return the change in the gauge structure of `term` under a random
+    infinitesimal SU(2) x SU(3) transformation of its fields, to first order in
+    the parameters of the transformation.
+
+    """
+    tensor, slots = gauge_tensor(term)
+    # A random element of each Lie algebra, in each representation
+    matrices = {}
+    for kinds in GROUPS.values():
+        theta = rng.standard_normal(len(generators()[kinds[0]]))
+        for kind in kinds:
+            matrices[kind] = np.einsum("a,aij->ij", theta, generators()[kind])
+
+    variation = np.zeros(tensor.shape, dtype=complex)
+    for axis, (n, k) in enumerate(slots):
+        index = gauge_indices(term.fields[n])[k]
+        matrix = matrices[index.kind]
+        if index.is_lowered:
+            matrix = -matrix.conj()
+        # The field transforms as phi -> (1 + i theta.t) phi
+        variation += np.moveaxis(np.tensordot(tensor, matrix, axes=([axis], [0])), -1, axis)
+    return variation
+
+
+def is_gauge_invariant(term: TensorProduct, seed: int = 0) -> bool:
+    """Return True if the gauge structure of `term` is invariant under a random
+    infinitesimal SU(2) x SU(3) transformation. A term that isn't invariant
+    almost surely changes under any random transformation.
+
+    """
+    variation = gauge_variation(term, np.random.default_rng(seed))
+    return np.allclose(variation, 0, atol=1e-9)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+
+"""Checks that the hermitian conjugate of each term of the Lagrangian is counted
+exactly once. `Model.export_feynrules` adds the conjugate of every term with a
+complex coupling, so a term with a real coupling must be its own conjugate,
+and a term with a complex coupling must neither be its own conjugate nor have
+its conjugate in the Lagrangian already.
+
+Whether a complex term is its own conjugate, or the conjugate of another term,
+is decided from the canonical forms of the products (see `TensorProduct.key`),
+so that terms with the same fields but different contractions are told apart.
+Whether a real term is self-conjugate is only decided from its fields:
+`Tensor.C` leaves the positions of adjoint and sextet indices alone and doesn't
+swap the indices of the hermitian generators, so the canonical forms of a
+self-conjugate term and its conjugate can differ.
+
+"""
+
+# Depends on: tensor.py
+
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from feynwrite.tensor import Coupling, Fermion, Field, TensorProduct
+
+# Kinds of problem
+MISSING = "missing"
+DOUBLE_COUNTED = "double counted"
+
+# Label standing in for the coupling in the canonical keys, so that a term and
+# its conjugate written out with another coupling compare equal
+COUPLING = "coupling"
+
+
+def field_key(field: Field) -> Tuple:
+    """Return the field as its label and whether it appears conjugated. Fermions
+    are described by their Weyl components, so ψ^c and \\bar{ψ} are both
+    conjugates of ψ.
+
+    """
+    if not isinstance(field, Fermion):
+        return (field.label, field.is_conj and not field.is_self_conj)
+
+    chirality = field.flipped_chirality if field.is_charge_conj else field.chirality
+    is_conj = field.is_dirac_adjoint != field.is_charge_conj
+    return (field.label, chirality, is_conj and not field.is_self_conj)
+
+
+def fields_key(term: TensorProduct) -> Tuple:
+    """Return a hashable key that is the same for products of the same fields,
+    whatever their order and indices.
+
+    """
+    return tuple(sorted(Counter(field_key(f) for f in term.fields).items()))
+
+
+def canonical_key(term: TensorProduct) -> Tuple:
+    """Return a hashable key that is the same for products that only differ in
+    the order of the factors, the names of the dummy indices and the label of the
+    coupling. See `TensorProduct.key`. Structures are written out the same way
+    whether they are conjugated or not, so that is left out too.
+
+    """
+    (coupling,) = term.couplings
+    tensors = [Coupling(COUPLING, [i.string for i in coupling._indices])]
+    for tensor in term.tensors:
+        if not isinstance(tensor, Coupling):
+            tensors.append(tensor if tensor.is_field else tensor._replace(is_conj=False))
+    return TensorProduct(*tensors).key
+
+
+@dataclass
+class HermiticityProblem:
+    """A `term` whose conjugate is `MISSING` from the Lagrangian or
+    `DOUBLE_COUNTED`. `other` is the term already in the Lagrangian that is the
+    conjugate of `term`, if any.
+
+    """
+
+    term: TensorProduct
+    kind: str
+    other: Optional[TensorProduct] = None
+
+    def __str__(self) -> str:
+        coupling = self.term.couplings[0].label
+        if self.kind == MISSING:
+            return f"{coupling}: real coupling, but the term isn't self-conjugate"
+        if self.other is None:
+            return f"{coupling}: complex coupling, but the term is self-conjugate"
+        other = self.other.couplings[0].label
+        return f"{coupling}: complex coupling, but the conjugate is already there as {other}"
+
+
+def check_hermiticity(terms: Sequence[TensorProduct]) -> List[HermiticityProblem]:
+    """Return the problems with the conjugates of `terms`, in the order of the terms."""
+    keys = [canonical_key(term) for term in terms]
+    conj_keys = [canonical_key(term.C) for term in terms]
+    # Terms by their key and by the key of their conjugate, since either side of a
+    # pair may have been written out in the form `Tensor.C` gives
+    by_key: Dict[Tuple, int] = {}
+    for n, key in enumerate(keys):
+        by_key.setdefault(key, n)
+    by_conj_key: Dict[Tuple, int] = {}
+    for n, key in enumerate(conj_keys):
+        by_conj_key.setdefault(key, n)
+
+    problems = []
+    for n, term in enumerate(terms):
+        if not term.is_complex:
+            if fields_key(term.C) != fields_key(term):
+                problems.append(HermiticityProblem(term, MISSING))
+            continue
+
+        if conj_keys[n] == keys[n]:
+            problems.append(HermiticityProblem(term, DOUBLE_COUNTED))
+            continue
+        others = [by_key.get(conj_keys[n]), by_conj_key.get(keys[n])]
+        others = [m for m in others if m is not None and m != n]
+        if others:
+            problems.append(HermiticityProblem(term, DOUBLE_COUNTED, terms[others[0]]))
+
+    return problems
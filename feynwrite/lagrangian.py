@@ -1,17 +1,50 @@
 #!/usr/bin/env python3
 
 import itertools
+import math
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from fractions import Fraction
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+import numpy as np
 from alive_progress import alive_bar
 from pprint import pprint
 from sympy import Rational
 from neutrinomass.completions.core import VectorLikeDiracFermion, ComplexScalar, RealScalar, MajoranaFermion
-from neutrinomass.tensormethod.core import decompose_product
+from neutrinomass.tensormethod.core import Field, decompose_product
 from neutrinomass.tensormethod.contract import construct_operators
 from neutrinomass.tensormethod.sm import H, L, Q, ub, db, eb
 from neutrinomass.tensormethod.lagrangian import contains, npoint_terms, remove_equivalent, prod_mass_dim
+from feynwrite.decompositions import (
+    DEFAULT_CACHE,
+    FIRST_SINGLET,
+    IRREPS,
+    SINGLETS,
+    DecompositionCache,
+    product_key,
+)
 
 SM_MATTER = [H("i0"), Q("u0 c0 i0"), ub("u0 -c0"), db("u0 -c0"), L("u0 i0"), eb("u0")]
 SM_MATTER_LABELS = [f.label for f in SM_MATTER]
+# Without indices, as needed by `decompose_product`
+SM_FIELDS = (H, Q, ub, db, L, eb)
+
+# Candidates sent to a worker process at a time
+CHUNK_SIZE = 32
+# Combinations screened at once by `neutral_combinations`
+BLOCK_SIZE = 8192
+
+# The conditions on the quantum numbers of a product for it to contain a
+# singlet, in the order they are applied. For SU(2), the Dynkin labels must sum
+# to an even number, and the largest can't exceed the sum of the others. This is
+# also sufficient.
+SCREENS = ("hypercharge", "triality", "isospin", "lorentz")
+
+# First singlet of each product decomposed in this process, keyed by
+# `product_key`. Shared between calls, so that products common to different
+# sets of exotics are only decomposed once.
+SINGLET_MEMO: Dict[Tuple[str, ...], Optional[Field]] = {}
 
 def contains_exotic(fields):
     """Returns True if any of the fields are exotic. That is, if any are a
@@ -23,69 +56,265 @@ def contains_exotic(fields):
             return True
     return False
 
-def npoint_fieldstrings(n, fields=(L, eb, Q, db, ub, H), derivs=False, func=None):
-    """Returns all possible n-point fieldstrings with the given fields."""
+def hypercharge_scale(fields) -> int:
+    """The smallest integer that makes every hypercharge of the fields an integer."""
+    return math.lcm(*(Fraction(str(f.charges["y"])).denominator for f in fields))
+
+def quantum_numbers(fields, scale: int) -> np.ndarray:
+    """Returns an array with a row for each field: its hypercharge times `scale`,
+    its SU(3) triality, and the Dynkin labels of its isospin and its two Lorentz
+    SU(2)s.
+
+    """
+    rows = []
+    for f in fields:
+        p, q = f.colour_irrep
+        rows.append(
+            [
+                int(Fraction(str(f.charges["y"])) * scale),
+                (p + 2 * q) % 3,
+                *f.isospin_irrep,
+                *f.lorentz_irrep,
+            ]
+        )
+    return np.array(rows, dtype=np.int64)
+
+def _su2_singlet(labels: np.ndarray) -> np.ndarray:
+    """Whether the product of the SU(2) irreps with Dynkin labels in each row of
+    `labels` contains a singlet."""
+    total = labels.sum(axis=1)
+    return (total % 2 == 0) & (2 * labels.max(axis=1) <= total)
+
+def _screen(numbers: np.ndarray, counts: Optional[Dict[str, int]]) -> np.ndarray:
+    """Whether each product could contain a singlet, where `numbers` has the
+    quantum numbers of its fields in its last two axes."""
+    totals = numbers.sum(axis=1)
+    passed = {
+        "hypercharge": totals[:, 0] == 0,
+        "triality": totals[:, 1] % 3 == 0,
+        "isospin": _su2_singlet(numbers[:, :, 2]),
+        "lorentz": _su2_singlet(numbers[:, :, 3]) & _su2_singlet(numbers[:, :, 4]),
+    }
+    keep = np.ones(len(numbers), dtype=bool)
+    for name in SCREENS:
+        if counts is not None:
+            counts[name] = counts.get(name, 0) + int(np.count_nonzero(keep & ~passed[name]))
+        keep &= passed[name]
+    return keep
+
+def neutral_combinations(
+    fields, n, skipped: Optional[Callable] = None, counts: Optional[Dict[str, int]] = None
+) -> Iterator[Tuple]:
+    """Yields the combinations with replacement of `n` of the `fields` whose
+    quantum numbers allow a singlet (see `SCREENS`), in the order of
+    `itertools.combinations_with_replacement`. These checks are much cheaper than
+    `decompose_product`, and are done on blocks of combinations at once.
+    `skipped` is called with the number of combinations left out of each block,
+    and the number removed by each check is added to `counts`.
+
+    """
+    numbers = quantum_numbers(fields, hypercharge_scale(fields))
+    combos = itertools.combinations_with_replacement(range(len(fields)), n)
+    while True:
+        block = np.fromiter(
+            itertools.chain.from_iterable(itertools.islice(combos, BLOCK_SIZE)), dtype=np.intp
+        ).reshape(-1, n)
+        if not len(block):
+            break
+        keep = _screen(numbers[block], counts)
+        if skipped is not None:
+            skipped(len(block) - int(np.count_nonzero(keep)))
+        for combo in block[keep].tolist():
+            yield tuple(fields[i] for i in combo)
+
+def screen_pairs(
+    fields, hypercharge, isospins: Set[int], counts: Optional[Dict[str, int]] = None
+) -> List[Tuple]:
+    """Returns the pairs of `fields`, completions such as those in
+    `GRANADA_FIELDS`, (with replacement) whose hypercharges sum to
+    plus or minus `hypercharge` and whose product has a colour singlet with one
+    of the `isospins`, given as Dynkin labels. The number of pairs removed by
+    each check is added to `counts`.
+
+    """
+    fields = list(fields)
+    irreps = [f.field for f in fields]
+    scale = math.lcm(hypercharge_scale(irreps), Fraction(str(hypercharge)).denominator)
+    numbers = quantum_numbers(irreps, scale)
+    # Only two irreps, conjugate to each other, contain a colour singlet
+    colours = np.array([f.colour_irrep for f in irreps], dtype=np.int64)
+    first, second = np.triu_indices(len(fields))
+
+    y = numbers[first, 0] + numbers[second, 0]
+    d1, d2 = numbers[first, 2], numbers[second, 2]
+    isospin = np.zeros(len(first), dtype=bool)
+    for d in isospins:
+        isospin |= (abs(d1 - d2) <= d) & (d <= d1 + d2) & ((d1 + d2 - d) % 2 == 0)
+    passed = {
+        "hypercharge": abs(y) == int(Fraction(str(hypercharge)) * scale),
+        "colour": (colours[first] == colours[second][:, ::-1]).all(axis=1),
+        "isospin": isospin,
+    }
+
+    keep = np.ones(len(first), dtype=bool)
+    for name, condition in passed.items():
+        if counts is not None:
+            counts[name] = counts.get(name, 0) + int(np.count_nonzero(keep & ~condition))
+        keep &= condition
+    return [(fields[i], fields[j]) for i, j in zip(first[keep], second[keep])]
+
+def first_singlet(combo):
+    """Returns the first singlet in the product of the fields, or None."""
+    return next((i for i in decompose_product(*combo) if i.is_singlet), None)
+
+def irreps(f1, f2, cache: Optional[DecompositionCache] = DEFAULT_CACHE) -> List[Field]:
+    """Returns the irreps in the product of the two fields, `f1 * f2`."""
+    if cache is None:
+        return list(f1 * f2)
+    return cache.get_or_compute(IRREPS, (f1, f2), lambda: list(f1 * f2))
+
+def singlets(*fields, cache: Optional[DecompositionCache] = DEFAULT_CACHE) -> List[Field]:
+    """Returns the singlets in the product of the fields."""
+    compute = lambda: [i for i in decompose_product(*fields) if i.is_singlet]
+    if cache is None:
+        return compute()
+    return cache.get_or_compute(SINGLETS, fields, compute)
+
+def _first_singlets(combos: List[Tuple]) -> List:
+    """Run in a worker process."""
+    return [first_singlet(combo) for combo in combos]
+
+def screen_products(
+    candidates: Iterable[Tuple],
+    workers: Optional[int] = None,
+    progress: Optional[Callable[[int], None]] = None,
+    cache: Optional[DecompositionCache] = DEFAULT_CACHE,
+) -> Iterator:
+    """Yields the first singlet of each product in `candidates` that has one, in
+    the order of the candidates. Products in `SINGLET_MEMO` aren't decomposed
+    again, nor are those in the on-disk `cache` (pass None not to use one), so the
+    singlet of a product may have its fields in the order of an earlier
+    candidate. The others are decomposed in chunks of `CHUNK_SIZE` by a
+    pool of `workers` processes (by default, one per CPU), or in this process if
+    `workers` is 1. `progress` is called with the number of candidates in each
+    chunk as it is completed.
+
+    """
+    workers = workers or os.cpu_count()
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+
+    def submit(chunk):
+        # Each new product is only decomposed once, even if repeated in the chunk
+        todo = {}
+        for combo in chunk:
+            key = product_key(combo)
+            if key not in SINGLET_MEMO:
+                todo.setdefault(key, combo)
+        if cache is not None and todo:
+            for key, singlet in cache.get_many(FIRST_SINGLET, todo).items():
+                SINGLET_MEMO[key] = singlet
+                del todo[key]
+        combos = list(todo.values())
+        if executor is None or not combos:
+            return chunk, todo, _first_singlets(combos)
+        return chunk, todo, executor.submit(_first_singlets, combos)
+
+    def collect(chunk, todo, result):
+        if not isinstance(result, list):
+            result = result.result()
+        SINGLET_MEMO.update(zip(todo, result))
+        if cache is not None:
+            cache.put_many(FIRST_SINGLET, zip(todo, result))
+        if progress is not None:
+            progress(len(chunk))
+        for combo in chunk:
+            singlet = SINGLET_MEMO[product_key(combo)]
+            if singlet is not None:
+                yield singlet
+
+    # Chunks are submitted ahead of the one being collected, but only a few, so
+    # that candidates are still streamed
+    pending = deque()
+    try:
+        candidates = iter(candidates)
+        while True:
+            chunk = list(itertools.islice(candidates, CHUNK_SIZE))
+            if not chunk:
+                break
+            pending.append(submit(chunk))
+            if len(pending) > 2 * workers:
+                yield from collect(*pending.popleft())
+        while pending:
+            yield from collect(*pending.popleft())
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+def _filter_counted(func, candidates, skipped: Callable):
+    for combo in candidates:
+        if func(combo):
+            yield combo
+        else:
+            skipped()
+
+def npoint_fieldstrings(
+    n,
+    fields=(L, eb, Q, db, ub, H),
+    derivs=False,
+    func=None,
+    workers=None,
+    cache=DEFAULT_CACHE,
+    counts=None,
+):
+    """Yields all possible n-point fieldstrings with the given fields. The products
+    are decomposed by `workers` processes and cached in `cache`, see
+    `screen_products`. The number of combinations removed by each check before
+    decomposing them is added to `counts`, see `neutral_combinations`.
+
+    """
 
     conjs = tuple([f.conj for f in fields])
     if derivs:
         T = Field("D", "11000", charges={"y": 0})
         fields += (T,)
 
-    combos = list(itertools.combinations_with_replacement(fields + conjs, n))
-    terms = []
-    with alive_bar(len(combos)) as bar:
-        while combos:
-            combo = combos.pop(0)
+    fields = fields + conjs
+    with alive_bar(math.comb(len(fields) + n - 1, n)) as bar:
+        candidates = neutral_combinations(fields, n, skipped=bar, counts=counts)
+        if func is not None:
+            candidates = _filter_counted(func, candidates, skipped=bar)
 
-            if func is not None:
-                if not func(combo):
-                    bar()
-                    continue
+        yield from screen_products(candidates, workers=workers, progress=bar, cache=cache)
 
-            prods = decompose_product(*combo)
-            singlets = [i for i in prods if i.is_singlet]
-            if singlets:
-                terms += [singlets[0]]
-            bar()
-
-    return terms
-
-def four_point_scalar_terms(exotic_fields):
-    """Returns all possible 4-point terms with the given fields that satisfy the
+def four_point_scalar_terms(exotic_fields, cache=DEFAULT_CACHE):
+    """Yields all possible 4-point terms with the given fields that satisfy the
     conditions of Table 2 in https://arxiv.org/pdf/2103.11593.pdf.
 
     """
 
     conjs = [f.conj for f in exotic_fields]
 
-    combos = list(itertools.combinations_with_replacement(exotic_fields + conjs, 2))
     higgs_combos = [(H, H), (H.conj, H.conj), (H, H.conj)]
-    terms = []
-    while combos:
-        combo = combos.pop(0)
-        f1, f2 = combo
-
+    for f1, f2 in itertools.combinations_with_replacement(exotic_fields + conjs, 2):
         if abs(f1.charges["y"] + f2.charges["y"]) != 1:
             continue
 
-        for irrep in f1.field * f2.field:
+        for irrep in irreps(f1.field, f2.field, cache=cache):
             if irrep.colour_irrep == (0, 0) and irrep.isospin_irrep in {(0,), (2,)}:
                 for higgs_combo in higgs_combos:
-                    prods = decompose_product(f1.field, f2.field, *higgs_combo)
-                    singlets = [i for i in prods if i.is_singlet]
-                    if singlets:
-                        terms += singlets
-
-    return terms
+                    yield from singlets(f1.field, f2.field, *higgs_combo, cache=cache)
 
-def generate_uv_terms(fields: set):
-    all_fields = SM_MATTER + [f.field for f in fields]
-    cubic_terms = npoint_fieldstrings(n=3, fields=tuple(all_fields), func=contains_exotic)
-    quartic_terms = npoint_fieldstrings(n=4, fields=tuple(all_fields), func=contains_exotic)
+def generate_uv_terms(fields: set, workers=None, cache=DEFAULT_CACHE):
+    all_fields = SM_FIELDS + tuple(f.field for f in fields)
+    options = dict(fields=all_fields, func=contains_exotic, workers=workers, cache=cache)
+    terms = itertools.chain(
+        npoint_fieldstrings(n=3, **options),
+        npoint_fieldstrings(n=4, **options),
+    )
 
     # Only keep terms that contain exotic fields
     # return [i for i in out if i != 0 and contains(i, [f.field for f in fields])]
-    return [t for t in cubic_terms + quartic_terms if prod_mass_dim(t.walked()) <= 4]
+    return [t for t in terms if prod_mass_dim(t.walked()) <= 4]
 
     # ignore = ["c"]
     # cubic_terms = npoint_terms(3, all_fields, ignore=ignore)
@@ -135,8 +364,11 @@ GRANADA_FERMIONS = {E, Delta1, Delta3}
 GRANADA_FIELDS = {*GRANADA_SCALARS, *GRANADA_FERMIONS}
 
 # This is for pairs of fields
-def one_loop_scalar_terms(fields: set):
-    """Returns all possible one-loop terms with the given fields."""
+def one_loop_scalar_terms(fields: set, cache=DEFAULT_CACHE, counts=None):
+    """Returns all possible one-loop terms with the given fields. The pairs
+    removed by each check in `screen_pairs` are added to `counts`.
+
+    """
 
     # Add Dirac partners
     fields = {
@@ -150,31 +382,25 @@ def one_loop_scalar_terms(fields: set):
         *[f.conj for f in fields]
     }
 
-    combos = list(itertools.combinations_with_replacement(fields, 2))
     quartic_coupling, cubic_coupling = [], []
     models_that_need_work = set()
-    while combos:
-        combo = combos.pop(0)
-        f1, f2 = combo
-
-        # Apply criteria from https://arxiv.org/pdf/2103.11593.pdf
-        # For cubic coupling
-        if abs(f1.charges["y"] + f2.charges["y"]) == Rational("1/2"):
-            for irrep in f1.field * f2.field:
-                if irrep.colour_irrep == (0, 0) and irrep.isospin_irrep == (1,):
-                    cubic_coupling.append(combo)
-                    models_that_need_work.add(f"{f1.field.label} {f2.field.label}")
 
-        # For quartic coupling
-        if abs(f1.charges["y"] + f2.charges["y"]) == 1:
-            for irrep in f1.field * f2.field:
-                if irrep.colour_irrep == (0, 0) and irrep.isospin_irrep in {(0,), (2,)}:
-                    quartic_coupling.append(combo)
-                    models_that_need_work.add(f"{f1.field.label} {f2.field.label}")
+    # Apply criteria from https://arxiv.org/pdf/2103.11593.pdf
+    # For cubic coupling
+    for combo in screen_pairs(fields, Rational("1/2"), {1}, counts=counts):
+        f1, f2 = combo
+        for irrep in irreps(f1.field, f2.field, cache=cache):
+            if irrep.colour_irrep == (0, 0) and irrep.isospin_irrep == (1,):
+                cubic_coupling.append(combo)
+                models_that_need_work.add(f"{f1.field.label} {f2.field.label}")
 
-    print(len(models_that_need_work))
-    print(len(quartic_coupling), len(cubic_coupling))
-    print(len(quartic_coupling) + len(cubic_coupling))
+    # For quartic coupling
+    for combo in screen_pairs(fields, 1, {0, 2}, counts=counts):
+        f1, f2 = combo
+        for irrep in irreps(f1.field, f2.field, cache=cache):
+            if irrep.colour_irrep == (0, 0) and irrep.isospin_irrep in {(0,), (2,)}:
+                quartic_coupling.append(combo)
+                models_that_need_work.add(f"{f1.field.label} {f2.field.label}")
 
     return models_that_need_work, cubic_coupling, quartic_coupling
 
@@ -197,18 +423,10 @@ def one_loop_scalar_terms(fields: set):
 
 
 
-def one_loop_scalar_terms():
-    cubic_terms = []
-    for f1,f2 in itertools.combinations(GRANADA_SCALARS, 2):
-        if abs(f1.charges["y"] + f2.charges["y"]) == Rational("1/2") or abs(f1.charges["y"] - f2.charges["y"]) == Rational("1/2"):
-            for irrep in f1.field * f2.field:
-                if irrep.colour_irrep == (0, 0) and irrep.isospin_irrep == (1,):
-                    print(f1, f2)
-
 def quad_scalar_terms():
     quad_terms = []
     for f1,f2 in itertools.combinations(GRANADA_SCALARS, 2):
         if abs(f1.charges["y"] + f2.charges["y"]) == Rational("1/2") or abs(f1.charges["y"] - f2.charges["y"]) == Rational("1/2"):
-            for irrep in f1.field * f2.field:
+            for irrep in irreps(f1.field, f2.field):
                 if irrep.colour_irrep == (0, 0) and irrep.isospin_irrep == (1,):
                     print(f1, f2)
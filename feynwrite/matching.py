@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+
+"""Functions for matching many models onto the SMEFT with matchmakereft at once.
+Each model is matched in its own working directory and its own process, at
+most `workers` at a time, so that a model that hangs can be killed after a
+timeout and retried without affecting the others.
+
+The calls to matchmakereft go through a backend object with the methods
+`create_model` and `match_model_to_eft`, so that a stub can be used in its
+place when matchmakereft isn't installed.
+
+"""
+
+# Depends on: dictionary.py, model.py
+
+import json
+import multiprocessing
+import os
+import re
+import shutil
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional, Sequence
+
+from feynwrite.dictionary import build_model, model_label
+from feynwrite.model import Model
+
+# Matching statuses
+OK = "ok"
+GAMMA5 = "gamma5"  # Problems reported, but these may be due to gamma_5
+PROBLEMS = "problems"
+TIMEOUT = "timeout"
+ERROR = "error"
+
+# Files shared by every model, copied from the support directory. The `.symm`
+# and `.gauge` files are generated for each model.
+SUPPORT_SUFFIXES = ["red"]
+SUPPORT_PREFIX = "granada"
+# Files used by matchmakereft as they are, linked from the support directory
+SM_MODEL = "UnbrokenSM_BFM.fr"
+EFT_MODEL = "SMEFT_Green_Bpreserving_MM"
+
+# See `match_model`
+CONTEXT = multiprocessing.get_context("spawn")
+
+DEFAULT_SUPPORT_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "mm")
+
+
+class MatchmakerBackend:
+    """Calls matchmakereft in the current directory."""
+
+    def create_model(self, args: str) -> None:
+        # Imported here since matchmakereft is only needed for matching
+        from matchmakereft.libs.mm_offline import create_model
+
+        create_model(args)
+
+    def match_model_to_eft(self, args: str) -> None:
+        from matchmakereft.libs.mm_offline import match_model_to_eft
+
+        match_model_to_eft(args)
+
+
+@dataclass
+class MatchResult:
+    """The outcome of matching a single model. `problems` is the content of
+    `MatchingProblems.dat`, and `mass_found` is whether the masses of all the
+    exotics appear in `MatchingResult.dat`. `reused` is set for outcomes taken from a
+    `ResultStore` instead of matching again.
+
+    """
+
+    label: str
+    status: str
+    workdir: str
+    seconds: float
+    attempts: int = 1
+    problems: str = ""
+    mass_found: bool = False
+    error: str = ""
+    reused: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.status == OK
+
+
+def classify_problems(problems: str) -> str:
+    """Return the status of a matching from the content of `MatchingProblems.dat`."""
+    if problems.strip() == "problist = {}":
+        return OK
+    if "ee" in problems:
+        return GAMMA5
+    return PROBLEMS
+
+
+def prepare_workdir(multiplets: Sequence[str], workdir: str, support_dir: str) -> Model:
+    """Write the FeynRules, symmetry and gauge files of the model to a clean
+    `workdir` along with the reduction file. Returns the model.
+
+    """
+    if os.path.exists(workdir):
+        shutil.rmtree(workdir)
+    os.makedirs(workdir)
+
+    model = build_model(multiplets)
+    with open(os.path.join(workdir, f"{model.name}.fr"), "w") as fr_file:
+        model.write_feynrules(fr_file)
+    with open(os.path.join(workdir, f"{model.name}.symm"), "w") as symm_file:
+        symm_file.write(model.export_symm())
+    with open(os.path.join(workdir, f"{model.name}.gauge"), "w") as gauge_file:
+        gauge_file.write(model.export_gauge())
+
+    for suffix in SUPPORT_SUFFIXES:
+        shutil.copy(
+            os.path.join(support_dir, f"{SUPPORT_PREFIX}.{suffix}"),
+            os.path.join(workdir, f"{model.name}.{suffix}"),
+        )
+    for name in [SM_MODEL, EFT_MODEL]:
+        source = os.path.join(support_dir, name)
+        if os.path.exists(source):
+            os.symlink(os.path.abspath(source), os.path.join(workdir, name))
+
+    return model
+
+
+def match_in_workdir(
+    multiplets: Sequence[str], workdir: str, support_dir: str, backend
+) -> Dict:
+    """Match the model containing `multiplets` in `workdir`, which is created from
+    scratch. Returns the status, problems and whether the masses of all the
+    exotics feature in the results.
+
+    """
+    model = prepare_workdir(multiplets, workdir, support_dir)
+    name = model.name
+
+    os.chdir(workdir)
+    backend.create_model(f"{SM_MODEL} {name}.fr")
+    backend.match_model_to_eft(f"{name}_MM {EFT_MODEL}")
+
+    with open(os.path.join(f"{name}_MM", "MatchingProblems.dat")) as problems_file:
+        problems = problems_file.read()
+    with open(os.path.join(f"{name}_MM", "MatchingResult.dat")) as results_file:
+        results = results_file.read()
+    mass_found = all(re.search(rf"\bM{f.mass_label}\b", results) for f in model.exotics)
+
+    return {
+        "status": classify_problems(problems),
+        "problems": problems,
+        "mass_found": mass_found,
+    }
+
+
+def _attempt(multiplets, workdir, support_dir, backend, conn) -> None:
+    """Run in a child process, sending the outcome of the matching through `conn`.
+    The process starts a new session, so that the processes matchmakereft starts
+    (such as the Mathematica kernel) can be killed with it.
+
+    """
+    os.setsid()
+    try:
+        outcome = match_in_workdir(multiplets, workdir, support_dir, backend)
+    except Exception as e:
+        outcome = {"status": ERROR, "error": f"{type(e).__name__}: {e}"}
+    conn.send(outcome)
+    conn.close()
+
+
+def match_model(
+    multiplets: Sequence[str],
+    work_root: str,
+    support_dir: str = DEFAULT_SUPPORT_DIR,
+    backend=None,
+    timeout: Optional[float] = None,
+    retries: int = 0,
+) -> MatchResult:
+    """Match the model containing `multiplets` in `<work_root>/<model_label>`. Each
+    attempt runs in a new process, killed along with the processes it started
+    after `timeout` seconds. Attempts that time out or raise are retried up to
+    `retries` times.
+
+    The processes are spawned rather than forked, since they are started from the
+    threads of `match_models`, and a fork while another thread holds a lock can
+    deadlock the child.
+
+    """
+    if backend is None:
+        backend = MatchmakerBackend()
+
+    label = model_label(multiplets)
+    workdir = os.path.abspath(os.path.join(work_root, label))
+    start = time.perf_counter()
+
+    for attempt in range(1, retries + 2):
+        recv_end, send_end = CONTEXT.Pipe(duplex=False)
+        process = CONTEXT.Process(
+            target=_attempt,
+            args=(list(multiplets), workdir, os.path.abspath(support_dir), backend, send_end),
+        )
+        process.start()
+        # Close our copy so that a crashed child is seen as the end of the pipe
+        send_end.close()
+
+        if recv_end.poll(timeout):
+            try:
+                outcome = recv_end.recv()
+            except EOFError:
+                outcome = {"status": ERROR, "error": "Matching process died"}
+            process.join()
+        else:
+            _kill_session(process)
+            process.join()
+            outcome = {"status": TIMEOUT, "error": f"Timed out after {timeout}s"}
+        recv_end.close()
+
+        if outcome["status"] not in {TIMEOUT, ERROR}:
+            break
+
+    seconds = time.perf_counter() - start
+    return MatchResult(label, workdir=workdir, seconds=seconds, attempts=attempt, **outcome)
+
+
+def _kill_session(process) -> None:
+    """Kill `process` and every process in its session."""
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        # The process hadn't started its session yet
+        process.kill()
+
+
+def match_models(
+    specs: Sequence[Sequence[str]],
+    work_root: str,
+    support_dir: str = DEFAULT_SUPPORT_DIR,
+    backend=None,
+    workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+    retries: int = 0,
+    report: Optional[Callable[[MatchResult], None]] = None,
+    store=None,
+    reuse: bool = True,
+) -> List[MatchResult]:
+    """Match the model for each list of multiplets in `specs`, at most `workers`
+    (by default, one per CPU) at a time. `report` is called with each result as it
+    completes. Results are returned in the order of `specs`. See `match_model`
+    for the other arguments.
+
+    If a `ResultStore` is given, new outcomes are stored in it, and unless `reuse`
+    is False, models that finished matching with the same inputs before aren't
+    matched again.
+
+    """
+    os.makedirs(work_root, exist_ok=True)
+    # Each matching is run in its own process, so threads are enough to wait on them
+    lock = threading.Lock()
+
+    def run(spec):
+        key = None
+        if store is not None:
+            try:
+                key = store.key(spec, support_dir)
+            except Exception:
+                # Invalid models fail in `match_model` instead
+                pass
+
+        result = None
+        if key is not None and reuse:
+            with lock:
+                result = store.get(key)
+            if result is not None and result.status in {TIMEOUT, ERROR}:
+                result = None
+
+        if result is None:
+            result = match_model(
+                spec, work_root, support_dir, backend=backend, timeout=timeout, retries=retries
+            )
+            if key is not None:
+                with lock:
+                    store.put(key, result)
+
+        if report is not None:
+            with lock:
+                report(result)
+        return result
+
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        return list(executor.map(run, specs))
+
+
+def summarise(results: Sequence[MatchResult]) -> Dict:
+    """Return a JSON-serialisable summary of the matching of each model."""
+    counts: Dict[str, int] = {}
+    for result in results:
+        counts[result.status] = counts.get(result.status, 0) + 1
+    return {"counts": counts, "models": [asdict(result) for result in results]}
+
+
+def write_summary(results: Sequence[MatchResult], path: str) -> None:
+    with open(path, "w") as f:
+        json.dump(summarise(results), f, indent=2)
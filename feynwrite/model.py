@@ -5,14 +5,24 @@ will enter the FeynRules output.
 
 """
 
-# Depends on: tensor.py
+# Depends on: tensor.py, hermiticity.py
 
-from typing import List, Set
+import io
+from typing import List, Set, TextIO
 from dataclasses import dataclass
 from datetime import datetime
 
+from feynwrite.hermiticity import HermiticityProblem, check_hermiticity
 from feynwrite.tensor import Tensor, Fermion, TensorProduct, Field, Coupling
-from feynwrite.utils import format_wolfram_list, format_latex_eqn, EXTRA_PARAMS
+from feynwrite.utils import write_wolfram_list, format_latex_eqn, EXTRA_PARAMS, GENERATIONS
+
+# Start of the line with the date the FeynRules file was written, which is left
+# out when comparing files
+DATE_PREFIX = "{ Date ->"
+
+
+def date_line() -> str:
+    return f"{DATE_PREFIX} \"{datetime.today().strftime('%Y-%m-%d')}\" }};\n"
 
 
 def _unique_subcollection(coll: List[TensorProduct], subcoll_name: str) -> List[Tensor]:
@@ -48,6 +58,8 @@ class Model:
         self.terms = terms
         self.fields = _unique_subcollection(self.terms, "fields")
         self.couplings = _unique_subcollection(self.terms, "couplings")
+        # Exotic fields present in the model without duplicates
+        self.exotics = [f for f in self.fields if not f.is_sm]
 
     def __repr__(self) -> str:
         return f"Model({self.name})"
@@ -59,18 +71,13 @@ class Model:
     def preamble(self) -> str:
         output = f'M$ModelName = "{self.name}";\n\n'
         output += f"M$Information =\n"
-        output += f"{{ Date -> \"{datetime.today().strftime('%Y-%m-%d')}\" }};\n\n"
+        output += date_line() + "\n"
         output += "(* Sextet not defined in SM model file *)\n"
         output += "IndexRange[Index[Sextet]] = Range[6];\n"
         output += "IndexStyle[Sextet, x];\n"
         output += "AddGaugeRepresentation[SU3C -> {T6, Sextet}];\n\n"
         return output
 
-    @property
-    def exotics(self) -> List[Field]:
-        """Return a list of exotic fields present in the model without duplicates."""
-        return [f for f in self.fields if not f.is_sm]
-
     def export_mmp_config(self) -> str:
         """Returns a string representing the MatchMakerParser configuration file for the
         model.
@@ -79,7 +86,7 @@ class Model:
         sm_couplings = ["yd", "ydbar", "yu", "yubar", "yl", "ylbar"]
         couplings_with_ranges = []
         for sm_coupling in sm_couplings:
-            couplings_with_ranges.append(f"{{{sm_coupling}, {{3,3}}}}")
+            couplings_with_ranges.append(f"{{{sm_coupling}, {{{GENERATIONS},{GENERATIONS}}}}}")
 
         exotic_params = []
         # Add masses
@@ -96,8 +103,7 @@ class Model:
             if not n_indices:
                 continue
 
-            n_f = 3  # FIXME This is hardcoded here
-            dimensions = [str(n_f)] * n_indices
+            dimensions = [str(GENERATIONS)] * n_indices
             dimensions_str = "{" + ",".join(dimensions) + "}"
 
             couplings_with_ranges.append(f"{{{coupling.label}, {dimensions_str}}}")
@@ -107,53 +113,121 @@ class Model:
         output += f"DeclareExoticParams[{','.join(exotic_params)}];"
         return output
 
+    def export_symm(self) -> str:
+        """Returns a string representing the `.symm` file for the model: the
+        replacement rules imposing the symmetry or antisymmetry of the couplings
+        in their generation indices. See `group.coupling_symmetry`.
+
+        """
+        # Imported here since numpy is only needed for this export
+        from feynwrite.group import coupling_symmetry, symmetry_rules
+
+        rules = []
+        for term in self.terms:
+            sign = coupling_symmetry(term)
+            if sign is not None:
+                rules += symmetry_rules(term.couplings[0], sign)
+
+        if not rules:
+            return "listareplacesymmetry = {}\n"
+        return "listareplacesymmetry =\n{ " + "\n, ".join(rules) + "\n}\n"
+
+    def export_gauge(self) -> str:
+        """Returns a string representing the `.gauge` file for the model: the
+        arrays of the gauge structures it uses. See `group.gauge_structure_names`.
+
+        """
+        # Imported here since numpy is only needed for this export
+        from feynwrite.group import gauge_structure_names, gauge_structures
+
+        structures = gauge_structures()
+        rules = [
+            f"{name} -> {structures[name].sparse_array()}"
+            for name in gauge_structure_names(self.terms)
+        ]
+        return "replacegaugedata =\n{ " + "\n, ".join(rules) + "\n}\n"
+
+    def vertices(self) -> List:
+        """Returns the Feynman rules of the terms and of the conjugates added in the
+        FeynRules output. See `vertices.vertices`.
+
+        """
+        # Imported here since numpy is only needed for this
+        from feynwrite.vertices import vertices
+
+        return vertices(self.terms)
+
+    def export_ufo(self, directory: str) -> None:
+        """Writes the UFO model, built from the Feynman rules of the terms, to
+        `directory`. See `ufo.write_ufo`.
+
+        """
+        # Imported here since numpy and sympy are only needed for this
+        from feynwrite.ufo import write_ufo
+
+        write_ufo(self, directory)
+
+    def check_hermiticity(self) -> List[HermiticityProblem]:
+        """Returns the terms whose hermitian conjugate would be missing or double
+        counted in the FeynRules output. See `hermiticity.check_hermiticity`.
+
+        """
+        return check_hermiticity(self.terms)
+
     def export_feynrules(self) -> str:
         """Returns a string representing the FeynRules file for the model."""
-        params = set()
+        buffer = io.StringIO()
+        self.write_feynrules(buffer)
+        return buffer.getvalue()
+
+    def write_feynrules(self, fp: TextIO) -> None:
+        """Writes the FeynRules file for the model to the file object `fp`, one
+        section at a time.
+
+        """
+        if not self.terms:
+            raise ValueError(f"Model {self.name} has no terms")
+        fp.write(self.preamble())
+
+        # Use dictionary keys as ordered set so that the output is reproducible
+        params = {}
         for term in self.terms:
             for param in term.feynrules_param_entries():
-                params.add(param)
-
-        param_list = list(params)
-        param_list.append(EXTRA_PARAMS)
-        param_block = format_wolfram_list(
-            param_list, starting_string="M$Parameters =\n"
-        )
+                params[param] = 0
+        params[EXTRA_PARAMS] = 0
+        write_wolfram_list(fp, params.keys(), starting_string="M$Parameters =\n")
 
         count = 200 - 1
-        classes = set()
+        classes = {}
         for field in self.exotics:
             count += 1
-            classes.add(field.feynrules_class_entry(count))
+            classes[field.feynrules_class_entry(count)] = 0
             # Add left and right fermions if needed
             if isinstance(field, Fermion):
                 count += 1
-                classes.add(field.feynrules_class_entry_chiral(count, "L"))
+                classes[field.feynrules_class_entry_chiral(count, "L")] = 0
                 count += 1
-                classes.add(field.feynrules_class_entry_chiral(count, "R"))
-
-        classes_block = format_wolfram_list(
-            classes, starting_string="M$ClassesDescription =\n"
+                classes[field.feynrules_class_entry_chiral(count, "R")] = 0
+        write_wolfram_list(
+            fp, classes.keys(), starting_string="M$ClassesDescription =\n"
         )
 
-        lagrangian = "(********************* The Lagrangian *********************)\n\n"
-        lagrangian += "gotoBFM =\n{ G[a__] -> G[a] + GQuantum[a]\n, Wi[a__] -> Wi[a] + WiQuantum[a]\n, B[a__] -> B[a] + BQuantum[a] \n};\n\n"
+        fp.write("(********************* The Lagrangian *********************)\n\n")
+        fp.write("gotoBFM =\n{ G[a__] -> G[a] + GQuantum[a]\n, Wi[a__] -> Wi[a] + WiQuantum[a]\n, B[a__] -> B[a] + BQuantum[a] \n};\n\n")
 
         # Use dictionary keys as ordered set
         wolfram_term_names = {}
         for field in self.exotics:
-            lagrangian += field.feynrules_free_terms()
-            lagrangian += "\n\n"
+            fp.write(field.feynrules_free_terms())
+            fp.write("\n\n")
             wolfram_term_names[field.wolfram_term_name] = 0
 
         for term in self.terms:
-            lagrangian += term.wolfram()
-            lagrangian += "\n\n"
+            fp.write(term.wolfram())
+            fp.write("\n\n")
             term_name = term.wolfram_term_name
             wolfram_term_names[term_name] = 0
             if term.is_complex:
                 wolfram_term_names[f"HC[{term_name}]"] = 0
 
-        l_tot = f"Ltot := LSM + {' + '.join(wolfram_term_names.keys())};"
-
-        return self.preamble() + param_block + classes_block + lagrangian + l_tot
+        fp.write(f"Ltot := LSM + {' + '.join(wolfram_term_names.keys())};\n")
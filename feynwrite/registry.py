@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+
+"""Contains the TermRegistry class, which holds the terms of the Lagrangian as
+factories keyed by the exotic fields they contain. Terms are only built when a
+model that needs them is requested, and are memoised afterwards.
+
+"""
+
+# Depends on: tensor.py
+
+import itertools
+from math import comb
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from feynwrite.tensor import TensorProduct
+
+
+class TermRegistry:
+    """An ordered collection of term factories. Register a term with the labels of
+    the exotic fields it contains:
+
+        @REGISTRY.register("GranadaS")
+        def kappaS_term():
+            return Coupling("kappaS", []) * S() * H("i0").C * H("i0")
+
+    """
+
+    def __init__(self):
+        self._factories: List[Tuple[FrozenSet[str], Callable[[], TensorProduct]]] = []
+        self._built: Dict[int, TensorProduct] = {}
+        # Inverted index from the exotic labels of a term to the positions of the
+        # terms containing exactly those exotics
+        self._index: Dict[FrozenSet[str], List[int]] = {}
+        self._max_exotics = 0
+
+    def register(self, *exotics: str):
+        """Decorator registering a function that returns a term containing exactly
+        the `exotics`.
+
+        """
+
+        def decorator(factory: Callable[[], TensorProduct]):
+            key = frozenset(exotics)
+            self._index.setdefault(key, []).append(len(self._factories))
+            self._max_exotics = max(self._max_exotics, len(key))
+            self._factories.append((key, factory))
+            return factory
+
+        return decorator
+
+    def __len__(self) -> int:
+        return len(self._factories)
+
+    @property
+    def factories(self) -> List[Callable[[], TensorProduct]]:
+        """The factory of each term in order of registration."""
+        return [factory for _, factory in self._factories]
+
+    @property
+    def keys(self) -> List[FrozenSet[str]]:
+        """The exotic labels of each term in order of registration."""
+        return [exotics for exotics, _ in self._factories]
+
+    def build(self, n: int) -> TensorProduct:
+        """Return the `n`th registered term, building it on first use."""
+        if n not in self._built:
+            _, factory = self._factories[n]
+            self._built[n] = factory()
+        return self._built[n]
+
+    def terms(self, multiplets: Optional[Iterable[str]] = None) -> List[TensorProduct]:
+        """Return the terms whose exotic fields are all in `multiplets`, in order of
+        registration. If `multiplets` is None, return every term.
+
+        """
+        if multiplets is None:
+            return [self.build(n) for n in range(len(self))]
+        return [self.build(n) for n in self.select(multiplets)]
+
+    def select(self, multiplets: Iterable[str]) -> List[int]:
+        """Return the positions of the terms whose exotic fields are all in
+        `multiplets`, in order of registration. No terms are built.
+
+        """
+        multiplets = frozenset(multiplets)
+
+        # Either look up every small enough subset of the multiplets in the index,
+        # or check each key of the index, whichever is fewer operations
+        n_subsets = sum(
+            comb(len(multiplets), k)
+            for k in range(min(self._max_exotics, len(multiplets)) + 1)
+        )
+        if n_subsets < len(self._index):
+            keys = (
+                frozenset(subset)
+                for k in range(min(self._max_exotics, len(multiplets)) + 1)
+                for subset in itertools.combinations(multiplets, k)
+            )
+        else:
+            keys = (key for key in self._index if key <= multiplets)
+
+        selected = []
+        for key in keys:
+            selected += self._index.get(key, [])
+        return sorted(selected)
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+
+"""The store of the outcomes of matching models with matchmakereft. Outcomes are
+kept in a SQLite database keyed by a hash of the inputs of the matching: the
+FeynRules, symmetry and gauge files of the model and the reduction file. A
+model whose inputs haven't changed since it was last matched needn't be matched
+again.
+
+"""
+
+# Depends on: dictionary.py, matching.py
+
+import hashlib
+import os
+import sqlite3
+from datetime import datetime
+from typing import List, Optional, Sequence
+
+from feynwrite.dictionary import build_model
+from feynwrite.model import DATE_PREFIX
+from feynwrite.matching import SUPPORT_PREFIX, SUPPORT_SUFFIXES, MatchResult
+
+DB_NAME = "matching.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    input_hash TEXT PRIMARY KEY,
+    label TEXT NOT NULL,
+    status TEXT NOT NULL,
+    workdir TEXT NOT NULL,
+    seconds REAL NOT NULL,
+    attempts INTEGER NOT NULL,
+    problems TEXT NOT NULL,
+    mass_found INTEGER NOT NULL,
+    error TEXT NOT NULL,
+    finished TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_label ON results (label);
+"""
+
+COLUMNS = [
+    "label",
+    "status",
+    "workdir",
+    "seconds",
+    "attempts",
+    "problems",
+    "mass_found",
+    "error",
+]
+
+
+def input_hash(multiplets: Sequence[str], support_dir: str) -> str:
+    """Return the hash of the inputs of matching the model containing
+    `multiplets`. The date the FeynRules file is written is ignored.
+
+    """
+    digest = hashlib.sha256()
+    model = build_model(multiplets)
+    for line in model.export_feynrules().splitlines(keepends=True):
+        if not line.startswith(DATE_PREFIX):
+            digest.update(line.encode())
+    digest.update(model.export_symm().encode())
+    digest.update(model.export_gauge().encode())
+
+    for suffix in SUPPORT_SUFFIXES:
+        with open(os.path.join(support_dir, f"{SUPPORT_PREFIX}.{suffix}"), "rb") as f:
+            digest.update(f.read())
+
+    return digest.hexdigest()
+
+
+class ResultStore:
+    """Matching outcomes in the SQLite database at `path`. Only the latest outcome
+    for each set of inputs is kept.
+
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        # Results are stored from the threads waiting on the matchings
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self) -> "ResultStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def key(self, multiplets: Sequence[str], support_dir: str) -> str:
+        """Return the key of the outcome of matching the model containing
+        `multiplets`. See `input_hash`.
+
+        """
+        return input_hash(multiplets, support_dir)
+
+    def get(self, key: str) -> Optional[MatchResult]:
+        """Return the outcome stored for the inputs with hash `key`, if any."""
+        row = self.connection.execute(
+            f"SELECT {', '.join(COLUMNS)} FROM results WHERE input_hash = ?", (key,)
+        ).fetchone()
+        return None if row is None else _to_result(row)
+
+    def put(self, key: str, result: MatchResult) -> None:
+        values = [getattr(result, column) for column in COLUMNS]
+        with self.connection:
+            self.connection.execute(
+                f"INSERT OR REPLACE INTO results (input_hash, {', '.join(COLUMNS)}, finished) "
+                f"VALUES (?, {', '.join('?' for _ in COLUMNS)}, ?)",
+                [key, *values, datetime.now().isoformat(timespec="seconds")],
+            )
+
+    def query(
+        self,
+        statuses: Sequence[str] = (),
+        min_seconds: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> List[MatchResult]:
+        """Return the stored outcomes with any of the `statuses` that took at least
+        `min_seconds`, slowest first.
+
+        """
+        conditions, parameters = [], []
+        if statuses:
+            conditions.append(f"status IN ({', '.join('?' for _ in statuses)})")
+            parameters += list(statuses)
+        if min_seconds is not None:
+            conditions.append("seconds >= ?")
+            parameters.append(min_seconds)
+
+        sql = f"SELECT {', '.join(COLUMNS)} FROM results"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY seconds DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            parameters.append(limit)
+
+        return [_to_result(row) for row in self.connection.execute(sql, parameters)]
+
+
+def _to_result(row) -> MatchResult:
+    result = MatchResult(**dict(zip(COLUMNS, row)))
+    result.mass_found = bool(result.mass_found)
+    result.reused = True
+    return result
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+
+"""Functions for sweeping the space of models built from the multiplets of the
+Granada dictionary. Every combination of up to N multiplets connected by the
+two-field terms is exported, and the completed models are recorded in a
+manifest so that an interrupted sweep can be resumed.
+
+A sweep can be split into shards run on different machines. Each shard writes
+its own manifest, and the manifests are merged afterwards.
+
+"""
+
+# Depends on: dictionary.py, two_field.py, batch.py
+
+import itertools
+import json
+import os
+from typing import (
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from feynwrite.batch import BatchResult, run_batch
+from feynwrite.dictionary import SCALARS, FERMIONS, model_label
+from feynwrite.two_field import TWO_FIELD_REGISTRY
+
+MANIFEST_NAME = "manifest.jsonl"
+
+
+def is_connected(multiplets: Sequence[str], links: Iterable[FrozenSet[str]]) -> bool:
+    """Return True if every multiplet is linked to every other by a chain of
+    terms, where `links` are the sets of exotics of the terms.
+
+    """
+    if len(multiplets) < 2:
+        return True
+
+    # Only the links between multiplets in the model matter
+    members = set(multiplets)
+    links = [link for link in links if link <= members]
+
+    reached = {multiplets[0]}
+    grew = True
+    while grew:
+        grew = False
+        for link in links:
+            if reached & link and not link <= reached:
+                reached |= link
+                grew = True
+
+    return reached == members
+
+
+def enumerate_models(
+    max_fields: int, min_fields: int = 1, multiplets: Sequence[str] = ()
+) -> Iterator[List[str]]:
+    """Yield the combinations of between `min_fields` and `max_fields` of the
+    `multiplets` (by default, all scalars and fermions) connected by the
+    two-field terms. The order is deterministic.
+
+    """
+    multiplets = list(multiplets) or SCALARS + FERMIONS
+    links = set(TWO_FIELD_REGISTRY.keys)
+    for n in range(min_fields, max_fields + 1):
+        for combination in itertools.combinations(multiplets, n):
+            if is_connected(combination, links):
+                yield list(combination)
+
+
+def parse_shard(shard: str) -> Tuple[int, int]:
+    """Parse a shard specification "K/N", meaning the Kth of N shards."""
+    try:
+        k, n = (int(x) for x in shard.split("/"))
+    except ValueError:
+        raise ValueError(f"Shard should look like K/N, not {shard}")
+    if not 1 <= k <= n:
+        raise ValueError(f"Shard {shard} should have 1 <= K <= N")
+    return k, n
+
+
+def shard_models(models: Sequence[Sequence[str]], k: int, n: int) -> List[Sequence[str]]:
+    """Return the models in the Kth of N shards. Models are dealt out to the shards
+    in turn, so every model is in exactly one shard as long as the models are
+    enumerated in the same order.
+
+    """
+    return list(models[k - 1 :: n])
+
+
+def read_manifest(path: str) -> Dict[str, Dict]:
+    """Return the entries of the manifest at `path` by model label. Later entries
+    for a model replace earlier ones. A truncated last line, e.g. from an
+    interrupted sweep, is ignored.
+
+    """
+    entries = {}
+    if not os.path.exists(path):
+        return entries
+
+    with open(path) as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            entries[entry["model"]] = entry
+    return entries
+
+
+def manifest_path(
+    output_dir: str,
+    manifest: Optional[str] = None,
+    shard: Optional[Tuple[int, int]] = None,
+) -> str:
+    """Return `manifest`, or the default manifest of the `output_dir`. Each shard
+    has its own default manifest.
+
+    """
+    if manifest is not None:
+        return manifest
+    if shard is not None:
+        return os.path.join(output_dir, "manifest-{}-of-{}.jsonl".format(*shard))
+    return os.path.join(output_dir, MANIFEST_NAME)
+
+
+def pending_models(models: Sequence[Sequence[str]], manifest: str) -> List[Sequence[str]]:
+    """Return the `models` not successfully exported according to the `manifest`."""
+    done = {label for label, entry in read_manifest(manifest).items() if not entry["error"]}
+    return [model for model in models if model_label(model) not in done]
+
+
+def manifest_entry(result: BatchResult) -> Dict:
+    return {
+        "model": result.label,
+        "path": result.path,
+        "seconds": round(result.seconds, 6),
+        "error": result.error,
+        "sha256": result.sha256,
+    }
+
+
+def merge_manifests(
+    paths: Sequence[str],
+) -> Tuple[Dict[str, Dict], Dict[str, Dict[str, Dict]]]:
+    """Combine the manifests at `paths`. Returns the merged entries by model label,
+    and for each model that appears in more than one manifest, its entries by
+    manifest. Successful entries take precedence over failed ones.
+
+    """
+    merged: Dict[str, Dict] = {}
+    sources: Dict[str, Dict[str, Dict]] = {}
+    for path in paths:
+        for label, entry in read_manifest(path).items():
+            sources.setdefault(label, {})[path] = entry
+            if label not in merged or merged[label]["error"]:
+                merged[label] = entry
+
+    duplicates = {label: copies for label, copies in sources.items() if len(copies) > 1}
+    return merged, duplicates
+
+
+def is_conflicting(copies: Dict[str, Dict]) -> bool:
+    """Return True if the successful entries for a model have different output."""
+    return len({e.get("sha256", "") for e in copies.values() if not e["error"]}) > 1
+
+
+def find_gaps(models: Sequence[Sequence[str]], entries: Dict[str, Dict]) -> List[str]:
+    """Return the labels of the `models` not successfully exported in `entries`."""
+    gaps = []
+    for model in models:
+        label = model_label(model)
+        if label not in entries or entries[label]["error"]:
+            gaps.append(label)
+    return gaps
+
+
+def scan(
+    models: Sequence[Sequence[str]],
+    output_dir: str,
+    manifest: Optional[str] = None,
+    workers: Optional[int] = None,
+    report: Optional[Callable[[BatchResult], None]] = None,
+    cache_dir: Optional[str] = None,
+) -> List[BatchResult]:
+    """Export `models` into `output_dir`, skipping those already completed in the
+    `manifest` (by default, `<output_dir>/manifest.jsonl`). Each result is
+    appended to the manifest as it completes. Failed models are retried on the
+    next scan. Returns the results of the models exported in this scan.
+
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = manifest_path(output_dir, manifest)
+    todo = pending_models(models, manifest)
+
+    with open(manifest, "a") as f:
+
+        def record(result: BatchResult) -> None:
+            f.write(json.dumps(manifest_entry(result)) + "\n")
+            f.flush()
+            if report is not None:
+                report(result)
+
+        return run_batch(todo, output_dir, workers=workers, report=record, cache_dir=cache_dir)
@@ -11,55 +11,72 @@ from feynwrite.tensor import Scalar, Fermion
 def L(s, i, g):
     label = "LL"
     tensor = Fermion(
-        label=label, indices=[s, i, g], hypercharge=Fraction("-1/2"), chirality="L"
+        label=label,
+        indices=[s, i, g],
+        hypercharge=Fraction("-1/2"),
+        chirality="L",
+        is_sm=True,
+        latex="L",
     )
-    tensor.is_sm = True
-    tensor.latex = "L"
     return tensor
 
 
 def Q(s, c, i, g):
     label = "QL"
     tensor = Fermion(
-        label=label, indices=[s, c, i, g], hypercharge=Fraction("1/6"), chirality="L"
+        label=label,
+        indices=[s, c, i, g],
+        hypercharge=Fraction("1/6"),
+        chirality="L",
+        is_sm=True,
+        latex="Q",
     )
-    tensor.is_sm = True
-    tensor.latex = "Q"
     return tensor
 
 
 def H(i):
     # TODO Fix this, as exotic in Granada dictionary with the same name
     label = "Phi"
-    tensor = Scalar(label=label, indices=[i], hypercharge=Fraction("1/2"))
-    tensor.is_sm = True
-    tensor.latex = "H"
+    tensor = Scalar(
+        label=label, indices=[i], hypercharge=Fraction("1/2"), is_sm=True, latex="H"
+    )
     return tensor
 
 
 def eR(s, g):
     label = "LR"
-    tensor = Fermion(label=label, indices=[s, g], chirality="R", hypercharge=-1)
-    tensor.is_sm = True
-    tensor.latex = r"e_{R}"
+    tensor = Fermion(
+        label=label,
+        indices=[s, g],
+        chirality="R",
+        hypercharge=-1,
+        is_sm=True,
+        latex=r"e_{R}",
+    )
     return tensor
 
 
 def dR(s, c, g):
     label = "DR"
     tensor = Fermion(
-        label=label, indices=[s, c, g], chirality="R", hypercharge=Fraction("-1/3")
+        label=label,
+        indices=[s, c, g],
+        chirality="R",
+        hypercharge=Fraction("-1/3"),
+        is_sm=True,
+        latex=r"d_{R}",
     )
-    tensor.is_sm = True
-    tensor.latex = r"d_{R}"
     return tensor
 
 
 def uR(s, c, g):
     label = "UR"
     tensor = Fermion(
-        label=label, indices=[s, c, g], chirality="R", hypercharge=Fraction("2/3")
+        label=label,
+        indices=[s, c, g],
+        chirality="R",
+        hypercharge=Fraction("2/3"),
+        is_sm=True,
+        latex=r"u_{R}",
     )
-    tensor.is_sm = True
-    tensor.latex = r"u_{R}"
     return tensor
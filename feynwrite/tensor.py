@@ -2,25 +2,52 @@
 
 """Functions for representing fields and Lagrangian interactions."""
 
+import hashlib
+import itertools
+import math
+import weakref
 from fractions import Fraction
-from typing import List, Union, Dict
-from dataclasses import dataclass
-from copy import deepcopy
-import sympy
+from typing import Any, Iterable, List, Set, Tuple, Union, Dict
 
 from feynwrite.utils import (
     INDICES,
-    raise_lower_index,
+    Index,
+    IndexKind,
     wolfram_block,
-    sort_index_labels,
+    sort_indices,
     wolfram_index_map,
     wolfram_func_call,
     sympy_to_mathematica
 )
 
+# Tensors are immutable, so attributes are set with this in `__init__`
+_setattr = object.__setattr__
+
+# Conventional index head for each kind of index, used to relabel dummy indices
+INDEX_HEADS = {kind: INDICES[kind.name.lower()] for kind in IndexKind}
+
+# Products by canonical key, see `intern_term`
+_INTERNED: "weakref.WeakValueDictionary[Tuple, TensorProduct]" = weakref.WeakValueDictionary()
+
+# Don't reverse the generation and adjoint indices on conjugation
+DONT_REVERSE = {
+    IndexKind.GENERATION,
+    IndexKind.ISOSPIN_ADJOINT,
+    IndexKind.ISOSPIN_4,
+    IndexKind.COLOUR_ADJOINT,
+    IndexKind.COLOUR_6,
+}
+
 
-@dataclass
 class Tensor:
+    """Immutable tensor. Operations like conjugation return new objects that share
+    all unchanged attributes with the original, which is safe since nothing can
+    be modified in place.
+
+    """
+
+    __slots__ = ("label", "_indices", "latex", "is_field", "is_conj")
+
     def __init__(
         self,
         label: str,
@@ -29,22 +56,57 @@ class Tensor:
         is_field: bool = True,
         is_conj: bool = False,
     ):
-        self.label = label
-        self.is_field = is_field
-        self.is_conj = is_conj
-
         # Represent indices as space-separated string, e.g. "i j k"
         if isinstance(indices, str):
             indices = indices.split(" ")
-        self.indices = indices
-
-        # If initialised with an empty string, make sure self.indices is the
-        # empty list
-        if not indices:
-            self.indices = []
 
+        _setattr(self, "label", label)
+        _setattr(self, "is_field", is_field)
+        _setattr(self, "is_conj", is_conj)
+        # Empty strings are not indices. Indices are parsed once here, and only
+        # converted back to strings on export
+        _setattr(self, "_indices", tuple(Index.get(i) for i in indices if i))
         # By default, make latex label the same as string label
-        self.latex = latex if latex else label
+        _setattr(self, "latex", latex if latex else label)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._all_slots = _all_slots(cls)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} objects are immutable")
+
+    def _replace(self, **changes) -> "Tensor":
+        """Return a new tensor with `changes` applied. All other attributes are
+        shared with `self`.
+
+        """
+        other = object.__new__(type(self))
+        for slot in self._all_slots:
+            value = changes[slot] if slot in changes else getattr(self, slot)
+            _setattr(other, slot, value)
+        return other
+
+    def _values(self) -> Tuple:
+        return tuple(getattr(self, slot) for slot in self._all_slots)
+
+    def __eq__(self, other) -> bool:
+        if type(self) is not type(other):
+            return NotImplemented
+        return self._values() == other._values()
+
+    def __hash__(self) -> int:
+        return hash((type(self), self._values()))
+
+    def __copy__(self) -> "Tensor":
+        return self
+
+    def __deepcopy__(self, memo) -> "Tensor":
+        return self
+
+    @property
+    def indices(self) -> List[str]:
+        return [i.string for i in self._indices]
 
     def get_latex(self, base_latex=None) -> str:
         """Return LaTeX form of object. If base_latex is passed, use that instead. This
@@ -54,15 +116,15 @@ class Tensor:
         if base_latex is None:
             base_latex = self.latex
 
-        if not self.indices:
+        if not self._indices:
             return base_latex
 
         lower_indices, upper_indices = [], []
-        for i in self.indices:
-            if i[0] == "-":
-                lower_indices.append(i[1:])
+        for i in self._indices:
+            if i.is_lowered:
+                lower_indices.append(i.label)
             else:
-                upper_indices.append(i)
+                upper_indices.append(i.label)
 
         lower_indices_string = "" if not lower_indices else f"_{{{' '.join(lower_indices)}}}"
         upper_indices_string = "" if not upper_indices else f"^{{{' '.join(upper_indices)}}}"
@@ -87,16 +149,7 @@ class Tensor:
 
     def get_index_labels(self) -> List[str]:
         """Return a list of indices without negative signs for lowered indices."""
-        labels = []
-        for i in self.indices:
-            if not i:
-                continue
-            if i[0] == "-":
-                labels.append(i[1:])
-            else:
-                labels.append(i)
-
-        return labels
+        return [i.label for i in self._indices]
 
     @property
     def index_labels(self) -> List[str]:
@@ -104,7 +157,7 @@ class Tensor:
         as expected by SM model file.
 
         """
-        return sort_index_labels(self.get_index_labels())
+        return [i.label for i in sort_indices(self._indices)]
 
     def wolfram(self, label: str = "", indices: List[str] = []) -> str:
         """Return Wolfram-language form of object. For flexibility, pass in another
@@ -119,48 +172,46 @@ class Tensor:
             indices = self.index_labels
         return wolfram_func_call(label, indices)
 
+    def _conj_indices(self) -> Tuple[Index, ...]:
+        """Return the indices with all fundamental indices reversed."""
+        return tuple(i if i.kind in DONT_REVERSE else i.flipped for i in self._indices)
+
     @property
     def C(self) -> "Tensor":
         """The hermitian conjugate of the tensor: reverses all fundamental indices.
 
         """
+        return self._replace(_indices=self._conj_indices(), is_conj=not self.is_conj)
 
-        # Don't reverse the generation and adjoint indices
-        dont_reverse = {
-            "generation",
-            "isospin_adjoint",
-            "isospin_4",
-            "colour_adjoint",
-            "colour_6",
-        }
-        dont_reverse = [INDICES[x] for x in dont_reverse]
-
-        reversed_indices = []
-        for i in self.indices:
-            index_type = i[1] if i[0] == "-" else i[0]
-            if index_type in dont_reverse:
-                reversed_indices.append(i)
-            else:
-                reversed_indices.append(raise_lower_index(i))
 
-        conj = deepcopy(self)
-        conj.indices = reversed_indices
-        conj.is_conj = not self.is_conj
-        return conj
+def _all_slots(cls) -> Tuple[str, ...]:
+    """Return the names of the slots of `cls` and its base classes."""
+    slots = []
+    for base in reversed(cls.__mro__):
+        slots += getattr(base, "__slots__", ())
+    return tuple(slots)
+
+
+Tensor._all_slots = _all_slots(Tensor)
 
 
 class Coupling(Tensor):
     """Tensor representing a coupling contant."""
 
+    __slots__ = ("is_complex", "factor")
+
     def __init__(self, *args, is_complex: bool = True, factor: str = "", **kwargs):
         super(Coupling, self).__init__(*args, **kwargs)
-        self.is_field = False
-        self.is_complex = is_complex
+        _setattr(self, "is_field", False)
+        _setattr(self, "is_complex", is_complex)
         # Constant factors that are absorbed in our code compared to the Granada
         # dictionary. Upon export `coupling -> coupling * coupling.factor`.
-        self.factor = factor
+        _setattr(self, "factor", factor)
 
     def get_latex(self) -> str:
+        # Imported here since sympy is slow to import
+        import sympy
+
         factor = sympy.latex(self.factor) if self.factor else ""
         return factor + " " + super(Coupling, self).get_latex()
 
@@ -182,6 +233,8 @@ class Field(Tensor):
 
     """
 
+    __slots__ = ("is_sm", "hypercharge", "is_self_conj")
+
     def __init__(
         self,
         *args,
@@ -191,11 +244,18 @@ class Field(Tensor):
         **kwargs,
     ):
         super(Field, self).__init__(*args, **kwargs)
-        self.is_sm = is_sm
-        self.hypercharge = hypercharge
-        self.is_self_conj = is_self_conj
-        self.wolfram_term_name: str = ""
-        self.mass_label = self.label.removeprefix("Granada")
+        _setattr(self, "is_sm", is_sm)
+        _setattr(self, "hypercharge", hypercharge)
+        _setattr(self, "is_self_conj", is_self_conj)
+
+    @property
+    def mass_label(self) -> str:
+        return self.label.removeprefix("Granada")
+
+    @property
+    def wolfram_term_name(self) -> str:
+        """Name of the free-field Lagrangian in the model file."""
+        return f"LFree{self.label}"
 
     def get_latex(self) -> str:
         # Maybe add dagger to base latex
@@ -221,7 +281,7 @@ class Field(Tensor):
 
         spin_label = str(type(self)).split(".")[-1][0]
 
-        indices = [wolfram_index_map(idx) for idx in self.indices]
+        indices = [idx.wolfram for idx in self._indices]
         indices = [idx for idx in indices if idx != "Index[Spinor]"]
 
         lines = [
@@ -250,6 +310,8 @@ class Fermion(Field):
 
     """
 
+    __slots__ = ("chirality", "is_charge_conj", "is_dirac_adjoint")
+
     def __init__(
         self,
         *args,
@@ -261,10 +323,9 @@ class Fermion(Field):
         super(Fermion, self).__init__(*args, **kwargs)
         # Chirality
         assert chirality in {"L", "R", "D"}
-        self.chirality = chirality
-
-        self.is_charge_conj = is_charge_conj
-        self.is_dirac_adjoint = is_dirac_adjoint
+        _setattr(self, "chirality", chirality)
+        _setattr(self, "is_charge_conj", is_charge_conj)
+        _setattr(self, "is_dirac_adjoint", is_dirac_adjoint)
 
     def get_latex(self) -> str:
         # Maybe add bar or charge conjugate to base latex
@@ -276,42 +337,40 @@ class Fermion(Field):
 
         return super(Field, self).get_latex(base_latex=base_latex)
 
-    def flip_chirality(self) -> None:
-        """Flip the chirality of the fermion by side-effect."""
-        if self.chirality == "R":
-            self.chirality = "L"
-        else:
-            self.chirality = "R"
+    @property
+    def flipped_chirality(self) -> str:
+        """The chirality of the charge conjugate of the fermion."""
+        return "L" if self.chirality == "R" else "R"
 
     @property
     def left(self) -> "Fermion":
         assert self.chirality == "D"
-        other = deepcopy(self)
-        other.chirality = "L"
-        return other
+        return self._replace(chirality="L")
 
     @property
     def right(self) -> "Fermion":
         assert self.chirality == "D"
-        other = deepcopy(self)
-        other.chirality = "R"
-        return other
+        return self._replace(chirality="R")
 
     @property
     def CC(self) -> "Fermion":
         """Lowers only the gauge indices"""
-        conj = self.C
-        conj.is_charge_conj = not self.is_charge_conj
-        conj.flip_chirality()
-        conj.indices[0] = raise_lower_index(conj.indices[0])
-        return conj
+        first, *rest = self._conj_indices()
+        return self._replace(
+            _indices=(first.flipped, *rest),
+            is_conj=not self.is_conj,
+            is_charge_conj=not self.is_charge_conj,
+            chirality=self.flipped_chirality,
+        )
 
     @property
     def bar(self) -> "Fermion":
         """The same as the method `.C` in practice, but toggles `is_dirac_adjoint`."""
-        dirac_adjoint = self.C
-        dirac_adjoint.is_dirac_adjoint = not self.is_dirac_adjoint
-        return dirac_adjoint
+        return self._replace(
+            _indices=self._conj_indices(),
+            is_conj=not self.is_conj,
+            is_dirac_adjoint=not self.is_dirac_adjoint,
+        )
 
     def wolfram(self) -> str:
         label = self.label
@@ -349,11 +408,7 @@ class Fermion(Field):
 
         expr = f"{kinetic} - {mass}"
 
-        # Keep track of name for model file
-        wolfram_term_name = f"LFree{self.label}"
-        self.wolfram_term_name = wolfram_term_name
-
-        return f"{wolfram_term_name} :=\n" + wolfram_block(
+        return f"{self.wolfram_term_name} :=\n" + wolfram_block(
             ["mu"], expr, repl="/.gotoBFM"
         )
 
@@ -370,7 +425,7 @@ class Fermion(Field):
 
         spin_label = str(type(self)).split(".")[-1][0]
 
-        indices = [wolfram_index_map(idx) for idx in self.indices]
+        indices = [idx.wolfram for idx in self._indices]
         indices = [idx for idx in indices if idx != "Index[Spinor]"]
 
         index_label_patterns = [idx + "_" for idx in self.index_labels]
@@ -397,6 +452,8 @@ class Fermion(Field):
 
 
 class Scalar(Field):
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         super(Scalar, self).__init__(*args, **kwargs)
 
@@ -446,11 +503,7 @@ class Scalar(Field):
 
         expr = f"{kinetic} - {mass}"
 
-        # Keep track of name for model file
-        wolfram_term_name = f"LFree{self.label}"
-        self.wolfram_term_name = wolfram_term_name
-
-        return f"{wolfram_term_name} :=\n" + wolfram_block(
+        return f"{self.wolfram_term_name} :=\n" + wolfram_block(
             indices, expr, repl="/.gotoBFM"
         )
 
@@ -459,7 +512,6 @@ def Vector(Tensor):
     pass
 
 
-@dataclass
 class TensorProduct:
     """Class representing a product of tensors. It's use is mostly specialised to
     the case of representing a term in the Lagrangian, i.e. a single coupling
@@ -467,33 +519,110 @@ class TensorProduct:
 
     """
 
+    __slots__ = (
+        "tensors",
+        "couplings",
+        "fields",
+        "exotics",
+        "structures",
+        "_free_indices",
+        "_canonical",
+        "_key",
+        "__weakref__",
+    )
+
     def __init__(self, *tensors):
-        self.tensors = tensors
-        # Filled in when `wolfram` method is called
-        self.wolfram_term_name: str = ""
+        # Products are immutable, so the subcollections of the tensors are only
+        # worked out once
+        _setattr(self, "tensors", tensors)
+        _setattr(self, "couplings", tuple(t for t in tensors if isinstance(t, Coupling)))
+        _setattr(self, "fields", tuple(t for t in tensors if t.is_field))
+        _setattr(
+            self,
+            "exotics",
+            tuple(f for f in self.fields if isinstance(f, Field) and not f.is_sm),
+        )
+        _setattr(
+            self,
+            "structures",
+            tuple(t for t in tensors if not t.is_field and not isinstance(t, Coupling)),
+        )
+        # Filled in when `free_indices` and `canonical` are first accessed
+        _setattr(self, "_free_indices", None)
+        _setattr(self, "_canonical", None)
+        _setattr(self, "_key", None)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} objects are immutable")
 
     @property
     def free_indices(self) -> List[str]:
         """Returns the uncontracted indices of the product."""
-        # Separate upper and lower indices
-        upper, lower = [], []
-        for tensor in self.tensors:
-            for index in tensor.indices:
-                if not index:
-                    continue
-                if index[0] == "-":
-                    lower.append(index[1:])
-                else:
-                    upper.append(index)
-
-        # Make sure indices are not repeated unless contracted correctly
-        assert len(set(upper)) == len(upper)
-        assert len(set(lower)) == len(lower)
-
-        # Convert to sets for difference function
-        upper, lower = set(upper), set(lower)
-
-        return sorted(upper.symmetric_difference(lower))
+        if self._free_indices is None:
+            # Count the occurrences of each index, raised and lowered separately
+            counts = {}
+            for tensor in self.tensors:
+                for index in tensor._indices:
+                    counts[index] = counts.get(index, 0) + 1
+
+            # Make sure indices are not repeated unless contracted correctly
+            assert all(n == 1 for n in counts.values())
+
+            free = sorted(i.label for i in counts if i.flipped not in counts)
+            _setattr(self, "_free_indices", tuple(free))
+
+        return list(self._free_indices)
+
+    @property
+    def canonical(self) -> "TensorProduct":
+        """The product in canonical form. Commuting factors are sorted (couplings,
+        then bosons, then structures), fermions are kept in order after the
+        bosons, and dummy indices are relabelled in order of appearance. Products
+        that differ only in these ways have the same canonical form.
+
+        Ties between factors are broken by what their indices are contracted
+        with, and the orderings of the rest are tried up to `MAX_ORDERINGS`.
+        Beyond that the ties are broken one factor at a time, so two equal
+        products can then have different canonical forms, but only if some
+        factors are alike in shape and contractions without being
+        interchangeable.
+
+        """
+        if self._canonical is None:
+            tensors, key = _canonicalise(self.tensors)
+            canonical = self.__class__(*tensors)
+            for product in [canonical, self]:
+                _setattr(product, "_canonical", canonical)
+                _setattr(product, "_key", key)
+        return self._canonical
+
+    @property
+    def key(self) -> Tuple:
+        """Hashable key of the canonical form, compared by `==`."""
+        if self._key is None:
+            self.canonical
+        return self._key
+
+    @property
+    def stable_hash(self) -> str:
+        """Hash of the canonical form that is the same in every process."""
+        return hashlib.sha256(repr(self.key).encode()).hexdigest()
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, TensorProduct):
+            return NotImplemented
+        return self is other or self.key == other.key
+
+    def __hash__(self) -> int:
+        return hash(self.key)
+
+    @property
+    def wolfram_term_name(self) -> str:
+        """Name of the term in the model file. Terms are labelled by their coupling
+        constants.
+
+        """
+        return "L" + "".join(c.label for c in self.couplings)
 
     @property
     def is_complex(self) -> bool:
@@ -502,6 +631,16 @@ class TensorProduct:
         assert len(couplings) == 1
         return couplings[0].is_complex
 
+    @property
+    def C(self) -> "TensorProduct":
+        """The hermitian conjugate of the product. The order of the tensors is
+        reversed so that fermion chains stay in order.
+
+        """
+        return self.__class__(
+            *(t.bar if isinstance(t, Fermion) else t.C for t in reversed(self.tensors))
+        )
+
     def __mul__(self, other):
         return self.__class__(*self.tensors, *other.tensors)
 
@@ -513,16 +652,13 @@ class TensorProduct:
 
     def wolfram(self):
         output = ""
-        labels = ""
-        indices = set()
+        # Use dictionary keys as ordered set
+        indices = {}
 
-        # Keep track of labels for Lagrangian term and indices for module
+        # Keep track of indices for module
         for t in self.tensors:
-            # Label Lagrangian terms by the couplings constants
-            if isinstance(t, Coupling):
-                labels += t.label
             for i in t.index_labels:
-                indices.add(i)
+                indices[i] = 0
 
             wolfram_ = t.wolfram()
             # For fermion chains, don't add an extra space when exporting
@@ -530,28 +666,7 @@ class TensorProduct:
                 wolfram_ = wolfram_ + " "
             output += wolfram_
 
-        wolfram_term_name = f"L{labels}"
-        self.wolfram_term_name = wolfram_term_name
-
-        return f"{wolfram_term_name} :=\n" + wolfram_block(indices, output.strip())
-
-    @property
-    def couplings(self):
-        return [t for t in self.tensors if isinstance(t, Coupling)]
-
-    @property
-    def fields(self):
-        return [t for t in self.tensors if t.is_field]
-
-    @property
-    def exotics(self):
-        return [f for f in self.fields if not f.is_sm]
-
-    @property
-    def structures(self):
-        return [
-            t for t in self.tensors if not t.is_field and not isinstance(t, Coupling)
-        ]
+        return f"{self.wolfram_term_name} :=\n" + wolfram_block(list(indices), output.strip())
 
     def feynrules_param_entries(self) -> List[str]:
         """Returns a list of strings representing the `M$Parameters` entries in the FeynRules file."""
@@ -559,8 +674,7 @@ class TensorProduct:
         assert len(couplings) == 1
         coupling = couplings[0]
         # The only coupling indices should be generation indices
-        non_trivial_indices = [c for c in coupling.indices if c]
-        coupling_indices = [wolfram_index_map("g")] * len(non_trivial_indices)
+        coupling_indices = [wolfram_index_map("g")] * len(coupling._indices)
         lines = [
             f"{coupling.label} ==",
             "  { ParameterType -> Internal",
@@ -600,6 +714,191 @@ class TensorProduct:
         pass
 
 
+def _signature(tensor: Tensor) -> Tuple:
+    """The attributes of `tensor` that matter for comparing products, other than
+    its indices. The LaTeX form is left out.
+
+    """
+    return (type(tensor).__name__,) + tuple(
+        repr(getattr(tensor, slot))
+        for slot in tensor._all_slots
+        if slot not in {"_indices", "latex"}
+    )
+
+
+def _rank(tensor: Tensor) -> int:
+    if isinstance(tensor, Coupling):
+        return 0
+    if isinstance(tensor, Fermion):
+        return 2
+    return 1 if tensor.is_field else 3
+
+
+def _relabel(tensors: Iterable[Tensor]) -> Tuple[Tensor, ...]:
+    """Relabel the dummy indices of `tensors` in order of appearance, e.g. i0, i1,
+    ... for isospin indices. Free indices and indices of unknown kind are kept.
+
+    """
+    tensors = list(tensors)
+    counts: Dict[Index, int] = {}
+    for tensor in tensors:
+        for index in tensor._indices:
+            counts[index] = counts.get(index, 0) + 1
+    kept = {i.label for i in counts if i.kind is None or i.flipped not in counts}
+
+    new_labels: Dict[str, str] = {}
+    numbers: Dict[IndexKind, int] = {}
+    relabelled = []
+    for tensor in tensors:
+        indices = []
+        for index in tensor._indices:
+            if index.label not in kept and index.label not in new_labels:
+                head = INDEX_HEADS[index.kind]
+                n = numbers.get(index.kind, 0)
+                while head + str(n) in kept:
+                    n += 1
+                numbers[index.kind] = n + 1
+                new_labels[index.label] = head + str(n)
+            label = new_labels.get(index.label, index.label)
+            indices.append(Index.get(("-" if index.is_lowered else "") + label))
+        relabelled.append(tensor._replace(_indices=tuple(indices)))
+    return tuple(relabelled)
+
+
+# Orderings of tied factors tried before breaking the ties one at a time instead
+MAX_ORDERINGS = 720
+
+
+def _ranks(invariants: List) -> List[int]:
+    """Replace each of `invariants` by its position among the distinct ones."""
+    distinct = sorted(set(invariants))
+    return [distinct.index(inv) for inv in invariants]
+
+
+def _refine(tensors: List[Tensor], colours: List[int], dummies: Set[str]) -> List[int]:
+    """Refine the `colours` of `tensors` by the colours of the factors their
+    `dummies` indices are contracted with, until they stop splitting. The
+    result doesn't depend on the order of `tensors`.
+
+    """
+    slots: Dict[str, List[Tuple[int, int]]] = {}
+    for n, tensor in enumerate(tensors):
+        for k, index in enumerate(tensor._indices):
+            if index.label in dummies:
+                slots.setdefault(index.label, []).append((n, k))
+
+    while True:
+        invariants = []
+        for n, tensor in enumerate(tensors):
+            neighbours = tuple(
+                tuple(sorted((colours[m], j) for m, j in slots.get(index.label, []) if (m, j) != (n, k)))
+                for k, index in enumerate(tensor._indices)
+            )
+            invariants.append((colours[n], neighbours))
+        refined = _ranks(invariants)
+        if len(set(refined)) == len(set(colours)):
+            return colours
+        colours = refined
+
+
+def _individualise(tensors: List[Tensor], colours: List[int], dummies: Set[str]) -> List[int]:
+    """Split the ties left in the `colours` of `tensors` one factor at a time,
+    refining after each, until every factor has its own colour. The first
+    factor of the first tied colour is split off, so the result only depends on
+    the order of `tensors` if tied factors aren't interchangeable.
+
+    """
+    while True:
+        tied = sorted(c for c in set(colours) if colours.count(c) > 1)
+        if not tied:
+            return colours
+        first = colours.index(tied[0])
+        colours = [2 * c for c in colours]
+        colours[first] -= 1
+        colours = _refine(tensors, colours, dummies)
+
+
+def _canonicalise(tensors: Tuple[Tensor, ...]) -> Tuple[Tuple[Tensor, ...], Tuple]:
+    """Return the canonical form of the product of `tensors` and its key. See
+    `TensorProduct.canonical`.
+
+    """
+    # Sort the commuting factors by everything but the names of their dummy
+    # indices, refined by what they are contracted with. Fermions all have the
+    # same rank, so they keep their order.
+    def shape(t):
+        if isinstance(t, Fermion):
+            return (_rank(t),)
+        return (_rank(t), _signature(t), tuple((i.kind or 0, i.is_lowered) for i in t._indices))
+
+    tensors = list(tensors)
+    counts: Dict[Index, int] = {}
+    for tensor in tensors:
+        for index in tensor._indices:
+            counts[index] = counts.get(index, 0) + 1
+    dummies = {i.label for i in counts if i.kind is not None and i.flipped in counts}
+    n_fermions = itertools.count()
+    initial = []
+    for t in tensors:
+        # Free indices are part of the shape, and fermions are told apart by order
+        free = tuple("" if i.label in dummies else i.string for i in t._indices)
+        initial.append((shape(t), next(n_fermions) if isinstance(t, Fermion) else -1, free))
+    colours = _refine(tensors, _ranks(initial), dummies)
+
+    def refined_shape(n):
+        t = tensors[n]
+        return (shape(t),) if isinstance(t, Fermion) else (shape(t), colours[n])
+
+    ordered = sorted(range(len(tensors)), key=refined_shape)
+
+    # Factors with the same refined shape could be in any order: try them all
+    # and keep the ordering that comes first once the indices are relabelled
+    groups = [[tensors[n] for n in g] for _, g in itertools.groupby(ordered, key=refined_shape)]
+    n_orderings = math.prod(
+        math.factorial(len(g)) for g in groups if not isinstance(g[0], Fermion)
+    )
+    if n_orderings > MAX_ORDERINGS:
+        # Too many to try, so break the ties instead
+        colours = _individualise(tensors, colours, dummies)
+        candidates = [[tensors[n] for n in sorted(range(len(tensors)), key=refined_shape)]]
+    else:
+        candidates = [
+            [t for part in parts for t in part]
+            for parts in itertools.product(
+                *(
+                    [group] if isinstance(group[0], Fermion) else itertools.permutations(group)
+                    for group in groups
+                )
+            )
+        ]
+
+    best, best_key = None, None
+    for candidate in candidates:
+        relabelled = _relabel(candidate)
+        key = tuple((_signature(t), tuple(i.string for i in t._indices)) for t in relabelled)
+        if best_key is None or key < best_key:
+            best, best_key = relabelled, key
+    return best, best_key
+
+
+def intern_term(term: TensorProduct) -> TensorProduct:
+    """Return the product equal to `term` seen first, so that equal products share
+    one object. Products are only kept while in use elsewhere.
+
+    """
+    return _INTERNED.setdefault(term.key, term)
+
+
+def unique_terms(terms: Iterable[TensorProduct]) -> List[TensorProduct]:
+    """Return `terms` without duplicates, including products that differ only in
+    the order of commuting factors or the names of dummy indices. The first of
+    each is kept. Products with too many alike factors may not be recognised as
+    equal, see `TensorProduct.canonical`.
+
+    """
+    return list(dict.fromkeys(terms))
+
+
 def eps(*indices):
     """Tensor representing antisymmetric symbol"""
 
@@ -627,25 +926,21 @@ def eps(*indices):
     if len(indices) == 3 and kind == INDICES["isospin_adjoint"]:
         label = "fsu2"
 
-    tensor = Tensor(label=label, indices=indices)
-    tensor.latex = r"\epsilon"
-    tensor.is_field = False
+    tensor = Tensor(label=label, indices=indices, latex=r"\epsilon", is_field=False)
     return tensor
 
 def t2244(i0: str, i1: str, Q0: str, Q1: str):
     assert Q0[0] == "-" and Q1[0] == "-"
     label = "T2244"
-    tensor = Tensor(label=label, indices=[i0, i1, Q0, Q1])
-    tensor.latex = r"C_{2244}"
-    tensor.is_field = False
+    tensor = Tensor(
+        label=label, indices=[i0, i1, Q0, Q1], latex=r"C_{2244}", is_field=False
+    )
     return tensor
 
 def eps4(Q0: str, Q1: str):
     assert Q0[0] == "-" and Q1[0] == "-"
     label = "Eps4"
-    tensor = Tensor(label=label, indices=[Q0, Q1])
-    tensor.latex = r"\epsilon"
-    tensor.is_field = False
+    tensor = Tensor(label=label, indices=[Q0, Q1], latex=r"\epsilon", is_field=False)
     return tensor
 
 def delta(i: str, j: str):
@@ -653,9 +948,7 @@ def delta(i: str, j: str):
     assert j[0] == "-" and i[0] != "-"
 
     label = "Delta"
-    tensor = Tensor(label=label, indices=[i, j])
-    tensor.latex = r"\delta"
-    tensor.is_field = False
+    tensor = Tensor(label=label, indices=[i, j], latex=r"\delta", is_field=False)
     return tensor
 
 
@@ -664,9 +957,7 @@ def sigma(I: str, i: str, j: str):
     assert j[0] == "-" and i[0] != "-"
 
     label = "2*Ta"
-    tensor = Tensor(label=label, indices=[I, i, j])
-    tensor.latex = r"\sigma"
-    tensor.is_field = False
+    tensor = Tensor(label=label, indices=[I, i, j], latex=r"\sigma", is_field=False)
     return tensor
 
 
@@ -675,9 +966,7 @@ def lambda_(A: str, a: str, b: str):
     assert b[0] == "-" and a[0] != "-"
 
     label = "2*T"
-    tensor = Tensor(label=label, indices=[A, a, b])
-    tensor.latex = r"\lambda"
-    tensor.is_field = False
+    tensor = Tensor(label=label, indices=[A, a, b], latex=r"\lambda", is_field=False)
     return tensor
 
 
@@ -687,9 +976,9 @@ def c2224(Q: str, i: str, j: str, k: str):
     assert Q[0] == INDICES["isospin_4"] or Q[1] == INDICES["isospin_4"]
 
     label = "C2224"
-    tensor = Tensor(label=label, indices=[Q, i, j, k])
-    tensor.latex = r"C_{2224}"
-    tensor.is_field = False
+    tensor = Tensor(
+        label=label, indices=[Q, i, j, k], latex=r"C_{2224}", is_field=False
+    )
     return tensor
 
 def c344(I: str, Q0: str, Q1: str):
@@ -698,9 +987,7 @@ def c344(I: str, Q0: str, Q1: str):
     assert Q1[0] == INDICES["isospin_4"] or Q1[1] == INDICES["isospin_4"]
 
     label = "C344"
-    tensor = Tensor(label=label, indices=[I, Q0, Q1])
-    tensor.latex = r"C_{344}"
-    tensor.is_field = False
+    tensor = Tensor(label=label, indices=[I, Q0, Q1], latex=r"C_{344}", is_field=False)
     return tensor
 
 
@@ -713,7 +1000,5 @@ def K(X: str, a: str, b: str):
     )
 
     label = "K6"
-    tensor = Tensor(label=label, indices=[X, a, b])
-    tensor.latex = r"K"
-    tensor.is_field = False
+    tensor = Tensor(label=label, indices=[X, a, b], latex=r"K", is_field=False)
     return tensor
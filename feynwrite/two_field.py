@@ -2,10 +2,9 @@
 
 """Defines the terms in the Lagrangian necessary for two-field one-loop graphs of exotic fermions."""
 
-# Depends on: tensor.py, sm.py, granada.py
+# Depends on: tensor.py, sm.py, registry.py, granada.py
 
 from fractions import Fraction
-from sympy import sqrt, I, Rational
 from feynwrite.tensor import (
     Coupling,
     Scalar,
@@ -20,6 +19,7 @@ from feynwrite.tensor import (
     lambda_,
 )
 from feynwrite.sm import L, Q, H, eR, dR, uR
+from feynwrite.registry import TermRegistry
 from feynwrite.granada import (
     N,
     ND,
@@ -38,98 +38,120 @@ from feynwrite.granada import (
     T2,
 )
 
-TWO_FIELD_TERMS = []
+# Terms are only constructed when a model needs them. sympy is imported inside
+# the factories that need it to keep startup fast.
+TWO_FIELD_REGISTRY = TermRegistry()
+
+
+def __getattr__(name):
+    # Build the full list of terms lazily on access to `TWO_FIELD_TERMS`
+    if name == "TWO_FIELD_TERMS":
+        return TWO_FIELD_REGISTRY.terms()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # lambdaNDelta1: Typo in 1711.10391?
-lambdaNDelta1_term = (
-    Coupling("lambdaNDelta1", [], is_complex=True, latex="\\lambda_{N \\Delta_1}")
-    * N("s0").CC.bar
-    * Delta1("s0", "i0").right
-    * H("i1")
-    * eps("-i1", "-i0")
-)
-TWO_FIELD_TERMS.append(lambdaNDelta1_term)
+@TWO_FIELD_REGISTRY.register("GranadaN", "GranadaDelta1")
+def lambdaNDelta1_term():
+    return (
+        Coupling("lambdaNDelta1", [], is_complex=True, latex="\\lambda_{N \\Delta_1}")
+        * N("s0").CC.bar
+        * Delta1("s0", "i0").right
+        * H("i1")
+        * eps("-i1", "-i0")
+    )
 
 # lambdaEDelta1
-lambdaEDelta1_term = (
-    Coupling("lambdaEDelta1", [], is_complex=True, latex="\\lambda_{E \\Delta_1}")
-    * E("s0").left.bar
-    * Delta1("s0", "i0").right
-    * H("i0").C
-)
-TWO_FIELD_TERMS.append(lambdaEDelta1_term)
+@TWO_FIELD_REGISTRY.register("GranadaE", "GranadaDelta1")
+def lambdaEDelta1_term():
+    return (
+        Coupling("lambdaEDelta1", [], is_complex=True, latex="\\lambda_{E \\Delta_1}")
+        * E("s0").left.bar
+        * Delta1("s0", "i0").right
+        * H("i0").C
+    )
 
 # lambdaEDelta3
-lambdaEDelta3_term = (
-    Coupling("lambdaEDelta3", [], is_complex=True, latex="\\lambda_{E \\Delta_3}")
-    * E("s0").left.bar
-    * Delta3("s0", "i0").right
-    * H("i1")
-    * eps("-i1", "-i0")
-)
-TWO_FIELD_TERMS.append(lambdaEDelta3_term)
+@TWO_FIELD_REGISTRY.register("GranadaE", "GranadaDelta3")
+def lambdaEDelta3_term():
+    return (
+        Coupling("lambdaEDelta3", [], is_complex=True, latex="\\lambda_{E \\Delta_3}")
+        * E("s0").left.bar
+        * Delta3("s0", "i0").right
+        * H("i1")
+        * eps("-i1", "-i0")
+    )
 
 # lambdaSigmaDelta1
-lambdaSigmaDelta1_term = (
-    Coupling(
-        "lambdaSigmaDelta1",
-        [],
-        is_complex=True,
-        factor=Rational("1/2"),
-        latex="{\\lambda_{\\Sigma \\Delta_1}}",
+@TWO_FIELD_REGISTRY.register("GranadaSigma", "GranadaDelta1")
+def lambdaSigmaDelta1_term():
+    from sympy import Rational
+
+    return (
+        Coupling(
+            "lambdaSigmaDelta1",
+            [],
+            is_complex=True,
+            factor=Rational("1/2"),
+            latex="{\\lambda_{\\Sigma \\Delta_1}}",
+        )
+        * Sigma("s0", "-I0").CC.bar
+        * Delta1("s0", "i0").right
+        * sigma("I0", "i1", "-i0")
+        * H("i2")
+        * eps("-i2", "-i1")
     )
-    * Sigma("s0", "-I0").CC.bar
-    * Delta1("s0", "i0").right
-    * sigma("I0", "i1", "-i0")
-    * H("i2")
-    * eps("-i2", "-i1")
-)
-TWO_FIELD_TERMS.append(lambdaSigmaDelta1_term)
 
 # lambdaSigma1Delta1
-lambdaSigma1Delta1_term = (
-    Coupling(
-        "lambdaSigma1Delta1",
-        [],
-        is_complex=True,
-        factor=Rational("1/2"),
-        latex="\\lambda_{\\Sigma_1 \\Delta_1}",
+@TWO_FIELD_REGISTRY.register("GranadaSigma1", "GranadaDelta1")
+def lambdaSigma1Delta1_term():
+    from sympy import Rational
+
+    return (
+        Coupling(
+            "lambdaSigma1Delta1",
+            [],
+            is_complex=True,
+            factor=Rational("1/2"),
+            latex="\\lambda_{\\Sigma_1 \\Delta_1}",
+        )
+        * Sigma1("s0", "-I0").left.bar
+        * Delta1("s0", "i0").right
+        * sigma("I0", "i1", "-i0")
+        * H("i1").C
     )
-    * Sigma1("s0", "-I0").left.bar
-    * Delta1("s0", "i0").right
-    * sigma("I0", "i1", "-i0")
-    * H("i1").C
-)
-TWO_FIELD_TERMS.append(lambdaSigma1Delta1_term)
 
 # lambdaSigma1Delta3
-lambdaSigma1Delta3_term = (
-    Coupling(
-        "lambdaSigma1Delta3",
-        [],
-        is_complex=True,
-        factor=Rational("1/2"),
-        latex="\\lambda_{\\Sigma_1 \\Delta_1}",
+@TWO_FIELD_REGISTRY.register("GranadaSigma1", "GranadaDelta3")
+def lambdaSigma1Delta3_term():
+    from sympy import Rational
+
+    return (
+        Coupling(
+            "lambdaSigma1Delta3",
+            [],
+            is_complex=True,
+            factor=Rational("1/2"),
+            latex="\\lambda_{\\Sigma_1 \\Delta_1}",
+        )
+        * Sigma1("s0", "-I0").left.bar
+        * Delta3("s0", "i0").right
+        * sigma("I0", "i1", "-i0")
+        * H("i2")
+        * eps("-i2", "-i1")
     )
-    * Sigma1("s0", "-I0").left.bar
-    * Delta3("s0", "i0").right
-    * sigma("I0", "i1", "-i0")
-    * H("i2")
-    * eps("-i2", "-i1")
-)
-TWO_FIELD_TERMS.append(lambdaSigma1Delta3_term)
 
 ### QUARKS
 
 # lambdaUQ1
-lambdaUQ1_term = (
-    Coupling("lambdaUQ1", [], is_complex=True, latex="\\lambda_{U Q_1}")
-    * U("s0", "c0").left.bar
-    * Q1("s0", "c0", "i0").right
-    * H("i1")
-    * eps("-i1", "-i0")
-)
-TWO_FIELD_TERMS.append(lambdaUQ1_term)
+@TWO_FIELD_REGISTRY.register("GranadaU", "GranadaQ1")
+def lambdaUQ1_term():
+    return (
+        Coupling("lambdaUQ1", [], is_complex=True, latex="\\lambda_{U Q_1}")
+        * U("s0", "c0").left.bar
+        * Q1("s0", "c0", "i0").right
+        * H("i1")
+        * eps("-i1", "-i0")
+    )
 
 # # lambdaUQ1Prime
 # lambdaUQ1Prime_term = (
@@ -148,193 +170,221 @@ TWO_FIELD_TERMS.append(lambdaUQ1_term)
 #### Leptons
 
 # lambda_hat_N_Delta1
-lambda_hat_N_Delta1_term = (
-    Coupling(
-        "lambdaHatNDelta1", [], is_complex=True, latex="\\hat{\\lambda}_{N \\Delta_1}"
+@TWO_FIELD_REGISTRY.register("GranadaN", "GranadaDelta1")
+def lambda_hat_N_Delta1_term():
+    return (
+        Coupling(
+            "lambdaHatNDelta1", [], is_complex=True, latex="\\hat{\\lambda}_{N \\Delta_1}"
+        )
+        * N("s0").right.bar
+        * Delta1("s0", "i0").left
+        * H("i1")
+        * eps("-i0", "-i1")
     )
-    * N("s0").right.bar
-    * Delta1("s0", "i0").left
-    * H("i1")
-    * eps("-i0", "-i1")
-)
-TWO_FIELD_TERMS.append(lambda_hat_N_Delta1_term)
 
 # lambda_hat_E_Delta1
-lambda_hat_E_Delta1_term = (
-    Coupling(
-        "lambdaHatEDelta1", [], is_complex=True, latex="\\hat{\\lambda}_{E \\Delta_1}",
+@TWO_FIELD_REGISTRY.register("GranadaE", "GranadaDelta1")
+def lambda_hat_E_Delta1_term():
+    return (
+        Coupling(
+            "lambdaHatEDelta1", [], is_complex=True, latex="\\hat{\\lambda}_{E \\Delta_1}",
+        )
+        * E("s0").right.bar
+        * Delta1("s0", "i0").left
+        * H("i0").C
     )
-    * E("s0").right.bar
-    * Delta1("s0", "i0").left
-    * H("i0").C
-)
-TWO_FIELD_TERMS.append(lambda_hat_E_Delta1_term)
 
 # lambda_hat_E_Delta3
-lambda_hat_E_Delta3_term = (
-    Coupling(
-        "lambdaHatEDelta3", [], is_complex=True, latex="\\hat{\\lambda}_{E \\Delta_3}",
+@TWO_FIELD_REGISTRY.register("GranadaE", "GranadaDelta3")
+def lambda_hat_E_Delta3_term():
+    return (
+        Coupling(
+            "lambdaHatEDelta3", [], is_complex=True, latex="\\hat{\\lambda}_{E \\Delta_3}",
+        )
+        * E("s0").right.bar
+        * Delta3("s0", "i1").left
+        * H("i0")
+        * eps("-i0", "-i1")
     )
-    * E("s0").right.bar
-    * Delta3("s0", "i1").left
-    * H("i0")
-    * eps("-i0", "-i1")
-)
-TWO_FIELD_TERMS.append(lambda_hat_E_Delta3_term)
 
 # lambda_hat_Sigma_Delta1
-lambda_hat_Sigma_Delta1_term = (
-    Coupling(
-        "lambdaHatSigmaDelta1",
-        [],
-        is_complex=True,
-        factor=Rational("1/2"),
-        latex="\\hat{\\lambda}_{\\Sigma \\Delta_1}",
+@TWO_FIELD_REGISTRY.register("GranadaSigma", "GranadaDelta1")
+def lambda_hat_Sigma_Delta1_term():
+    from sympy import Rational
+
+    return (
+        Coupling(
+            "lambdaHatSigmaDelta1",
+            [],
+            is_complex=True,
+            factor=Rational("1/2"),
+            latex="\\hat{\\lambda}_{\\Sigma \\Delta_1}",
+        )
+        * Sigma("s0", "-I0").right.bar
+        * Delta1("s0", "i4").left
+        * sigma("I0", "i2", "-i4")
+        * H("i3")
+        * eps("-i3", "-i2")
     )
-    * Sigma("s0", "-I0").right.bar
-    * Delta1("s0", "i4").left
-    * sigma("I0", "i2", "-i4")
-    * H("i3")
-    * eps("-i3", "-i2")
-)
-TWO_FIELD_TERMS.append(lambda_hat_Sigma_Delta1_term)
 
 # lambda_hat_Sigma1_Delta1
-lambda_hat_Sigma1_Delta1_term = (
-    Coupling(
-        "lambdaHatSigma1Delta1",
-        [],
-        is_complex=True,
-        latex="\\hat{\\lambda}_{\\Sigma_1 \\Delta_1}",
-        factor=Rational("1/2"),
+@TWO_FIELD_REGISTRY.register("GranadaSigma1", "GranadaDelta1")
+def lambda_hat_Sigma1_Delta1_term():
+    from sympy import Rational
+
+    return (
+        Coupling(
+            "lambdaHatSigma1Delta1",
+            [],
+            is_complex=True,
+            latex="\\hat{\\lambda}_{\\Sigma_1 \\Delta_1}",
+            factor=Rational("1/2"),
+        )
+        * Sigma1("s0", "-I0").right.bar
+        * Delta1("s0", "i0").left
+        * sigma("I0", "i3", "-i0")
+        * H("i3").C
     )
-    * Sigma1("s0", "-I0").right.bar
-    * Delta1("s0", "i0").left
-    * sigma("I0", "i3", "-i0")
-    * H("i3").C
-)
-TWO_FIELD_TERMS.append(lambda_hat_Sigma1_Delta1_term)
 
 # lambda_hat_Sigma1_Delta3
-lambda_hat_Sigma1_Delta3_term = (
-    Coupling(
-        "lambdaHatSigma1Delta3",
-        [],
-        is_complex=True,
-        latex="\\hat{\\lambda}_{\\Sigma_1 \\Delta_3}",
-        factor=Rational("1/2"),
+@TWO_FIELD_REGISTRY.register("GranadaSigma1", "GranadaDelta3")
+def lambda_hat_Sigma1_Delta3_term():
+    from sympy import Rational
+
+    return (
+        Coupling(
+            "lambdaHatSigma1Delta3",
+            [],
+            is_complex=True,
+            latex="\\hat{\\lambda}_{\\Sigma_1 \\Delta_3}",
+            factor=Rational("1/2"),
+        )
+        * Sigma1("s0", "-I0").right.bar
+        * Delta3("s0", "i4").left
+        * sigma("I0", "i2", "-i4")
+        * H("i3")
+        * eps("-i3", "-i2")
     )
-    * Sigma1("s0", "-I0").right.bar
-    * Delta3("s0", "i4").left
-    * sigma("I0", "i2", "-i4")
-    * H("i3")
-    * eps("-i3", "-i2")
-)
-TWO_FIELD_TERMS.append(lambda_hat_Sigma1_Delta3_term)
 
 
 #### Quarks
 
 # lambda_hat_U_Q1
-lambda_hat_U_Q1_term = (
-    Coupling("lambdaHatUQ1", [], is_complex=True, latex="\\hat{\\lambda}_{U Q_1}",)
-    * U("s0", "c0").right.bar
-    * Q1("s0", "c0", "i1").left
-    * H("i0")
-    * eps("-i0", "-i1")
-)
-TWO_FIELD_TERMS.append(lambda_hat_U_Q1_term)
+@TWO_FIELD_REGISTRY.register("GranadaU", "GranadaQ1")
+def lambda_hat_U_Q1_term():
+    return (
+        Coupling("lambdaHatUQ1", [], is_complex=True, latex="\\hat{\\lambda}_{U Q_1}",)
+        * U("s0", "c0").right.bar
+        * Q1("s0", "c0", "i1").left
+        * H("i0")
+        * eps("-i0", "-i1")
+    )
 
 # lambda_hat_U_Q7
-lambda_hat_U_Q7_term = (
-    Coupling("lambdaHatUQ7", [], is_complex=True, latex="\\hat{\\lambda}_{U Q_7}",)
-    * U("s0", "c0").right.bar
-    * Q7("s0", "c0", "i0").left
-    * H("i0").C
-)
-TWO_FIELD_TERMS.append(lambda_hat_U_Q7_term)
+@TWO_FIELD_REGISTRY.register("GranadaU", "GranadaQ7")
+def lambda_hat_U_Q7_term():
+    return (
+        Coupling("lambdaHatUQ7", [], is_complex=True, latex="\\hat{\\lambda}_{U Q_7}",)
+        * U("s0", "c0").right.bar
+        * Q7("s0", "c0", "i0").left
+        * H("i0").C
+    )
 
 # lambda_hat_D_Q1
-lambda_hat_D_Q1_term = (
-    Coupling("lambdaHatDQ1", [], is_complex=True, latex="\\hat{\\lambda}_{D Q_1}",)
-    * D("s0", "c0").right.bar
-    * Q1("s0", "c0", "i0").left
-    * H("i0").C
-)
-TWO_FIELD_TERMS.append(lambda_hat_D_Q1_term)
+@TWO_FIELD_REGISTRY.register("GranadaD", "GranadaQ1")
+def lambda_hat_D_Q1_term():
+    return (
+        Coupling("lambdaHatDQ1", [], is_complex=True, latex="\\hat{\\lambda}_{D Q_1}",)
+        * D("s0", "c0").right.bar
+        * Q1("s0", "c0", "i0").left
+        * H("i0").C
+    )
 
 # lambda_hat_D_Q5
-lambda_hat_D_Q5_term = (
-    Coupling("lambdaHatDQ5", [], is_complex=True, latex="\\hat{\\lambda}_{D Q_5}",)
-    * D("s0", "c0").right.bar
-    * Q5("s0", "c0", "i1").left
-    * H("i0")
-    * eps("-i0", "-i1")
-)
-TWO_FIELD_TERMS.append(lambda_hat_D_Q5_term)
+@TWO_FIELD_REGISTRY.register("GranadaD", "GranadaQ5")
+def lambda_hat_D_Q5_term():
+    return (
+        Coupling("lambdaHatDQ5", [], is_complex=True, latex="\\hat{\\lambda}_{D Q_5}",)
+        * D("s0", "c0").right.bar
+        * Q5("s0", "c0", "i1").left
+        * H("i0")
+        * eps("-i0", "-i1")
+    )
 
 # lambda_hat_T1_Q1
-lambda_hat_T1_Q1_term = (
-    Coupling(
-        "lambdaHatT1Q1",
-        [],
-        is_complex=True,
-        latex="\\hat{\\lambda}_{T_1 Q_1}",
-        factor=Rational("1/2"),
+@TWO_FIELD_REGISTRY.register("GranadaT1", "GranadaQ1")
+def lambda_hat_T1_Q1_term():
+    from sympy import Rational
+
+    return (
+        Coupling(
+            "lambdaHatT1Q1",
+            [],
+            is_complex=True,
+            latex="\\hat{\\lambda}_{T_1 Q_1}",
+            factor=Rational("1/2"),
+        )
+        * T1("s0", "c0", "-I0").right.bar
+        * Q1("s0", "c0", "i0").left
+        * sigma("I0", "i3", "-i0")
+        * H("i3").C
     )
-    * T1("s0", "c0", "-I0").right.bar
-    * Q1("s0", "c0", "i0").left
-    * sigma("I0", "i3", "-i0")
-    * H("i3").C
-)
-TWO_FIELD_TERMS.append(lambda_hat_T1_Q1_term)
 
 # lambda_hat_T1_Q5
-lambda_hat_T1_Q5_term = (
-    Coupling(
-        "lambdaHatT1Q5",
-        [],
-        is_complex=True,
-        latex="\\hat{\\lambda}_{T_1 Q_5}",
-        factor=Rational("1/2"),
+@TWO_FIELD_REGISTRY.register("GranadaT1", "GranadaQ5")
+def lambda_hat_T1_Q5_term():
+    from sympy import Rational
+
+    return (
+        Coupling(
+            "lambdaHatT1Q5",
+            [],
+            is_complex=True,
+            latex="\\hat{\\lambda}_{T_1 Q_5}",
+            factor=Rational("1/2"),
+        )
+        * T1("s0", "c0", "-I0").right.bar
+        * Q5("s0", "c0", "i4").left
+        * sigma("I0", "i2", "-i4")
+        * H("i3")
+        * eps("-i3", "-i2")
     )
-    * T1("s0", "c0", "-I0").right.bar
-    * Q5("s0", "c0", "i4").left
-    * sigma("I0", "i2", "-i4")
-    * H("i3")
-    * eps("-i3", "-i2")
-)
-TWO_FIELD_TERMS.append(lambda_hat_T1_Q5_term)
 
 # lambda_hat_T2_Q1
-lambda_hat_T2_Q1_term = (
-    Coupling(
-        "lambdaHatT2Q1",
-        [],
-        is_complex=True,
-        latex="\\hat{\\lambda}_{T_2 Q_1}",
-        factor=Rational("1/2"),
+@TWO_FIELD_REGISTRY.register("GranadaT2", "GranadaQ1")
+def lambda_hat_T2_Q1_term():
+    from sympy import Rational
+
+    return (
+        Coupling(
+            "lambdaHatT2Q1",
+            [],
+            is_complex=True,
+            latex="\\hat{\\lambda}_{T_2 Q_1}",
+            factor=Rational("1/2"),
+        )
+        * T2("s0", "c0", "-I0").right.bar
+        * Q1("s0", "c0", "i4").left
+        * sigma("I0", "i2", "-i4")
+        * H("i3")
+        * eps("-i3", "-i2")
     )
-    * T2("s0", "c0", "-I0").right.bar
-    * Q1("s0", "c0", "i4").left
-    * sigma("I0", "i2", "-i4")
-    * H("i3")
-    * eps("-i3", "-i2")
-)
-TWO_FIELD_TERMS.append(lambda_hat_T1_Q5_term)
 
 # lambda_hat_T2_Q7
-lambda_hat_T2_Q7_term = (
-    Coupling(
-        "lambdaHatT2Q7",
-        [],
-        is_complex=True,
-        latex="\\hat{\\lambda}_{T_2 Q_7}",
-        factor=Rational("1/2"),
+@TWO_FIELD_REGISTRY.register("GranadaT2", "GranadaQ7")
+def lambda_hat_T2_Q7_term():
+    from sympy import Rational
+
+    return (
+        Coupling(
+            "lambdaHatT2Q7",
+            [],
+            is_complex=True,
+            latex="\\hat{\\lambda}_{T_2 Q_7}",
+            factor=Rational("1/2"),
+        )
+        * T2("s0", "c0", "-I0").right.bar
+        * Q7("s0", "c0", "i0").left
+        * sigma("I0", "i3", "-i0")
+        * H("i3").C
     )
-    * T2("s0", "c0", "-I0").right.bar
-    * Q7("s0", "c0", "i0").left
-    * sigma("I0", "i3", "-i0")
-    * H("i3").C
-)
-TWO_FIELD_TERMS.append(lambda_hat_T2_Q7_term)
@@ -0,0 +1,659 @@
+#!/usr/bin/env python3
+
+"""Export of a model in the Universal FeynRules Output (UFO) format, written
+from the Feynman rules of `vertices.py` instead of by FeynRules.
+
+UFO has no SU(2) structures, so every field is split into its isospin
+components, and the SM fermions into their generations, with the couplings
+expanded to match. Colour structures are kept and written with the UFO colour
+functions. The gauge symmetry is unbroken, so the SM fields are massless, the
+`charge` of a particle is its hypercharge, and there are no gauge bosons or
+gauge interactions. Particles are numbered from `FIRST_PDG_CODE` in the order
+of `Model.fields`.
+
+"""
+
+# Depends on: group.py, vertices.py
+
+import itertools
+import math
+import os
+from dataclasses import dataclass
+from fractions import Fraction
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from feynwrite.group import DIMENSIONS, GROUPS, gauge_indices, gauge_tensor
+from feynwrite.tensor import Fermion, Field, TensorProduct
+from feynwrite.utils import GENERATIONS, IndexKind
+from feynwrite.vertices import Leg, Vertex, vertices
+
+FIRST_PDG_CODE = 9000001
+DEFAULT_MASS = 1000.0
+DEFAULT_COUPLING = 0.1
+# Factors of the vertices are written as fractions times these square roots
+SQUARE_ROOTS = (1, 2, 3, 6)
+MAX_DENOMINATOR = 1000
+ORDER = "NP"
+
+ISOSPIN = GROUPS["SU2"]
+COLOUR = GROUPS["SU3"]
+
+# The UFO colour function and constant factor of each colour structure, by its
+# label in the FeynRules output and whether its first colour index is raised
+COLOUR_FUNCTIONS = {
+    ("2*T", False): ("T", 2),
+    ("T6", False): ("T6", 1),
+    ("fsu3", True): ("f", 1),
+    ("EpsSU3", False): ("EpsilonBar", 1),
+    ("EpsSU3", True): ("Epsilon", 1),
+    ("K6", False): ("K6Bar", 1),
+    ("K6", True): ("K6", 1),
+}
+# UFO orders the indices of the generators as (adjoint, triplet leg, antitriplet
+# leg), the opposite of the raised and lowered indices of our generators
+TRANSPOSED = {"T", "T6"}
+# Symmetric in their last two indices, which are sorted so that equal structures
+# are written the same way
+SYMMETRIC = {"K6", "K6Bar"}
+# Sorted in the same way, with the sign of the permutation
+ANTISYMMETRIC = {"Epsilon", "EpsilonBar", "f"}
+
+# Lorentz structure of a fermion chain by its projector, see `vertices.PROJECTORS`
+LORENTZ_FUNCTIONS = {"PL": "ProjM", "PR": "ProjP", "1": "Identity"}
+
+OBJECT_LIBRARY = '''"""The classes of the objects of the model, as in every UFO model."""
+
+all_particles = []
+all_parameters = []
+all_couplings = []
+all_lorentz = []
+all_vertices = []
+all_orders = []
+all_functions = []
+
+
+class UFOBaseClass(object):
+    require_args = []
+
+    def __init__(self, *args, **options):
+        assert len(args) <= len(self.require_args)
+        options.update(zip(self.require_args, args))
+        for name in self.require_args:
+            assert name in options, "%s is required by %s" % (name, type(self).__name__)
+        for name, value in options.items():
+            setattr(self, name, value)
+
+    def get(self, name):
+        return getattr(self, name)
+
+    def __repr__(self):
+        return self.name
+
+
+class Particle(UFOBaseClass):
+    require_args = ["pdg_code", "name", "antiname", "spin", "color", "mass", "width",
+                    "texname", "antitexname", "charge"]
+
+    def __init__(self, *args, **options):
+        super(Particle, self).__init__(*args, **options)
+        self.selfconjugate = self.name == self.antiname
+        all_particles.append(self)
+
+    def anti(self):
+        if self.selfconjugate:
+            return self
+        color = self.color if self.color in [1, 8] else -self.color
+        return Particle(-self.pdg_code, self.antiname, self.name, self.spin, color,
+                        self.mass, self.width, self.antitexname, self.texname,
+                        -self.charge)
+
+
+class Parameter(UFOBaseClass):
+    require_args = ["name", "nature", "type", "value", "texname"]
+
+    def __init__(self, *args, **options):
+        super(Parameter, self).__init__(*args, **options)
+        all_parameters.append(self)
+
+
+class Coupling(UFOBaseClass):
+    require_args = ["name", "value", "order"]
+
+    def __init__(self, *args, **options):
+        super(Coupling, self).__init__(*args, **options)
+        all_couplings.append(self)
+
+
+class Lorentz(UFOBaseClass):
+    require_args = ["name", "spins", "structure"]
+
+    def __init__(self, *args, **options):
+        super(Lorentz, self).__init__(*args, **options)
+        all_lorentz.append(self)
+
+
+class Vertex(UFOBaseClass):
+    require_args = ["name", "particles", "color", "lorentz", "couplings"]
+
+    def __init__(self, *args, **options):
+        super(Vertex, self).__init__(*args, **options)
+        all_vertices.append(self)
+
+
+class CouplingOrder(UFOBaseClass):
+    require_args = ["name", "expansion_order", "hierarchy"]
+
+    def __init__(self, *args, **options):
+        super(CouplingOrder, self).__init__(*args, **options)
+        all_orders.append(self)
+
+
+class Function(object):
+    def __init__(self, name, arguments, expression):
+        self.name = name
+        self.arguments = arguments
+        self.expr = expression
+        all_functions.append(self)
+
+    def __call__(self, *opt):
+        for i, arg in enumerate(self.arguments):
+            exec("%s = %s" % (arg, opt[i]))
+        return eval(self.expr)
+'''
+
+FUNCTION_LIBRARY = '''"""Functions used in the values of the parameters and couplings."""
+
+import cmath
+
+from .object_library import all_functions, Function
+
+complexconjugate = Function(name="complexconjugate", arguments=("z",), expression="z.conjugate()")
+re = Function(name="re", arguments=("z",), expression="z.real")
+im = Function(name="im", arguments=("z",), expression="z.imag")
+'''
+
+INIT = '''"""UFO model {name}, written by feynwrite."""
+
+from . import particles
+from . import couplings
+from . import lorentz
+from . import parameters
+from . import vertices
+from . import coupling_orders
+from . import function_library
+from . import object_library
+
+all_particles = particles.all_particles
+all_vertices = vertices.all_vertices
+all_couplings = couplings.all_couplings
+all_lorentz = lorentz.all_lorentz
+all_parameters = parameters.all_parameters
+all_orders = coupling_orders.all_orders
+all_functions = function_library.all_functions
+
+gauge = [0]
+
+__author__ = "feynwrite"
+'''
+
+# The imports at the top of each file of objects
+HEADERS = {
+    "parameters": "from . import object_library\nfrom .object_library import Parameter",
+    "particles": (
+        "from . import object_library\nfrom .object_library import Particle\n"
+        "from . import parameters as Param"
+    ),
+    "couplings": (
+        "import cmath\n\nfrom . import object_library\nfrom .object_library import Coupling\n"
+        "from .function_library import complexconjugate"
+    ),
+    "lorentz": "from . import object_library\nfrom .object_library import Lorentz",
+    "vertices": (
+        "from . import object_library\nfrom .object_library import Vertex\n"
+        "from . import particles as P\nfrom . import couplings as C\nfrom . import lorentz as L"
+    ),
+    "coupling_orders": "from . import object_library\nfrom .object_library import CouplingOrder",
+}
+
+
+@dataclass
+class UFOParticle:
+    """The particle of one isospin component and generation of a field."""
+
+    name: str
+    antiname: str
+    pdg_code: int
+    spin: int
+    color: int
+    mass: str
+    charge: Fraction
+
+    @property
+    def variable(self) -> str:
+        return self.name
+
+    @property
+    def anti_variable(self) -> str:
+        return self.name if self.name == self.antiname else self.name + "__tilde__"
+
+
+def _definition(variable: str, cls: str, **attrs) -> str:
+    args = "".join(f"    {name} = {value},\n" for name, value in attrs.items())
+    return f"{variable} = {cls}(\n{args})\n"
+
+
+def _write(directory: str, name: str, definitions: Sequence[str], all_name: str) -> None:
+    with open(os.path.join(directory, f"{name}.py"), "w") as f:
+        f.write(HEADERS[name] + "\n\n")
+        f.write("\n".join(definitions))
+        f.write(f"\n{all_name} = object_library.{all_name}\n")
+
+
+def particle_colour(field: Field) -> int:
+    """The UFO colour representation of the particle of `field`, which may be
+    conjugated."""
+    colour = 1
+    for index in field._indices:
+        if index.kind == IndexKind.COLOUR_ADJOINT:
+            return 8
+        if index.kind in {IndexKind.COLOUR_FUNDAMENTAL, IndexKind.COLOUR_6}:
+            dimension = DIMENSIONS[index.kind]
+            colour = -dimension if index.is_lowered else dimension
+    # A conjugated field carries the conjugate representation of its particle
+    return -colour if colour != 1 and Leg.from_field(field).antiparticle else colour
+
+
+def _components(field: Field) -> Tuple[int, bool]:
+    """The number of isospin components of `field` and whether it has generations."""
+    isospin = [i for i in field._indices if i.kind in ISOSPIN]
+    assert len(isospin) <= 1, f"{field} has more than one isospin index"
+    generations = any(i.kind == IndexKind.GENERATION for i in field._indices)
+    return (DIMENSIONS[isospin[0].kind] if isospin else 1), generations
+
+
+def particle_name(label: str, isospin: Optional[int], generation: Optional[int]) -> str:
+    parts = [label] + [str(n + 1) for n in [isospin, generation] if n is not None]
+    return "_".join(parts)
+
+
+def ufo_particles(fields: Sequence[Field]) -> Dict[Tuple[str, Optional[int], Optional[int]], UFOParticle]:
+    """Return the particle of each component of the `fields`, keyed by the label
+    of the field and the isospin and generation of the component (None if the
+    field has no such index).
+
+    """
+    particles = {}
+    for field in fields:
+        dimension, generations = _components(field)
+        isospins = range(dimension) if dimension > 1 else [None]
+        for isospin, generation in itertools.product(
+            isospins, range(GENERATIONS) if generations else [None]
+        ):
+            name = particle_name(field.label, isospin, generation)
+            particles[field.label, isospin, generation] = UFOParticle(
+                name=name,
+                antiname=name if field.is_self_conj else name + "~",
+                pdg_code=FIRST_PDG_CODE + len(particles),
+                spin=2 if isinstance(field, Fermion) else 1,
+                color=particle_colour(field),
+                mass="ZERO" if field.is_sm else f"M{field.mass_label}",
+                charge=Fraction(field.hypercharge),
+            )
+    return particles
+
+
+def _real(x: float) -> str:
+    """Python code for `x`, as a fraction times a square root if it is one."""
+    for root in SQUARE_ROOTS:
+        q = Fraction(x / math.sqrt(root)).limit_denominator(MAX_DENOMINATOR)
+        if abs(float(q) * math.sqrt(root) - x) > 1e-10:
+            continue
+        sign = "-" if q < 0 else ""
+        numerator = str(abs(q.numerator))
+        if root != 1:
+            numerator = f"cmath.sqrt({root})" if numerator == "1" else f"{numerator}*cmath.sqrt({root})"
+        return sign + numerator + ("" if q.denominator == 1 else f"/{q.denominator}")
+    return repr(x)
+
+
+def _number(value: complex) -> str:
+    """Python code for `value`, with a leading sign only if it is real or imaginary."""
+    re, im = (0.0 if abs(x) < 1e-12 else x for x in (value.real, value.imag))
+    if not im:
+        return _real(re)
+    imaginary = {1: "complex(0,1)", -1: "-complex(0,1)"}.get(im, f"{_real(im)}*complex(0,1)")
+    if not re:
+        return imaginary
+    return f"({_real(re)} + {imaginary})".replace("+ -", "- ")
+
+
+def _leg_order(vertex: Vertex) -> List[int]:
+    """The order of the legs in the UFO vertex: the fermions of each chain, barred
+    first, then the bosons.
+
+    """
+    order = [n for i, j, _ in vertex.contributions[0].chains for n in (i, j)]
+    return order + [n for n in range(len(vertex.legs)) if n not in order]
+
+
+def colour_structure(term: TensorProduct, fields: Sequence[int], order: Sequence[int]) -> Tuple[str, int]:
+    """Return the UFO colour structure of `term` and its constant factor, with
+    the field at position `fields[n]` attached to leg `n`, and the legs in
+    `order`.
+
+    """
+    position = {m: order.index(n) + 1 for n, m in enumerate(fields)}
+    carriers: Dict[str, List[int]] = {}
+    for m, field in enumerate(term.fields):
+        for index in field._indices:
+            if index.kind in COLOUR:
+                carriers.setdefault(index.label, []).append(position[m])
+
+    # Indices summed over between structures are negative
+    internal: Dict[str, int] = {}
+
+    def ufo_index(label: str) -> str:
+        if label in carriers:
+            return str(carriers[label][0])
+        return str(internal.setdefault(label, -len(internal) - 1))
+
+    factors, constant = [], 1
+    for structure in term.structures:
+        indices = gauge_indices(structure, COLOUR)
+        if not indices:
+            continue
+        key = (structure.label, indices[0].is_lowered)
+        if key not in COLOUR_FUNCTIONS:
+            raise ValueError(f"No UFO colour structure for {structure}")
+        function, factor = COLOUR_FUNCTIONS[key]
+        arguments = [ufo_index(i.label) for i in indices]
+        if function in TRANSPOSED:
+            arguments = [arguments[0], arguments[2], arguments[1]]
+        if function in SYMMETRIC:
+            arguments = arguments[:1] + sorted(arguments[1:], key=int)
+        if function in ANTISYMMETRIC:
+            inversions = sum(a > b for a, b in itertools.combinations(map(int, arguments), 2))
+            arguments = sorted(arguments, key=int)
+            constant *= (-1) ** inversions
+        factors.append(f"{function}({','.join(arguments)})")
+        constant *= factor
+
+    # Fields contracted directly with each other
+    for label, legs in carriers.items():
+        if len(legs) == 2:
+            factors.append(f"Identity({','.join(map(str, sorted(legs)))})")
+
+    return ("*".join(factors) or "1"), constant
+
+
+def lorentz_structure(chains, order: Sequence[int]) -> str:
+    """Return the UFO Lorentz structure of the fermion `chains` of a contribution,
+    with the legs in `order`.
+
+    """
+    factors = [
+        f"{LORENTZ_FUNCTIONS[projector]}({order.index(i) + 1},{order.index(j) + 1})"
+        for i, j, projector in chains
+    ]
+    return "*".join(factors) or "1"
+
+
+def coupling_name(label: str, generations: Sequence[int]) -> str:
+    """The name of the parameter for the entry of a coupling with `generations`."""
+    return label + "".join(f"x{g + 1}" for g in generations)
+
+
+def ufo_vertices(terms: Sequence[TensorProduct], particles) -> Dict[Tuple[str, ...], Dict]:
+    """Return the coupling entries and their numerical factors for each colour
+    and Lorentz structure of the vertex of each set of particles. The particles
+    are given by the variables of `particles`, see `ufo_particles`.
+
+    """
+    output: Dict[Tuple[str, ...], Dict[Tuple[str, Tuple[int, ...], str], Dict[str, complex]]] = {}
+    for vertex in vertices(terms):
+        if vertex.vanishes:
+            continue
+
+        term = vertex.term
+        (coupling,) = term.couplings
+        factor = complex(vertex.factor)
+        order = _leg_order(vertex)
+        spins = tuple(2 if vertex.legs[n].fermion else 1 for n in order)
+        isospin, slots = gauge_tensor(term, ISOSPIN)
+        # The positions of the fields with a generation index
+        generation_fields = [
+            n
+            for n, field in enumerate(term.fields)
+            if any(i.kind == IndexKind.GENERATION for i in field._indices)
+        ]
+        # The positions in `order` of identical legs
+        identical: Dict[Leg, List[int]] = {}
+        for position, n in enumerate(order):
+            identical.setdefault(vertex.legs[n], []).append(position)
+
+        for contribution in vertex.contributions:
+            if None in contribution.generations:
+                raise ValueError(f"A generation index of {term} is on no field")
+            fields = contribution.fields
+            isospin_legs = np.transpose(isospin, [slots.index((fields[n], k)) for n, k in slots])
+            colour, colour_factor = colour_structure(term, fields, order)
+            lorentz = lorentz_structure(contribution.chains, order)
+
+            for components in np.ndindex(*isospin_legs.shape):
+                value = contribution.weight * colour_factor * complex(isospin_legs[components])
+                if abs(value) < 1e-12:
+                    continue
+                isospins = {n: c for (n, _), c in zip(slots, components)}
+                for gens in itertools.product(range(GENERATIONS), repeat=len(generation_fields)):
+                    leg_generations = dict(zip(generation_fields, gens))
+                    names = []
+                    for n in order:
+                        field = term.fields[fields[n]]
+                        particle = particles[
+                            field.label, isospins.get(n), leg_generations.get(fields[n])
+                        ]
+                        names.append(
+                            particle.anti_variable if vertex.legs[n].antiparticle else particle.variable
+                        )
+                    # The rule is symmetric in identical legs, so the particles
+                    # on them are only attached in one order
+                    if any(
+                        [names[p] for p in positions] != sorted(names[p] for p in positions)
+                        for positions in identical.values()
+                    ):
+                        continue
+
+                    entry = coupling_name(
+                        coupling.label,
+                        [leg_generations[fields[n]] for n in contribution.generations],
+                    )
+                    if coupling.is_conj:
+                        entry = f"complexconjugate({entry})"
+                    entries = output.setdefault(tuple(names), {}).setdefault(
+                        (colour, spins, lorentz), {}
+                    )
+                    entries[entry] = entries.get(entry, 0) + value * factor
+    return output
+
+
+def coupling_value(entries: Dict[str, complex]) -> str:
+    """The value of a UFO coupling, i times the sum of the `entries` of the
+    couplings times their factors, or an empty string if they cancel.
+
+    """
+    parts = []
+    for entry, value in entries.items():
+        if abs(value) < 1e-12:
+            continue
+        number = _number(value)
+        sign, number = ("- ", number[1:]) if number.startswith("-") else ("+ ", number)
+        parts.append(sign + (entry if number == "1" else f"{number}*{entry}"))
+    if not parts:
+        return ""
+    return "complex(0,1)*(" + " ".join(parts).removeprefix("+ ") + ")"
+
+
+def _parameter(name: str, nature: str, kind: str, value, **options) -> str:
+    return _definition(
+        name,
+        "Parameter",
+        name=repr(name),
+        nature=repr(nature),
+        type=repr(kind),
+        value=repr(value),
+        texname=repr(name),
+        **{option: repr(v) for option, v in options.items()},
+    )
+
+
+def parameter_definitions(model, particles) -> List[str]:
+    """The masses of the particles and the entries of the couplings of `model`.
+    Complex entries are made up of external real and imaginary parts.
+
+    """
+    definitions = [_parameter("ZERO", "internal", "real", "0.0")]
+    masses: Dict[str, int] = {}
+    for particle in particles.values():
+        if particle.mass != "ZERO":
+            masses.setdefault(particle.mass, particle.pdg_code)
+    for mass, pdg_code in masses.items():
+        definitions.append(
+            _parameter(mass, "external", "real", DEFAULT_MASS, lhablock="MASS", lhacode=[pdg_code])
+        )
+
+    for coupling in model.couplings:
+        block = coupling.label.upper()
+        for generations in itertools.product(range(GENERATIONS), repeat=len(coupling._indices)):
+            name = coupling_name(coupling.label, generations)
+            lhacode = [g + 1 for g in generations] or [1]
+            if not coupling.is_complex:
+                definitions.append(
+                    _parameter(name, "external", "real", DEFAULT_COUPLING, lhablock=block, lhacode=lhacode)
+                )
+                continue
+            for prefix, part_block in [("R", block), ("I", "IM" + block)]:
+                definitions.append(
+                    _parameter(
+                        prefix + name,
+                        "external",
+                        "real",
+                        DEFAULT_COUPLING,
+                        lhablock=part_block,
+                        lhacode=lhacode,
+                    )
+                )
+            definitions.append(
+                _parameter(name, "internal", "complex", f"R{name} + complex(0,1)*I{name}")
+            )
+    return definitions
+
+
+def particle_definitions(particles) -> List[str]:
+    definitions = []
+    for particle in particles.values():
+        definitions.append(
+            _definition(
+                particle.variable,
+                "Particle",
+                pdg_code=particle.pdg_code,
+                name=repr(particle.name),
+                antiname=repr(particle.antiname),
+                spin=particle.spin,
+                color=particle.color,
+                mass=f"Param.{particle.mass}",
+                width="Param.ZERO",
+                texname=repr(particle.name),
+                antitexname=repr(particle.antiname),
+                charge=str(particle.charge),
+            )
+        )
+        if particle.anti_variable != particle.variable:
+            definitions.append(f"{particle.anti_variable} = {particle.variable}.anti()\n")
+    return definitions
+
+
+def vertex_definitions(model, particles) -> Tuple[List[str], Dict, Dict]:
+    """Return the definitions of the vertices of `model`, with the names of their
+    Lorentz structures by spins and structure, and of their couplings by value.
+
+    """
+    lorentz: Dict[Tuple[Tuple[int, ...], str], str] = {}
+    couplings: Dict[str, str] = {}
+    definitions = []
+    for names, entries in ufo_vertices(model.terms, particles).items():
+        values = {key: coupling_value(v) for key, v in entries.items()}
+        values = {key: value for key, value in values.items() if value}
+        if not values:
+            continue
+
+        colours = list(dict.fromkeys(colour for colour, _, _ in values))
+        structures = list(dict.fromkeys((spins, structure) for _, spins, structure in values))
+        vertex_couplings = {}
+        for (colour, spins, structure), value in values.items():
+            if (spins, structure) not in lorentz:
+                prefix = "".join("F" if spin == 2 else "S" for spin in spins)
+                number = sum(name.startswith(prefix) for name in lorentz.values()) + 1
+                lorentz[spins, structure] = f"{prefix}{number}"
+            if value not in couplings:
+                couplings[value] = f"GC_{len(couplings) + 1}"
+            key = (colours.index(colour), structures.index((spins, structure)))
+            vertex_couplings[key] = f"C.{couplings[value]}"
+
+        name = f"V_{len(definitions) + 1}"
+        definitions.append(
+            _definition(
+                name,
+                "Vertex",
+                name=repr(name),
+                particles="[" + ", ".join(f"P.{p}" for p in names) + "]",
+                color=repr(colours),
+                lorentz="[" + ", ".join(f"L.{lorentz[s]}" for s in structures) + "]",
+                couplings="{" + ", ".join(f"{k}: {v}" for k, v in vertex_couplings.items()) + "}",
+            )
+        )
+    return definitions, lorentz, couplings
+
+
+def write_ufo(model, directory: str) -> None:
+    """Write the UFO model of `model` to `directory`, see the module docstring."""
+    os.makedirs(directory, exist_ok=True)
+    for name, source in [
+        ("__init__", INIT.format(name=model.name)),
+        ("object_library", OBJECT_LIBRARY),
+        ("function_library", FUNCTION_LIBRARY),
+    ]:
+        with open(os.path.join(directory, f"{name}.py"), "w") as f:
+            f.write(source)
+
+    particles = ufo_particles(model.fields)
+    _write(directory, "parameters", parameter_definitions(model, particles), "all_parameters")
+    _write(directory, "particles", particle_definitions(particles), "all_particles")
+
+    definitions, lorentz, couplings = vertex_definitions(model, particles)
+    _write(directory, "vertices", definitions, "all_vertices")
+    _write(
+        directory,
+        "lorentz",
+        [
+            _definition(name, "Lorentz", name=repr(name), spins=repr(list(spins)), structure=repr(structure))
+            for (spins, structure), name in lorentz.items()
+        ],
+        "all_lorentz",
+    )
+    _write(
+        directory,
+        "couplings",
+        [
+            _definition(name, "Coupling", name=repr(name), value=repr(value), order=repr({ORDER: 1}))
+            for value, name in couplings.items()
+        ],
+        "all_couplings",
+    )
+    _write(
+        directory,
+        "coupling_orders",
+        [_definition(ORDER, "CouplingOrder", name=repr(ORDER), expansion_order=99, hierarchy=1)],
+        "all_orders",
+    )
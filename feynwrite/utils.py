@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 
-from typing import List
-from collections import defaultdict
+import io
+from enum import IntEnum
+from typing import Dict, List, Optional, TextIO, Union
 
 # Conventional index heads
 INDICES = {
@@ -59,6 +60,9 @@ EXTRA_PARAMS = r"""EpsSU3 ==
   , Description -> "Matrices for contracting 4x4x3 of SU(2). Gotten from `RepMatrices[SU2, {3}]` from GroupMath."
   }"""
 
+# Number of generations of SM fermions, the range of the generation indices
+GENERATIONS = 3
+
 
 def index_generator(label: str):
     max_number_indices = 20
@@ -66,10 +70,133 @@ def index_generator(label: str):
         yield label + str(i)
 
 
-def raise_lower_index(idx: str) -> str:
-    if idx[0] == "-":
-        return idx[1:]
-    return "-" + idx
+class IndexKind(IntEnum):
+    LORENTZ = 0
+    COLOUR_FUNDAMENTAL = 1
+    COLOUR_ADJOINT = 2
+    COLOUR_6 = 3
+    SPINOR = 4
+    ISOSPIN_FUNDAMENTAL = 5
+    ISOSPIN_ADJOINT = 6
+    ISOSPIN_4 = 7
+    GENERATION = 8
+
+
+# Kind of an index from the first character of its label
+INDEX_KINDS = {head[0]: IndexKind[kind.upper()] for kind, head in INDICES.items()}
+
+# Order of the index kinds in the SM model file
+SM_INDEX_ORDER = {
+    kind: position
+    for position, kind in enumerate(
+        [
+            IndexKind.LORENTZ,
+            IndexKind.SPINOR,
+            IndexKind.ISOSPIN_ADJOINT,
+            IndexKind.ISOSPIN_FUNDAMENTAL,
+            IndexKind.GENERATION,
+            IndexKind.COLOUR_ADJOINT,
+            IndexKind.COLOUR_6,
+            IndexKind.COLOUR_FUNDAMENTAL,
+            # FIXME C2224 wants isospin_4 index at the end, so fix this way. If we
+            # introduce a 4-plet with colour, this may break.
+            IndexKind.ISOSPIN_4,
+        ]
+    )
+}
+
+WOLFRAM_INDICES = {
+    IndexKind.ISOSPIN_4: "Index[SU24]",
+    IndexKind.ISOSPIN_ADJOINT: "Index[SU2W]",
+    IndexKind.ISOSPIN_FUNDAMENTAL: "Index[SU2D]",
+    IndexKind.GENERATION: "Index[Generation]",
+    IndexKind.COLOUR_ADJOINT: "Index[Gluon]",
+    IndexKind.COLOUR_FUNDAMENTAL: "Index[Colour]",
+    IndexKind.COLOUR_6: "Index[Sextet]",
+    IndexKind.SPINOR: "Index[Spinor]",
+}
+
+
+class Index:
+    """An interned tensor index. Indices are parsed from strings like "-i0" once
+    with `Index.get`, and compared by identity afterwards. `code` packs the id of
+    the label with the lowered bit, so raising and lowering is a bit flip.
+
+    """
+
+    __slots__ = ("code", "label", "kind", "is_lowered", "string")
+
+    # Labels by id, and interned indices by code and by string
+    _labels: List[str] = []
+    _label_ids: Dict[str, int] = {}
+    _by_code: Dict[int, "Index"] = {}
+    _by_string: Dict[str, "Index"] = {}
+
+    def __init__(self, code: int):
+        self.code = code
+        self.label = Index._labels[code >> 1]
+        self.kind: Optional[IndexKind] = INDEX_KINDS.get(self.label[0])
+        self.is_lowered = bool(code & 1)
+        self.string = "-" + self.label if self.is_lowered else self.label
+
+    @classmethod
+    def get(cls, idx: Union[str, "Index"]) -> "Index":
+        """Return the interned index represented by the string `idx`."""
+        if isinstance(idx, Index):
+            return idx
+        try:
+            return cls._by_string[idx]
+        except KeyError:
+            pass
+
+        lowered = idx[0] == "-"
+        label = idx[1:] if lowered else idx
+        if label not in cls._label_ids:
+            cls._label_ids[label] = len(cls._labels)
+            cls._labels.append(label)
+        index = cls.from_code(cls._label_ids[label] << 1 | lowered)
+        cls._by_string[idx] = index
+        return index
+
+    @classmethod
+    def from_code(cls, code: int) -> "Index":
+        if code not in cls._by_code:
+            cls._by_code[code] = cls(code)
+        return cls._by_code[code]
+
+    @property
+    def flipped(self) -> "Index":
+        """The index raised if lowered and lowered if raised."""
+        return Index.from_code(self.code ^ 1)
+
+    @property
+    def wolfram(self) -> str:
+        """The FeynRules index type, e.g. `Index[SU2D]`."""
+        if self.kind not in WOLFRAM_INDICES:
+            raise Exception(f"Unrecognised index {self.string}")
+        return WOLFRAM_INDICES[self.kind]
+
+    def __str__(self) -> str:
+        return self.string
+
+    def __repr__(self) -> str:
+        return f"Index({self.string!r})"
+
+    def __copy__(self) -> "Index":
+        return self
+
+    def __deepcopy__(self, memo) -> "Index":
+        return self
+
+    def __reduce__(self):
+        # Unpickle to the interned index in the receiving process
+        return (Index.get, (self.string,))
+
+
+def raise_lower_index(idx: Union[str, Index]) -> Union[str, Index]:
+    if isinstance(idx, Index):
+        return idx.flipped
+    return Index.get(idx).flipped.string
 
 
 def wolfram_block(indices: List[str], expr: str, repl: str = "") -> str:
@@ -85,60 +212,46 @@ def wolfram_block(indices: List[str], expr: str, repl: str = "") -> str:
 
 def sort_index_labels(index_labels: List[str]) -> List[str]:
     # Index labels shouldn't start with a "-" ever
-    index_dict = defaultdict(list)
-    for i in index_labels:
-        if not i:
-            continue
-        index_dict[i[0]].append(i)
-    # Order in SM model file
     return [
-        *index_dict[INDICES["lorentz"]],
-        *index_dict[INDICES["spinor"]],
-        *index_dict[INDICES["isospin_adjoint"]],
-        *index_dict[INDICES["isospin_fundamental"]],
-        *index_dict[INDICES["generation"]],
-        *index_dict[INDICES["colour_adjoint"]],
-        *index_dict[INDICES["colour_6"]],
-        *index_dict[INDICES["colour_fundamental"]],
-        # FIXME C2224 wants isospin_4 index at the end, so fix this way. If we
-        # introduce a 4-plet with colour, this may break.
-        *index_dict[INDICES["isospin_4"]],
+        index.label for index in sort_indices([Index.get(i) for i in index_labels if i])
     ]
 
 
-def wolfram_index_map(idx: str):
-    correspondance = {
-        "isospin_4": "SU24",
-        "isospin_adjoint": "SU2W",
-        "isospin_fundamental": "SU2D",
-        "generation": "Generation",
-        "colour_adjoint": "Gluon",
-        "colour_fundamental": "Colour",
-        "colour_6": "Sextet",
-        "spinor": "Spinor",
-    }
+def sort_indices(indices) -> List[Index]:
+    """Sort indices by kind in the order of the SM model file. Indices of unknown
+    kind are dropped.
 
-    if idx[0] == "-":
-        idx = idx[1:]
+    """
+    return sorted(
+        (i for i in indices if i.kind is not None), key=lambda i: SM_INDEX_ORDER[i.kind]
+    )
 
-    for k, v in INDICES.items():
-        if v == idx[0]:
-            return f"Index[{correspondance[k]}]"
 
-    raise Exception(f"Unrecognised index {idx}")
+def wolfram_index_map(idx: Union[str, Index]) -> str:
+    return Index.get(idx).wolfram
 
 
 def wolfram_func_call(func: str, indices: List[str]):
     return f"{func}[{','.join(indices)}]"
 
 
+def write_wolfram_list(fp: TextIO, coll, starting_string: str = "") -> None:
+    """Write the items in coll to the file object fp as a Wolfram-language list,
+    one item at a time. An empty collection is written as `{}`.
+
+    """
+    fp.write(starting_string)
+    n = -1
+    for n, item in enumerate(coll):
+        fp.write("{ " if n == 0 else "\n, ")
+        fp.write(item)
+    fp.write("{};\n\n" if n < 0 else "\n};\n\n")
+
+
 def format_wolfram_list(coll, starting_string: str = ""):
-    coll_list = list(coll)
-    coll_list[0] = "{ " + coll_list[0]
-    coll_block = starting_string
-    coll_block += "\n, ".join(coll_list)
-    coll_block += "\n};\n\n"
-    return coll_block
+    buffer = io.StringIO()
+    write_wolfram_list(buffer, coll, starting_string=starting_string)
+    return buffer.getvalue()
 
 def format_latex_eqn(coll, lhs: str = ""):
     output_string = "\\begin{align}\n"
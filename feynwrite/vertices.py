@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+
+"""Feynman rules of the terms of the Lagrangian, worked out without FeynRules.
+They can be used to cross-check the FeynRules output, or to find terms that
+vanish identically before running it.
+
+The vertex of a term has a leg for each field in it, with all particles
+incoming: a field annihilates its particle, and a conjugated field (`.C`,
+`.bar` or `.CC`) its antiparticle. The Feynman rule is i times the sum over
+the ways of attaching identical legs to the fields of the term. Each way is a
+`Contribution` with the gauge structure of the term contracted with the legs
+(see `group.gauge_tensor`), the generation indices of the coupling carried by
+each leg, and the fermion chains joining the legs.
+
+Exchanging the fields of different fermion chains gives a sign. The fields of
+the same chain can also be exchanged using \\bar{ψ} Γ χ = \\bar{χ^c} Γ ψ^c,
+which holds without a sign for the chiral projectors of the terms here, so the
+chain keeps its direction and the contribution its sign.
+
+"""
+
+# Depends on: group.py, tensor.py
+
+import itertools
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from feynwrite.group import gauge_indices, gauge_tensor
+from feynwrite.tensor import Fermion, Field, TensorProduct
+from feynwrite.utils import IndexKind
+
+# Chiral projector between the fields of a chain, by the chirality of the
+# unbarred field
+PROJECTORS = {"L": "PL", "R": "PR", "D": "1"}
+
+
+@dataclass(frozen=True)
+class Leg:
+    """An incoming particle of a vertex. `gauge` are the kinds of its gauge
+    indices, in the order of its axes of the gauge tensors.
+
+    """
+
+    label: str
+    antiparticle: bool
+    fermion: bool
+    gauge: Tuple[IndexKind, ...]
+
+    @classmethod
+    def from_field(cls, field: Field) -> "Leg":
+        return cls(
+            label=field.label,
+            antiparticle=field.is_conj and not field.is_self_conj,
+            fermion=isinstance(field, Fermion),
+            gauge=tuple(i.kind for i in gauge_indices(field)),
+        )
+
+    @property
+    def name(self) -> str:
+        return self.label + ("~" if self.antiparticle else "")
+
+
+@dataclass
+class Contribution:
+    """A term of the Feynman rule: `weight` times the coupling, with its
+    generation indices carried by the legs at positions `generations` (None for
+    an index no leg carries), times the `gauge` tensor and the fermion `chains`.
+    A chain `(i, j, projector)` is \\bar{u}_i projector u_j in terms of the legs.
+    `fields` is the position in `term.fields` of the field attached to each leg,
+    for one of the ways of attaching them that make up the contribution.
+
+    """
+
+    weight: int
+    generations: Tuple[Optional[int], ...]
+    gauge: np.ndarray
+    chains: Tuple[Tuple[int, int, str], ...]
+    fields: Tuple[int, ...]
+
+
+@dataclass
+class Vertex:
+    """The Feynman rule of `term`: i times `factor` times the sum of the
+    `contributions`. The coupling is conjugated in the vertices of the
+    hermitian conjugates of terms.
+
+    """
+
+    term: TensorProduct
+    legs: Tuple[Leg, ...]
+    contributions: List[Contribution]
+
+    @property
+    def coupling(self) -> str:
+        (coupling,) = self.term.couplings
+        return coupling.label + ("bar" if coupling.is_conj else "")
+
+    @property
+    def factor(self):
+        """The constant factor of the coupling, `Coupling.factor`, as a sympy number."""
+        # Imported here since sympy is slow to import
+        import sympy
+
+        (coupling,) = self.term.couplings
+        factor = sympy.sympify(coupling.factor) if coupling.factor else sympy.Integer(1)
+        return factor.conjugate() if coupling.is_conj else factor
+
+    @property
+    def vanishes(self) -> bool:
+        """True if the contributions cancel, so that the term is identically zero."""
+        return not self.contributions
+
+    def __str__(self) -> str:
+        parts = []
+        for c in self.contributions:
+            indices = ",".join("?" if n is None else str(n) for n in c.generations)
+            coupling = f"{self.coupling}[{indices}]" if indices else self.coupling
+            chains = " ".join(f"({i} {projector} {j})" for i, j, projector in c.chains)
+            parts.append(f"{c.weight:+d} {coupling} {chains}".rstrip())
+        legs = " ".join(leg.name for leg in self.legs)
+        rule = " ".join(parts) if parts else "0"
+        return f"{legs}: I*({self.factor})*({rule})"
+
+
+def fermion_chains(term: TensorProduct) -> List[Tuple[int, int, str]]:
+    """Return the fermion chains of `term` as the positions in `term.fields` of
+    the barred and the unbarred field, joined by a spinor index, and the
+    projector between them.
+
+    """
+    spinors: Dict[str, List[int]] = {}
+    for n, field in enumerate(term.fields):
+        for index in field._indices:
+            if index.kind == IndexKind.SPINOR:
+                spinors.setdefault(index.label, []).append(n)
+
+    chains = []
+    for positions in spinors.values():
+        assert len(positions) == 2, f"Spinor index of {term} not contracted in pairs"
+        barred, unbarred = sorted(positions, key=lambda n: not term.fields[n].is_dirac_adjoint)
+        assert term.fields[barred].is_dirac_adjoint and not term.fields[unbarred].is_dirac_adjoint
+        chains.append((barred, unbarred, PROJECTORS[term.fields[unbarred].chirality]))
+    return chains
+
+
+def _parity(permutation: Sequence[int]) -> int:
+    sign, seen = 1, set()
+    for start in range(len(permutation)):
+        n, length = start, 0
+        while n not in seen:
+            seen.add(n)
+            n = permutation[n]
+            length += 1
+        if length and length % 2 == 0:
+            sign = -sign
+    return sign
+
+
+def _assignments(legs: Sequence[Leg]):
+    """Yields the permutations of the positions of the legs that only exchange
+    identical legs."""
+    groups: Dict[Leg, List[int]] = {}
+    for n, leg in enumerate(legs):
+        groups.setdefault(leg, []).append(n)
+
+    groups = list(groups.values())
+    for orderings in itertools.product(*(itertools.permutations(g) for g in groups)):
+        permutation = list(range(len(legs)))
+        for group, ordering in zip(groups, orderings):
+            for n, m in zip(group, ordering):
+                permutation[n] = m
+        yield permutation
+
+
+def vertex(term: TensorProduct) -> Vertex:
+    """Return the Feynman rule of `term`, see the module docstring."""
+    fields = term.fields
+    legs = tuple(Leg.from_field(f) for f in fields)
+    tensor, slots = gauge_tensor(term)
+    chains = fermion_chains(term)
+    fermions = [n for n, leg in enumerate(legs) if leg.fermion]
+
+    # The position of the field carrying each generation index of the coupling
+    (coupling,) = term.couplings
+    carriers = []
+    for index in coupling._indices:
+        carrier = [n for n, f in enumerate(fields) if index.label in f.get_index_labels()]
+        carriers.append(carrier[0] if carrier else None)
+
+    contributions: List[Contribution] = []
+    for permutation in _assignments(legs):
+        # Leg `n` is attached to the field at position `permutation[n]`
+        leg_of = {m: n for n, m in enumerate(permutation)}
+        gauge = np.transpose(tensor, [slots.index((permutation[n], k)) for n, k in slots])
+
+        sign = _parity([fermions.index(permutation[n]) for n in fermions])
+        leg_chains = []
+        for barred, unbarred, projector in chains:
+            i, j = leg_of[barred], leg_of[unbarred]
+            if legs[i] == legs[j] and (i < j) != (barred < unbarred):
+                # The fields of the chain were exchanged, see the module docstring.
+                # Reversing the chain of spinors gives a sign that cancels that of
+                # the exchange.
+                i, j = j, i
+                sign = -sign
+            leg_chains.append((i, j, projector))
+
+        generations = tuple(None if n is None else leg_of[n] for n in carriers)
+        contribution = Contribution(
+            sign, generations, gauge, tuple(sorted(leg_chains)), tuple(permutation)
+        )
+        _add(contributions, contribution)
+
+    return Vertex(term, legs, [c for c in contributions if c.weight])
+
+
+def _add(contributions: List[Contribution], new: Contribution) -> None:
+    """Add `new` to an equal or opposite contribution in `contributions`, or
+    append it.
+
+    """
+    for c in contributions:
+        if c.generations != new.generations or c.chains != new.chains:
+            continue
+        if np.allclose(c.gauge, new.gauge):
+            c.weight += new.weight
+            return
+        if np.allclose(c.gauge, -new.gauge):
+            c.weight -= new.weight
+            return
+    contributions.append(new)
+
+
+def vertices(terms: Sequence[TensorProduct]) -> List[Vertex]:
+    """Return the Feynman rules of `terms`, followed by that of the hermitian
+    conjugate for terms with complex couplings, as added by
+    `Model.export_feynrules`.
+
+    """
+    output = []
+    for term in terms:
+        output.append(vertex(term))
+        if term.is_complex:
+            output.append(vertex(term.C))
+    return output
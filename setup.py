@@ -3,7 +3,7 @@ Automate the production of FeynRules files.
 """
 from setuptools import find_packages, setup
 
-dependencies = ["click", "matchmakereft", "rich"]
+dependencies = ["click", "matchmakereft", "numpy", "rich"]
 
 setup(
     name="feynwrite",
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+
+"""Keep the tests away from the user's cache in `~/.cache/feynwrite`."""
+
+import os
+import shutil
+import tempfile
+
+import pytest
+
+# The default cache directory is read when `feynwrite.cache` is imported, and
+# bound as a default argument in several modules, so it has to be set before
+# the test modules are collected
+CACHE_DIR = tempfile.mkdtemp(prefix="feynwrite-tests-")
+os.environ["FEYNWRITE_CACHE_DIR"] = CACHE_DIR
+
+
+@pytest.fixture(autouse=True, scope="session")
+def cache_dir():
+    from feynwrite.cache import DEFAULT_CACHE_DIR
+
+    assert DEFAULT_CACHE_DIR == CACHE_DIR
+    yield CACHE_DIR
+    shutil.rmtree(CACHE_DIR, ignore_errors=True)
+
+
+@pytest.fixture(autouse=True)
+def decomposition_cache(tmp_path, monkeypatch):
+    """A fresh cache of decompositions for each test, shared by the functions in
+    `lagrangian.py` that default to `DEFAULT_CACHE`."""
+    from feynwrite.decompositions import DB_NAME, DEFAULT_CACHE
+
+    monkeypatch.setattr(DEFAULT_CACHE, "path", str(tmp_path / DB_NAME))
+    monkeypatch.setattr(DEFAULT_CACHE, "_connection", None)
+    yield DEFAULT_CACHE
+    DEFAULT_CACHE.close()
@@ -0,0 +1,14 @@
+#!/usr/bin/env python3
+
+from feynwrite.batch import run_batch
+
+
+def test_run_batch(tmp_path):
+    specs = [["GranadaS"], ["GranadaN", "GranadaE"], ["NotAMultiplet"]]
+    results = run_batch(specs, str(tmp_path), workers=2)
+
+    assert [r.label for r in results] == ["GranadaS", "GranadaN_GranadaE", "NotAMultiplet"]
+    assert results[0].ok and results[1].ok
+    assert not results[2].ok
+    assert (tmp_path / "GranadaS.fr").read_text().startswith('M$ModelName = "GranadaS";')
+    assert (tmp_path / "GranadaN_GranadaE.fr").exists()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+
+import io
+import os
+from datetime import date
+
+import feynwrite.cache
+from feynwrite.cache import ModelCache, cached_export, cached_write, model_hash
+from feynwrite.dictionary import build_model
+
+
+def test_model_hash():
+    model = build_model(["GranadaS"])
+    assert model_hash(model) == model_hash(build_model(["GranadaS"]))
+    assert model_hash(model) != model_hash(model, kind="tex")
+    assert model_hash(model) != model_hash(build_model(["GranadaS1"]))
+
+
+def test_model_hash_source(monkeypatch):
+    # Changing the exporters invalidates the cached files
+    model = build_model(["GranadaS"])
+    before = model_hash(model)
+    monkeypatch.setattr(feynwrite.cache, "source_hash", lambda: "changed")
+    assert model_hash(model) != before
+
+
+def test_cached_write_date(tmp_path):
+    cache = ModelCache(str(tmp_path))
+    model = build_model(["GranadaS"])
+
+    def write_old(fp):
+        fp.write(model.export_feynrules().replace(date.today().isoformat(), "2001-01-01"))
+
+    cached_write(model, "fr", write_old, io.StringIO(), cache)
+    output = io.StringIO()
+    cached_write(model, "fr", model.write_feynrules, output, cache)
+    assert output.getvalue() == model.export_feynrules()
+
+
+def test_cached_export(tmp_path):
+    cache = ModelCache(str(tmp_path))
+    model = build_model(["GranadaS"])
+    calls = []
+
+    def export():
+        calls.append(1)
+        return model.export_feynrules()
+
+    first = cached_export(model, "fr", export, cache)
+    second = cached_export(model, "fr", export, cache)
+    assert first == second
+    assert len(calls) == 1
+
+
+def test_eviction(tmp_path):
+    cache = ModelCache(str(tmp_path), max_bytes=25)
+    cache.put("a", "x" * 10)
+    cache.put("b", "x" * 10)
+    # Make "a" the oldest entry
+    os.utime(cache.path("a"), (0, 0))
+    cache.put("c", "x" * 10)
+
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+    assert cache.get("c") is not None
+
+
+def test_entry_larger_than_cache(tmp_path):
+    cache = ModelCache(str(tmp_path), max_bytes=100)
+    model = build_model(["GranadaS"])
+    for _ in range(2):
+        output = io.StringIO()
+        cached_write(model, "fr", model.write_feynrules, output, cache)
+        assert output.getvalue() == model.export_feynrules()
+
+    # The entry is only evicted to make room for the next one
+    cache.put("other", "x")
+    assert cache.get(feynwrite.cache.cache_key(model, "fr")) is None
+
+
+def test_evicted_before_read(tmp_path, monkeypatch):
+    cache = ModelCache(str(tmp_path))
+    model = build_model(["GranadaS"])
+    cached_write(model, "fr", model.write_feynrules, io.StringIO(), cache)
+
+    # Another process evicts the entry after it is looked up
+    monkeypatch.setattr(cache, "get", lambda key: cache.path("evicted"))
+    output = io.StringIO()
+    cached_write(model, "fr", model.write_feynrules, output, cache)
+    assert output.getvalue() == model.export_feynrules()
+    assert cached_export(model, "fr", model.export_feynrules, cache) == model.export_feynrules()
@@ -14,3 +14,9 @@ def test_cli_with_arg(runner):
     assert result.exception
     assert result.exit_code != 0
     # assert result.output.strip() == "Hello, John."
+
+
+def test_cli_default_command(runner):
+    result = runner.invoke(cli.main, ["GranadaS", "--no-cache"])
+    assert result.exit_code == 0
+    assert result.output.startswith('M$ModelName = "GranadaS";')
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+
+from neutrinomass.tensormethod.sm import H, L
+
+import feynwrite.decompositions as decompositions
+import feynwrite.lagrangian as lagrangian
+from feynwrite.decompositions import FIRST_SINGLET, DecompositionCache, product_key
+
+
+def test_product_key():
+    assert product_key((H, L, H.conj)) == product_key((H.conj, H, L))
+    assert product_key((H, H)) != product_key((H, H.conj))
+
+
+def test_cache_shared(tmp_path):
+    path = str(tmp_path / "decompositions.sqlite")
+    irreps = lagrangian.irreps(H, H, cache=None)
+    with DecompositionCache(path) as cache:
+        assert cache.get_or_compute("irreps", (H, H), lambda: irreps) == irreps
+        assert len(cache) == 1
+
+    # Read back from another connection without computing again
+    with DecompositionCache(path) as cache:
+        assert cache.get_or_compute("irreps", (H, H), lambda: 1 / 0) == irreps
+        assert cache.get_many(FIRST_SINGLET, [product_key((H, H))]) == {}
+
+
+def test_version_change(tmp_path, monkeypatch):
+    path = str(tmp_path / "decompositions.sqlite")
+    with DecompositionCache(path) as cache:
+        cache.put_many(FIRST_SINGLET, [(product_key((H, H.conj)), None)])
+        assert len(cache) == 1
+
+    monkeypatch.setattr(decompositions, "neutrinomass_version", lambda: "0.0.0")
+    with DecompositionCache(path) as cache:
+        assert len(cache) == 0
+
+
+def test_screen_products(tmp_path, monkeypatch):
+    cache = DecompositionCache(str(tmp_path / "decompositions.sqlite"))
+    candidates = [(H, H.conj), (H.conj, H), (H, L)]
+    monkeypatch.setattr(lagrangian, "SINGLET_MEMO", {})
+    first = list(lagrangian.screen_products(candidates, workers=1, cache=cache))
+    assert len(first) == 2
+
+    # A new process finds the decompositions on disk
+    monkeypatch.setattr(lagrangian, "SINGLET_MEMO", {})
+    monkeypatch.setattr(lagrangian, "first_singlet", lambda combo: 1 / 0)
+    assert list(lagrangian.screen_products(candidates, workers=1, cache=cache)) == first
+    cache.close()
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+
+import itertools
+
+from feynwrite.dictionary import FERMIONS, SCALARS, VALID_MULTIPLETS, build_model, select_terms
+from feynwrite.granada import TERMS
+from feynwrite.two_field import TWO_FIELD_TERMS
+
+
+def linear_scan(multiplets):
+    terms = TERMS + TWO_FIELD_TERMS if len(multiplets) > 1 else TERMS
+    return [t for t in terms if all(f.label in multiplets for f in t.exotics)]
+
+
+def test_select_terms():
+    specs = [
+        [m] for m in VALID_MULTIPLETS
+    ] + [
+        list(pair) for pair in itertools.combinations(FERMIONS, 2)
+    ] + [
+        SCALARS,
+        FERMIONS,
+        sorted(VALID_MULTIPLETS),
+    ]
+    for spec in specs:
+        # Compare by identity since terms are memoised
+        assert [id(t) for t in select_terms(spec)] == [id(t) for t in linear_scan(spec)]
+
+
+def test_two_field_terms():
+    labels = [t.couplings[0].label for t in build_model(["GranadaT2", "GranadaQ1"]).terms]
+    assert labels.count("lambdaHatT2Q1") == 1
+    assert "lambdaHatT1Q5" not in labels
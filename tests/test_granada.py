@@ -7,3 +7,25 @@ def test_indices():
     for term in TERMS:
         assert not term.free_indices
         assert term.sum_hypercharges() == 0
+
+
+def test_gauge_invariance():
+    from feynwrite.group import is_gauge_invariant
+    from feynwrite.two_field import TWO_FIELD_TERMS
+
+    failing = {
+        term.couplings[0].label
+        for term in TERMS + TWO_FIELD_TERMS
+        if not is_gauge_invariant(term)
+    }
+    # These contract two raised quadruplet indices, see `test_indices`
+    assert failing == {"lambdaHatTheta1", "lambdaHatTheta3"}
+
+
+def test_registry_keys():
+    from feynwrite.granada import REGISTRY
+    from feynwrite.two_field import TWO_FIELD_REGISTRY
+
+    for registry in [REGISTRY, TWO_FIELD_REGISTRY]:
+        for n, exotics in enumerate(registry.keys):
+            assert {f.label for f in registry.build(n).exotics} == exotics
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+
+import os
+import re
+
+import numpy as np
+
+from feynwrite.dictionary import build_model
+from feynwrite.granada import TERMS
+from feynwrite.group import gauge_structures
+from feynwrite.model import Model
+
+MM_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "mm")
+
+
+def symm_rules(text: str):
+    return set(re.findall(r"(\w+\[g0_,g1_\] -> -?\w+\[g1,g0\])", text))
+
+
+def test_symm_matches_granada():
+    with open(os.path.join(MM_DIR, "granada.symm")) as f:
+        expected = symm_rules(f.read())
+
+    generated = symm_rules(Model("all", TERMS).export_symm())
+
+    # yUpsilon is symmetric, but was missing from the hand-written file
+    upsilon = {
+        "yUpsilon[g0_,g1_] -> yUpsilon[g1,g0]",
+        "yUpsilonbar[g0_,g1_] -> yUpsilonbar[g1,g0]",
+    }
+    assert generated == expected | upsilon
+
+
+def test_symm_per_model():
+    assert build_model(["GranadaS1"]).export_symm() == (
+        "listareplacesymmetry =\n"
+        "{ yS1[g0_,g1_] -> -yS1[g1,g0]\n"
+        ", yS1bar[g0_,g1_] -> -yS1bar[g1,g0]\n"
+        "}\n"
+    )
+    assert build_model(["GranadaS"]).export_symm() == "listareplacesymmetry = {}\n"
+
+
+def sparse_arrays(text: str):
+    """Parse the SparseArrays of a `.gauge` file into numerical arrays by name."""
+    arrays = {}
+    pattern = (
+        r"(\w+) -> SparseArray\[Automatic, \{([\d, ]+)\}, 0, "
+        r"\{1, \{\{([\d, ]+)\}, \{(.*?)\}\}, \{(.*?)\}\}\]"
+    )
+    for name, shape, pointers, columns, values in re.findall(pattern, text):
+        # Only the first definition counts
+        if name in arrays:
+            continue
+        shape = tuple(int(n) for n in shape.split(","))
+        pointers = [int(n) for n in pointers.split(",")]
+        columns = [
+            tuple(int(i) - 1 for i in c.split(",")) for c in re.findall(r"\{([\d, ]+)\}", columns)
+        ]
+        values = [
+            complex(eval(v.replace("Sqrt", "np.sqrt").replace("[", "(").replace("]", ")")
+                    .replace("^", "**").replace("I", "1j")))
+            for v in re.split(r",\s*(?![^\[]*\])", values)
+        ]
+
+        array = np.zeros(shape, dtype=complex)
+        for row in range(shape[0]):
+            for k in range(pointers[row], pointers[row + 1]):
+                array[(row, *columns[k])] = values[k]
+        arrays[name] = array
+    return arrays
+
+
+def test_gauge_matches_granada():
+    with open(os.path.join(MM_DIR, "granada.gauge")) as f:
+        expected = sparse_arrays(f.read())
+
+    structures = gauge_structures()
+    assert list(structures) == list(expected)
+    generated = sparse_arrays(
+        "\n".join(f"{name} -> {s.sparse_array()}" for name, s in structures.items())
+    )
+
+    # The hand-written file has the unconjugated arrays for these
+    for name in ["C344bar", "T6bar"]:
+        assert np.allclose(expected[name], expected[name[:-3]])
+        assert np.allclose(generated[name], expected[name[:-3]].conj())
+        del expected[name]
+
+    for name, array in expected.items():
+        assert np.allclose(generated[name], array), name
+        assert np.allclose(structures[name].array(), array), name
+
+
+def test_gauge_cache(tmp_path):
+    computed = gauge_structures.__wrapped__(str(tmp_path))
+    assert len(os.listdir(tmp_path)) == 1
+    assert gauge_structures.__wrapped__(str(tmp_path)) == computed
+
+
+def test_gauge_per_model():
+    sm = ["fsu2", "Ta", "Tabar", "fsu3", "T", "Tbar", "antiT"]
+    names = re.findall(r"(\w+) -> SparseArray", build_model(["GranadaS1"]).export_gauge())
+    assert names == sm
+
+    # The sextet needs its generators as well as the Clebsch-Gordan coefficients
+    names = re.findall(r"(\w+) -> SparseArray", build_model(["GranadaOmega1"]).export_gauge())
+    assert names == sm + ["K6", "K6bar", "T6", "T6bar"]
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+
+from feynwrite.granada import TERMS, S, N, varphi
+from feynwrite.hermiticity import DOUBLE_COUNTED, MISSING, check_hermiticity
+from feynwrite.sm import H, L
+from feynwrite.tensor import Coupling, eps, sigma
+from feynwrite.two_field import TWO_FIELD_TERMS
+
+
+def yukawa(is_complex=True):
+    return (
+        Coupling("lambdaN", ["-g0"], is_complex=is_complex)
+        * N("s0").right.bar
+        * L("s0", "i0", "g0")
+        * eps("-i0", "-i1")
+        * H("i1")
+    )
+
+
+def test_terms_hermitian():
+    assert check_hermiticity(TERMS + TWO_FIELD_TERMS) == []
+
+
+def test_conj():
+    term = yukawa()
+    assert repr(term.C) == "Phi(-i1)*Eps(i0,i1)*LL(-s0,-i0,g0)*GranadaN(s0)*lambdaN(-g0)"
+    assert repr(term.C.C) == repr(term)
+
+
+def test_problems():
+    (missing,) = check_hermiticity([yukawa(is_complex=False)])
+    assert missing.kind == MISSING
+
+    portal = Coupling("kappaS", []) * S() * H("i0").C * H("i0")
+    (double,) = check_hermiticity([portal])
+    assert double.kind == DOUBLE_COUNTED and double.other is None
+
+    # The conjugate of a complex term written out as well
+    conjugate = (
+        Coupling("lambdaNbar", ["-g0"])
+        * H("i1").C
+        * eps("i0", "i1")
+        * L("s0", "i0", "g0").bar
+        * N("s0").right
+    )
+    problems = check_hermiticity([yukawa(), conjugate])
+    assert [p.kind for p in problems] == [DOUBLE_COUNTED, DOUBLE_COUNTED]
+    assert problems[0].other is conjugate
+
+
+def test_different_contractions():
+    # The conjugate of the first term has the same fields as the second, but
+    # they are contracted differently, so neither is counted twice
+    first = Coupling("a", []) * varphi("i0").C * H("i0") * H("i1").C * H("i1")
+    second = (
+        Coupling("b", [])
+        * H("i0").C
+        * sigma("I0", "i0", "-i1")
+        * varphi("i1")
+        * H("i2").C
+        * sigma("-I0", "i2", "-i3")
+        * H("i3")
+    )
+    assert check_hermiticity([first, second]) == []
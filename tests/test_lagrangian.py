@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+
+import itertools
+from collections import Counter
+
+from neutrinomass.completions.core import VectorLikeDiracFermion
+from neutrinomass.tensormethod.sm import H, L, Q, eb, ub
+from sympy import Rational
+
+from feynwrite.lagrangian import (
+    GRANADA_FIELDS,
+    SCREENS,
+    first_singlet,
+    irreps,
+    neutral_combinations,
+    one_loop_scalar_terms,
+    screen_pairs,
+)
+
+
+def test_screens():
+    fields = (H, L, eb, Q, ub)
+    fields += tuple(f.conj for f in fields)
+    counts = {}
+    kept = list(neutral_combinations(fields, 3, counts=counts))
+
+    combos = list(itertools.combinations_with_replacement(fields, 3))
+    assert set(counts) == set(SCREENS)
+    assert len(kept) + sum(counts.values()) == len(combos)
+    assert counts["lorentz"] > 0
+
+    # Only combinations without a singlet are removed
+    for combo in combos:
+        if combo not in kept:
+            assert first_singlet(combo) is None, combo
+
+
+def test_screen_pairs():
+    fields = {f for f in GRANADA_FIELDS if f.field.label in {"S1", "S2", "varphi", "Xi1"}}
+    fields |= {f.conj for f in fields}
+    counts = {}
+    pairs = {
+        tuple(sorted(f.field.label for f in pair))
+        for pair in screen_pairs(fields, 1, {0, 2}, counts=counts)
+    }
+    assert ("varphi", "varphi") in pairs
+    assert ("S1", "S2") in pairs
+    assert ("S1", "S1") not in pairs
+    assert set(counts) == {"hypercharge", "colour", "isospin"}
+
+
+def old_one_loop_scalar_terms(fields):
+    """`one_loop_scalar_terms` as it was before the combinations were streamed."""
+    fields = {*fields, *[f.dirac_partner() for f in fields if isinstance(f, VectorLikeDiracFermion)]}
+    fields = {*fields, *[f.conj for f in fields]}
+
+    combos = list(itertools.combinations_with_replacement(fields, 2))
+    quartic_coupling, cubic_coupling = [], []
+    models_that_need_work = set()
+    while combos:
+        combo = combos.pop(0)
+        f1, f2 = combo
+        if abs(f1.charges["y"] + f2.charges["y"]) == Rational("1/2"):
+            for irrep in f1.field * f2.field:
+                if irrep.colour_irrep == (0, 0) and irrep.isospin_irrep == (1,):
+                    cubic_coupling.append(combo)
+                    models_that_need_work.add(f"{f1.field.label} {f2.field.label}")
+        if abs(f1.charges["y"] + f2.charges["y"]) == 1:
+            for irrep in f1.field * f2.field:
+                if irrep.colour_irrep == (0, 0) and irrep.isospin_irrep in {(0,), (2,)}:
+                    quartic_coupling.append(combo)
+                    models_that_need_work.add(f"{f1.field.label} {f2.field.label}")
+
+    return models_that_need_work, cubic_coupling, quartic_coupling
+
+
+def test_one_loop_scalar_terms():
+    models, *couplings = one_loop_scalar_terms(GRANADA_FIELDS, cache=None)
+    old_models, *old_couplings = old_one_loop_scalar_terms(GRANADA_FIELDS)
+
+    # The order of the fields in a pair depends on the order of the set
+    def unordered(pairs):
+        return Counter(frozenset(pair) for pair in pairs)
+
+    assert {frozenset(m.split()) for m in models} == {frozenset(m.split()) for m in old_models}
+    for new, old in zip(couplings, old_couplings):
+        assert old and unordered(new) == unordered(old)
+
+
+def test_one_loop_scalar_terms_screened():
+    counts = {}
+    _, cubic, quartic = one_loop_scalar_terms(GRANADA_FIELDS, cache=None, counts=counts)
+    assert set(counts) == {"hypercharge", "colour", "isospin"}
+    assert all(counts.values())
+
+    # Every pair, decomposed without screening
+    fields = {*GRANADA_FIELDS, *[f.dirac_partner() for f in GRANADA_FIELDS if isinstance(f, VectorLikeDiracFermion)]}
+    fields |= {f.conj for f in fields}
+    unscreened = {Rational("1/2"): [], 1: []}
+    for combo in itertools.combinations_with_replacement(fields, 2):
+        for irrep in irreps(combo[0].field, combo[1].field, cache=None):
+            y = abs(irrep.charges["y"])
+            if irrep.colour_irrep != (0, 0) or y not in unscreened:
+                continue
+            if irrep.isospin_irrep in ({(1,)} if y == Rational("1/2") else {(0,), (2,)}):
+                unscreened[y].append(combo)
+
+    assert Counter(map(frozenset, cubic)) == Counter(map(frozenset, unscreened[Rational("1/2")]))
+    assert Counter(map(frozenset, quartic)) == Counter(map(frozenset, unscreened[1]))
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import subprocess
+import time
+
+from feynwrite.matching import (
+    GAMMA5,
+    OK,
+    PROBLEMS,
+    TIMEOUT,
+    classify_problems,
+    match_models,
+    write_summary,
+)
+from feynwrite.results import ResultStore
+
+
+class StubBackend:
+    """Stands in for matchmakereft, writing the files it would produce."""
+
+    def __init__(self, problems: str = "problist = {}", delay: float = 0.0, results: str = "MS^2 kappaS"):
+        self.problems = problems
+        self.delay = delay
+        self.results = results
+
+    def create_model(self, args: str) -> None:
+        sm, fr = args.split()
+        assert os.path.exists(fr) and os.path.exists(fr.replace(".fr", ".symm"))
+        assert os.path.exists(fr.replace(".fr", ".gauge"))
+        os.mkdir(fr.replace(".fr", "_MM"))
+
+    def match_model_to_eft(self, args: str) -> None:
+        time.sleep(self.delay)
+        model, _ = args.split()
+        with open(os.path.join(model, "MatchingProblems.dat"), "w") as f:
+            f.write(self.problems)
+        with open(os.path.join(model, "MatchingResult.dat"), "w") as f:
+            f.write(self.results)
+
+
+def test_classify_problems():
+    assert classify_problems("problist = {}\n") == OK
+    assert classify_problems("problist = {ee}") == GAMMA5
+    assert classify_problems("problist = {x}") == PROBLEMS
+
+
+def test_match_models(tmp_path):
+    specs = [["GranadaS"], ["GranadaN", "GranadaE"], ["NotAMultiplet"]]
+    results = match_models(specs, str(tmp_path), backend=StubBackend(), workers=2)
+
+    assert [r.status for r in results] == [OK, OK, "error"]
+    assert results[0].mass_found and not results[1].mass_found
+    assert (tmp_path / "GranadaS" / "GranadaS.fr").exists()
+
+    write_summary(results, str(tmp_path / "summary.json"))
+    summary = json.loads((tmp_path / "summary.json").read_text())
+    assert summary["counts"] == {OK: 2, "error": 1}
+
+
+def test_mass_found(tmp_path):
+    specs = [["GranadaN", "GranadaE"], ["GranadaN", "GranadaE"]]
+    first, second = match_models(
+        specs[:1], str(tmp_path), backend=StubBackend(results="MN^2 ME^2")
+    ) + match_models(specs[1:], str(tmp_path), backend=StubBackend(results="MN^2 MEx"))
+    assert first.mass_found
+    assert not second.mass_found
+
+
+class KernelBackend(StubBackend):
+    """Starts a process that outlives the matching, like the Mathematica kernel."""
+
+    def match_model_to_eft(self, args: str) -> None:
+        kernel = subprocess.Popen(["sleep", "60"])
+        with open("kernel.pid", "w") as f:
+            f.write(str(kernel.pid))
+        time.sleep(60)
+
+
+def test_match_timeout_kills_kernel(tmp_path):
+    (result,) = match_models([["GranadaS"]], str(tmp_path), backend=KernelBackend(), timeout=5)
+    assert result.status == TIMEOUT
+
+    pid = int((tmp_path / "GranadaS" / "kernel.pid").read_text())
+    # The killed kernel is reaped by init, so give it a moment
+    for _ in range(50):
+        if not _alive(pid):
+            break
+        time.sleep(0.1)
+    assert not _alive(pid)
+
+
+def _alive(pid: int) -> bool:
+    """True unless the process `pid` is gone or a zombie."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except FileNotFoundError:
+        return False
+
+
+def test_match_timeout(tmp_path):
+    (result,) = match_models(
+        [["GranadaS"]], str(tmp_path), backend=StubBackend(delay=10), timeout=0.5, retries=1
+    )
+    assert result.status == TIMEOUT
+    assert result.attempts == 2
+
+
+def test_result_store(tmp_path):
+    specs = [["GranadaS"], ["GranadaE"]]
+    with ResultStore(str(tmp_path / "matching.sqlite")) as store:
+        first = match_models(
+            specs, str(tmp_path), backend=StubBackend(problems="problist = {x}"), store=store
+        )
+        assert not any(r.reused for r in first)
+
+        # Unchanged inputs aren't matched again
+        second = match_models(specs, str(tmp_path), backend=StubBackend(), store=store)
+        assert all(r.reused for r in second)
+        assert [r.status for r in second] == [PROBLEMS, PROBLEMS]
+
+        third = match_models(specs, str(tmp_path), backend=StubBackend(), store=store, reuse=False)
+        assert [r.status for r in third] == [OK, OK]
+
+        assert len(store.query()) == 2
+        assert not store.query(statuses=[PROBLEMS])
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+
+import os
+import subprocess
+import sys
+
+EXPORT_ALL = """
+from feynwrite.dictionary import build_model, VALID_MULTIPLETS
+print(build_model(sorted(VALID_MULTIPLETS)).export_feynrules())
+"""
+
+
+def test_export_feynrules_deterministic():
+    outputs = set()
+    for seed in ["0", "1", "2", "12345"]:
+        env = {**os.environ, "PYTHONHASHSEED": seed}
+        result = subprocess.run(
+            [sys.executable, "-c", EXPORT_ALL],
+            env=env,
+            capture_output=True,
+            check=True,
+        )
+        outputs.add(result.stdout)
+
+    assert len(outputs) == 1
+
+
+def test_write_feynrules():
+    from io import StringIO
+    from feynwrite.dictionary import build_model
+
+    model = build_model(["GranadaN", "GranadaE"])
+    buffer = StringIO()
+    model.write_feynrules(buffer)
+
+    assert buffer.getvalue() == model.export_feynrules()
+    assert buffer.getvalue().endswith(";\n")
+
+
+def test_model_without_terms():
+    import pytest
+    from feynwrite.dictionary import build_model
+
+    with pytest.raises(ValueError, match="no terms"):
+        build_model(["GranadaND"]).export_feynrules()
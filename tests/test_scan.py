@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+
+from feynwrite.dictionary import SCALARS, FERMIONS
+import json
+from datetime import date
+
+import pytest
+
+from feynwrite.batch import BatchResult, export_model, file_sha256
+from feynwrite.scan import (
+    enumerate_models,
+    find_gaps,
+    is_conflicting,
+    is_connected,
+    manifest_entry,
+    merge_manifests,
+    parse_shard,
+    read_manifest,
+    scan,
+    shard_models,
+)
+
+
+def test_is_connected():
+    links = [frozenset({"A", "B"}), frozenset({"B", "C"})]
+    assert is_connected(["A"], links)
+    assert is_connected(["A", "B", "C"], links)
+    assert not is_connected(["A", "C"], links)
+
+
+def test_enumerate_models():
+    models = list(enumerate_models(2))
+    singles = [m for m in models if len(m) == 1]
+    pairs = [m for m in models if len(m) == 2]
+
+    assert len(singles) == len(SCALARS + FERMIONS)
+    assert ["GranadaN", "GranadaDelta1"] in pairs
+    # No scalars are linked to other multiplets by the two-field terms
+    assert not any(f in SCALARS for pair in pairs for f in pair)
+
+
+def test_scan_resume(tmp_path):
+    models = [["GranadaS"], ["GranadaN", "GranadaE"], ["NotAMultiplet"]]
+    results = scan(models, str(tmp_path), workers=2)
+    assert len(results) == 3
+
+    manifest = read_manifest(str(tmp_path / "manifest.jsonl"))
+    assert set(manifest) == {"GranadaS", "GranadaN_GranadaE", "NotAMultiplet"}
+    assert manifest["NotAMultiplet"]["error"]
+
+    # Only the failed model is attempted again
+    results = scan(models, str(tmp_path), workers=2)
+    assert [r.label for r in results] == ["NotAMultiplet"]
+
+
+def test_shards():
+    models = list(enumerate_models(2))
+    shards = [shard_models(models, k, 3) for k in range(1, 4)]
+    assert sorted(m for shard in shards for m in shard) == sorted(models)
+
+    assert parse_shard("2/3") == (2, 3)
+    for bad in ["0/3", "4/3", "2"]:
+        with pytest.raises(ValueError):
+            parse_shard(bad)
+
+
+def test_merge_manifests(tmp_path):
+    def write(name, entries):
+        path = tmp_path / name
+        path.write_text("".join(json.dumps(e) + "\n" for e in entries))
+        return str(path)
+
+    def entry(model, sha256, error=""):
+        return {"model": model, "path": "", "seconds": 0, "error": error, "sha256": sha256}
+
+    first = write("1.jsonl", [entry("A", "x"), entry("B", "", error="Exception")])
+    second = write("2.jsonl", [entry("B", "y"), entry("A", "z")])
+    entries, duplicates = merge_manifests([first, second])
+
+    assert entries["B"]["sha256"] == "y"
+    assert set(duplicates) == {"A", "B"}
+    assert is_conflicting(duplicates["A"])
+    assert not is_conflicting(duplicates["B"])
+    assert find_gaps([["A"], ["B"], ["C"]], entries) == ["C"]
+
+
+def test_merge_different_dates(tmp_path):
+    # The same output written on different days isn't a conflict
+    result = export_model(["GranadaS"], str(tmp_path))
+    with open(result.path) as f:
+        older = f.read().replace(date.today().isoformat(), "2001-01-01")
+    assert older != open(result.path).read()
+    old_path = tmp_path / "old.fr"
+    old_path.write_text(older)
+
+    entries = []
+    for n, sha256 in enumerate([result.sha256, file_sha256(str(old_path))]):
+        path = tmp_path / f"manifest-{n}.jsonl"
+        entry = manifest_entry(BatchResult("GranadaS", result.path, 0, sha256=sha256))
+        path.write_text(json.dumps(entry) + "\n")
+        entries.append(str(path))
+    _, duplicates = merge_manifests(entries)
+    assert not is_conflicting(duplicates["GranadaS"])
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 
 import pytest
-from feynwrite.tensor import Tensor, TensorProduct, Field, Scalar
+from feynwrite.tensor import Tensor, TensorProduct, Coupling, Field, Scalar
 
 
 def test_tensor_indices():
@@ -34,3 +34,85 @@ def test_conj():
 
     AdjP = Field("CP", ["-I0"], hypercharge=1, is_self_conj=False)
     assert AdjP.C.indices == ["-I0"]
+
+
+def test_immutable():
+    A = Field("A", ["i0", "I0"], hypercharge=1)
+    with pytest.raises(AttributeError):
+        A.label = "B"
+
+    # Conjugation shares unchanged data with the original
+    conj = A.C
+    assert conj is not A
+    assert conj.label is A.label and conj.hypercharge is A.hypercharge
+    assert conj.C == A
+    assert hash(conj.C) == hash(A)
+
+
+def test_product_cached():
+    y = Coupling("y", ["g0"])
+    H = Scalar("H", ["i0"], hypercharge=1, is_sm=True)
+    S = Scalar("S", ["-i0"], hypercharge=-1)
+    term = y * H * S
+
+    assert term.couplings == (y,)
+    assert term.fields == (H, S)
+    assert term.exotics == (S,)
+    assert term.fields is term.fields
+    assert term.free_indices == ["g0"]
+    assert term.wolfram_term_name == "Ly"
+
+    with pytest.raises(AttributeError):
+        term.tensors = ()
+
+
+def test_canonical():
+    from feynwrite.granada import TERMS, S
+    from feynwrite.sm import H, L
+    from feynwrite.tensor import eps, intern_term, unique_terms
+    from feynwrite.two_field import TWO_FIELD_TERMS
+
+    term = Coupling("kappaS", [], is_complex=False) * S() * H("i0").C * H("i0")
+    relabelled = H("i7") * Coupling("kappaS", [], is_complex=False) * H("i7").C * S()
+    assert term == relabelled and hash(term) == hash(relabelled)
+    assert term.stable_hash == relabelled.stable_hash
+    assert repr(relabelled.canonical) == "kappaS()*GranadaS()*Phi(i0)*Phi(-i0)"
+    assert intern_term(relabelled) is intern_term(term)
+
+    # Fermions don't commute
+    y = Coupling("y", ["-g0", "-g1"])
+    first = y * L("s0", "i0", "g0").bar * L("s0", "i1", "g1").CC * eps("-i0", "-i1")
+    second = y * L("s0", "i1", "g1").CC * L("s0", "i0", "g0").bar * eps("-i0", "-i1")
+    assert first != second
+
+    terms = TERMS + TWO_FIELD_TERMS
+    assert unique_terms(terms) == terms
+    assert unique_terms([term, first, relabelled]) == [term, first]
+
+
+def test_canonical_many_factors():
+    import math
+    import random
+
+    from feynwrite.granada import varphi
+    from feynwrite.sm import H
+    from feynwrite.tensor import MAX_ORDERINGS, eps
+
+    def product(pairs):
+        tensors = []
+        for n, (a, b) in enumerate(pairs):
+            tensors += [a(f"i{2 * n}"), b(f"i{2 * n + 1}"), eps(f"-i{2 * n}", f"-i{2 * n + 1}")]
+        return tensors
+
+    # Too many orderings of the identical factors to try them all
+    assert math.factorial(4) ** 3 > MAX_ORDERINGS
+    same = product([(H, H), (varphi, varphi)] * 2)
+    mixed = product([(H, varphi)] * 4)
+
+    rng = random.Random(0)
+    keys = set()
+    for _ in range(10):
+        rng.shuffle(same)
+        keys.add(TensorProduct(*same).key)
+    assert len(keys) == 1
+    assert TensorProduct(*mixed).key not in keys
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+
+import cmath
+import importlib
+
+import pytest
+
+from feynwrite.dictionary import build_model
+from feynwrite.ufo import _number
+
+
+def load_ufo(directory, monkeypatch):
+    """Import the UFO model in `directory` and evaluate its parameters and couplings."""
+    monkeypatch.syspath_prepend(str(directory.parent))
+    ufo = importlib.import_module(directory.name)
+    namespace = {"cmath": cmath, "complexconjugate": lambda z: z.conjugate()}
+    for parameter in ufo.all_parameters:
+        value = parameter.value
+        namespace[parameter.name] = eval(value, namespace) if isinstance(value, str) else value
+    couplings = {c.name: eval(c.value, namespace) for c in ufo.all_couplings}
+    return ufo, couplings
+
+
+def test_export(tmp_path, monkeypatch):
+    build_model(["GranadaS"]).export_ufo(str(tmp_path / "ufo_s"))
+    ufo, couplings = load_ufo(tmp_path / "ufo_s", monkeypatch)
+
+    # The singlet and the two components of the Higgs doublet
+    assert sorted(p.name for p in ufo.all_particles) == ["GranadaS", "Phi_1", "Phi_1~", "Phi_2", "Phi_2~"]
+    (cubic,) = [v for v in ufo.all_vertices if [p.name for p in v.particles] == ["GranadaS"] * 3]
+    assert cubic.lorentz[0].structure == "1"
+    assert cmath.isclose(couplings[cubic.couplings[0, 0].name], 6j * 0.1)
+
+
+def test_isospin_and_generations(tmp_path, monkeypatch):
+    build_model(["GranadaS1", "GranadaOmega1"]).export_ufo(str(tmp_path / "ufo_s1"))
+    ufo, _ = load_ufo(tmp_path / "ufo_s1", monkeypatch)
+    vertices = {tuple(p.name for p in v.particles): v for v in ufo.all_vertices}
+
+    # The antisymmetric part of the coupling to two lepton doublets
+    assert ("LL_1_1~", "LL_2_1~", "GranadaS1~") not in vertices
+    (coupling,) = vertices["LL_1_1~", "LL_2_2~", "GranadaS1~"].couplings.values()
+    assert coupling.value == "complex(0,1)*(yS1x1x2 - yS1x2x1)"
+
+    vertex = vertices["UR_1", "DR_2", "GranadaOmega1~"]
+    assert vertex.color == ["K6Bar(3,1,2)"]
+    assert [L.structure for L in vertex.lorentz] == ["ProjP(1,2)"]
+
+
+def test_unsupported_colour(tmp_path, monkeypatch):
+    monkeypatch.setattr("feynwrite.ufo.COLOUR_FUNCTIONS", {})
+    with pytest.raises(ValueError, match="No UFO colour structure"):
+        build_model(["GranadaOmega1"]).export_ufo(str(tmp_path / "ufo_omega1"))
+
+
+def test_number():
+    assert _number(complex(0.5)) == "1/2"
+    assert _number(complex(0, -(2**0.5) / 4)) == "-cmath.sqrt(2)/4*complex(0,1)"
+    assert _number(complex(0.25, 1)) == "(1/4 + complex(0,1))"
@@ -2,7 +2,7 @@
 
 
 import pytest
-from feynwrite.utils import wolfram_index_map
+from feynwrite.utils import Index, IndexKind, format_wolfram_list, raise_lower_index, wolfram_index_map
 
 
 def test_wolfram_index_map():
@@ -10,3 +10,23 @@ def test_wolfram_index_map():
     assert wolfram_index_map("I11") == "Index[SU2W]"
     assert wolfram_index_map("-c9") == "Index[Colour]"
     assert wolfram_index_map("g") == "Index[Generation]"
+
+
+def test_index():
+    i0 = Index.get("i0")
+    assert i0 is Index.get("i0")
+    assert i0.kind == IndexKind.ISOSPIN_FUNDAMENTAL
+    assert not i0.is_lowered
+
+    lowered = i0.flipped
+    assert lowered is Index.get("-i0")
+    assert lowered.is_lowered and lowered.label == "i0"
+    assert lowered.flipped is i0
+
+    assert raise_lower_index("-c9") == "c9"
+    assert raise_lower_index(i0) is lowered
+
+
+def test_format_wolfram_list():
+    assert format_wolfram_list(["a", "b"], "x =\n") == "x =\n{ a\n, b\n};\n\n"
+    assert format_wolfram_list([], "x =\n") == "x =\n{};\n\n"
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+
+import numpy as np
+
+from feynwrite.granada import TERMS, kappaS3_term, lambdaE_term, yS1_term, yS2_term
+from feynwrite.sm import H
+from feynwrite.tensor import Coupling, eps
+from feynwrite.two_field import TWO_FIELD_TERMS
+from feynwrite.vertices import vertex, vertices
+
+
+def test_identical_scalars():
+    (contribution,) = vertex(kappaS3_term()).contributions
+    assert contribution.weight == 6
+
+
+def test_chains():
+    term, conj = vertices([lambdaE_term()])
+    assert [leg.name for leg in term.legs] == ["GranadaE~", "LL", "Phi~"]
+    assert [c.chains for c in term.contributions] == [((0, 1, "PL"),)]
+    assert [c.generations for c in term.contributions] == [(1,)]
+    assert [leg.name for leg in conj.legs] == ["Phi", "LL~", "GranadaE"]
+    assert [c.chains for c in conj.contributions] == [((1, 2, "PR"),)]
+    assert conj.coupling == "lambdaEbar"
+
+
+def test_exchanged_chain():
+    # The coupling appears as y + y^T for a symmetric structure and y - y^T for
+    # an antisymmetric one
+    first, second = vertex(yS2_term()).contributions
+    assert first.weight == second.weight == 1
+    assert first.generations == second.generations[::-1]
+    assert first.chains == second.chains
+
+    first, second = vertex(yS1_term()).contributions
+    assert first.weight == second.weight
+    assert np.allclose(first.gauge, -second.gauge)
+
+
+def test_vanishing():
+    term = Coupling("x", []) * H("i0") * H("i1") * eps("-i0", "-i1")
+    assert vertex(term).vanishes
+
+
+def test_terms():
+    terms = TERMS + TWO_FIELD_TERMS
+    rules = vertices(terms)
+    assert len(rules) == len(terms) + sum(term.is_complex for term in terms)
+    assert not any(rule.vanishes for rule in rules)